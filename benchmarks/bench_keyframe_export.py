@@ -0,0 +1,79 @@
+# benchmarks/bench_keyframe_export.py
+"""Keyframe export throughput: encoded images per second for 1080p keyframes
+
+Synthetic frames (gradients plus noise, so JPEG/PNG have real work to do)
+are exported with KeyframeExporter once inline and once on the process
+pool. Every keyframe yields two images (full size and thumbnail), and the
+contact sheet one more; images/s counts all of them.
+
+    python benchmarks/bench_keyframe_export.py [--frames 100] [--format jpg] [--workers 4] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.export.keyframe_exporter import KeyframeExporter  # noqa: E402
+
+
+def synthetic_keyframes(count: int, width: int = 1920, height: int = 1080) -> list:
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    keyframes = []
+    for index in range(count):
+        shift = index * 7
+        frame = np.stack([(x + shift) % 256 + 0 * y, (y + shift) % 256 + 0 * x, (x + y) / 2 % 256], axis=2)
+        frame += rng.normal(0, 12, frame.shape).astype(np.float32)
+        keyframes.append({'frame': np.clip(frame, 0, 255).astype(np.uint8),
+                          'timestamp': index * 4.0, 'index': index * 100})
+    return keyframes
+
+
+def measure(keyframes: list, options: dict, repeat: int) -> float:
+    """Median seconds for one export"""
+    runs = []
+    for _ in range(repeat):
+        output_dir = tempfile.mkdtemp(prefix='bench-keyframes-')
+        try:
+            started = time.perf_counter()
+            KeyframeExporter().export(keyframes, output_dir, options)
+            runs.append(time.perf_counter() - started)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    return statistics.median(runs)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=100, help='Number of 1080p keyframes')
+    parser.add_argument('--format', default='jpg', choices=['jpg', 'png'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Encoding processes')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the median is reported')
+    args = parser.parse_args(argv)
+
+    keyframes = synthetic_keyframes(args.frames)
+    images = 2 * args.frames + 1
+    print(f"{args.frames} keyframes at 1920x1080, {args.format}, {images} images per export\n")
+    print(f"{'mode':20} {'seconds':>8} {'images/s':>10}")
+    results = {}
+    for mode, workers in (('inline', 1), (f"pool ({args.workers})", args.workers)):
+        seconds = measure(keyframes, {'format': args.format, 'max_workers': workers}, args.repeat)
+        results[mode] = seconds
+        print(f"{mode:20} {seconds:8.3f} {images / seconds:10.1f}")
+
+    inline, pool = results.values()
+    print(f"\nspeedup {inline / pool:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
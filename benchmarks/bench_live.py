@@ -0,0 +1,120 @@
+# benchmarks/bench_live.py
+"""Live summarization of a synthetic stream fed through a pipe
+
+ffmpeg encodes a moving test pattern (with a pausing tone, and once without
+any audio, like a screen capture) to Matroska in real time (-re) and
+writes it into a FIFO. LiveSummarizer reads the FIFO while it is being
+written, with the stand-in recognizer of bench_suite, so the run measures
+the live loop rather than a speech model.
+
+Each run must produce partial summaries before the stream ends, keep every
+stage within max_lag (plus one update interval of slack) of the live edge,
+reach the end of the stream and finish without errors. A source without
+audio must be read as video only. The script exits non-zero otherwise.
+
+    python benchmarks/bench_live.py [--duration 20] [--size 640x360] [--update-interval 2] [--max-lag 6]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from bench_suite import standin_language_id, standin_recognizer  # noqa: E402
+from src.core.live_summarizer import LiveSummarizer  # noqa: E402
+from src.core.transcription_service import TranscriptionService  # noqa: E402
+from src.utils.config import get_config  # noqa: E402
+
+
+def stream(fifo: str, duration: float, size: str, fps: int, audio: bool) -> subprocess.Popen:
+    """Start writing a real-time synthetic stream into fifo"""
+    command = ['ffmpeg', '-v', 'error', '-y', '-re',
+               '-f', 'lavfi', '-i', f"testsrc2=size={size}:rate={fps}:duration={duration}"]
+    if audio:
+        # A tone that pauses for half a second every three, so speech spans can be cut
+        tone = '0.4*sin(2*PI*330*t)*gte(mod(t,3),0.5)'
+        command += ['-f', 'lavfi', '-i', f"aevalsrc='{tone}':sample_rate=44100:duration={duration}"]
+    command += ['-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'zerolatency', '-g', str(fps),
+                '-pix_fmt', 'yuv420p']
+    command += ['-c:a', 'aac', '-shortest'] if audio else ['-an']
+    return subprocess.Popen(command + ['-f', 'matroska', fifo], stdin=subprocess.DEVNULL)
+
+
+def run_live(args, audio: bool, work_dir: str) -> Dict:
+    """Summarize one stream; returns what was observed and the failed checks"""
+    fifo = os.path.join(work_dir, f"stream-{'av' if audio else 'video'}.mkv")
+    os.mkfifo(fifo)
+    output_dir = os.path.join(work_dir, f"live-{'av' if audio else 'video'}")
+    recognizers = {language: standin_recognizer for language in get_config().transcription.languages}
+    updates: List[Dict] = []
+    summarizer = LiveSummarizer(fifo, output_dir, args.update_interval, args.max_lag,
+                                transcription_service=TranscriptionService(recognizers, standin_language_id),
+                                on_update=updates.append)
+
+    producer = stream(fifo, args.duration, args.size, args.fps, audio)
+    started = time.monotonic()
+    try:
+        final = summarizer.run()
+    finally:
+        producer.wait()
+    elapsed = time.monotonic() - started
+
+    live = final['live']
+    partial = [update['live'] for update in updates if not update['live']['final']]
+    # The first update can come before the stage has produced anything
+    worst_lag = max((lag for update in partial[1:] for lag in update['lag'].values() if lag is not None),
+                    default=0.0)
+    failures = []
+    if producer.returncode != 0:
+        failures.append(f"ffmpeg writing the stream exited with status {producer.returncode}")
+    if not partial:
+        failures.append('no partial summary before the stream ended')
+    if worst_lag > args.max_lag + args.update_interval:
+        failures.append(f"lag {worst_lag:.1f} s exceeds max_lag {args.max_lag:.1f} s")
+    if live['live_edge'] < args.duration - 2 * summarizer.source.frame_interval:
+        failures.append(f"stopped at {live['live_edge']:.1f} s of {args.duration:.1f} s")
+    if live['has_audio'] != audio:
+        failures.append(f"has_audio is {live['has_audio']}, expected {audio}")
+    if audio and not summarizer.segments:
+        failures.append('no transcript segments')
+    failures.extend(f"error: {error}" for error in live['errors'])
+    return {'audio': audio, 'seconds': elapsed, 'updates': len(partial), 'edge': live['live_edge'],
+            'worst_lag': worst_lag, 'keyframes': len(final['keyframes']), 'failures': failures}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=20, help='Stream length in seconds')
+    parser.add_argument('--size', default='640x360', help='Stream resolution, WIDTHxHEIGHT')
+    parser.add_argument('--fps', type=int, default=25)
+    parser.add_argument('--update-interval', type=float, default=2.0, help='Seconds between partial summaries')
+    parser.add_argument('--max-lag', type=float, default=6.0, help='Seconds a stage may fall behind the edge')
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix='bench-live-')
+    try:
+        results = [run_live(args, audio, work_dir) for audio in (True, False)]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{args.duration:.0f}s stream at {args.size}, {args.fps} fps through a FIFO\n")
+    print(f"{'source':12} {'seconds':>8} {'updates':>8} {'edge':>7} {'max lag':>8} {'keyframes':>10}")
+    for result in results:
+        print(f"{'audio+video' if result['audio'] else 'video only':12} {result['seconds']:8.1f} "
+              f"{result['updates']:8d} {result['edge']:7.1f} {result['worst_lag']:8.1f} {result['keyframes']:10d}")
+    failures = [f"{'audio+video' if result['audio'] else 'video only'}: {failure}"
+                for result in results for failure in result['failures']]
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# benchmarks/bench_preview.py
+"""Preview tiers against a full-quality run on the same synthetic video
+
+A test clip (moving test pattern with a GOP of --gop frames, plus a tone
+track) is generated with ffmpeg's lavfi sources, then summarized once at
+full quality and once per preview tier from settings.yaml. Each run covers
+frame decoding, audio extraction, audio features, keyframe selection and
+fusion, with a fresh stage cache so nothing is reused between runs.
+Transcription is left out of every run, since it would dominate the full
+run and measure the speech model rather than the decoding.
+
+    python benchmarks/bench_preview.py [--duration 120] [--size 1280x720] [--gop 50] [--repeat 3]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.core import pipeline  # noqa: E402
+from src.utils.cache import StageCache  # noqa: E402
+from src.utils.config import get_config, get_preview_tier  # noqa: E402
+
+
+def synthetic_video(path: str, duration: float, size: str, fps: int, gop: int) -> dict:
+    subprocess.run([
+        'ffmpeg', '-v', 'error', '-y',
+        '-f', 'lavfi', '-i', f"testsrc2=size={size}:rate={fps}:duration={duration}",
+        '-f', 'lavfi', '-i', f"sine=frequency=440:beep_factor=4:duration={duration}",
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-g', str(gop), '-pix_fmt', 'yuv420p',
+        '-c:a', 'aac', '-shortest', path
+    ], check=True)
+    width, height = map(int, size.split('x'))
+    # Known metadata; probing is not part of what is measured
+    return {'duration': duration, 'fps': float(fps), 'resolution': (width, height),
+            'frame_count': int(duration * fps), 'codec': 'h264', 'path': path,
+            'audio_codec': 'aac', 'audio_channels': 1, 'audio_sample_rate': 44100}
+
+
+def summarize(video_path: str, video_info: dict, interval: float, tier=None):
+    """One pass through the summarization stages, as build_video_pipeline wires them"""
+    sample_rate = tier.sample_rate if tier else None
+    frame_options = {'interval': interval}
+    if tier:
+        frame_options = {'interval': max(interval, tier.min_interval), 'width': tier.frame_width,
+                         'intra_only': tier.intra_only}
+    audio = pipeline.extract_audio(video_path, sample_rate)
+    keyframes = pipeline.select_keyframes(pipeline.decode_frames(video_path, video_info, **frame_options))
+    analysis = pipeline.analyze_audio(audio)
+    transcript = pipeline.skip_transcript(audio)
+    return pipeline.fuse(analysis, transcript, keyframes, video_info), len(keyframes)
+
+
+def measure(video_path: str, video_info: dict, interval: float, tier, repeat: int):
+    """Median seconds for one run, and the last run's fusion result and keyframe count"""
+    runs = []
+    for _ in range(repeat):
+        cache_dir = tempfile.mkdtemp(prefix='bench-preview-cache-')
+        StageCache._default = StageCache(cache_dir)
+        try:
+            started = time.perf_counter()
+            result = summarize(video_path, video_info, interval, tier)
+            runs.append(time.perf_counter() - started)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    return (statistics.median(runs),) + result
+
+
+def overlap(highlights: list, reference: list) -> float:
+    """Fraction of the reference highlight time the preview also picked"""
+    total = sum(item['end'] - item['start'] for item in reference)
+    if not total:
+        return 1.0
+    shared = sum(max(0.0, min(a['end'], b['end']) - max(a['start'], b['start']))
+                 for a in highlights for b in reference)
+    return shared / total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=120, help='Clip length in seconds')
+    parser.add_argument('--size', default='1280x720', help='Clip resolution, WIDTHxHEIGHT')
+    parser.add_argument('--fps', type=int, default=25)
+    parser.add_argument('--gop', type=int, default=50, help='Frames between key frames')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the median is reported')
+    args = parser.parse_args(argv)
+
+    tiers = list(get_config().preview.tiers)
+    interval = get_config().optimization.frame_extraction_interval
+    work_dir = tempfile.mkdtemp(prefix='bench-preview-')
+    try:
+        video_path = os.path.join(work_dir, 'clip.mp4')
+        video_info = synthetic_video(video_path, args.duration, args.size, args.fps, args.gop)
+        print(f"{args.duration:.0f}s clip at {args.size}, {args.fps} fps, key frame every {args.gop} frames\n")
+        print(f"{'run':12} {'seconds':>8} {'speedup':>8} {'keyframes':>10} {'overlap':>8}")
+
+        full_seconds, full, count = measure(video_path, video_info, interval, None, args.repeat)
+        print(f"{'full':12} {full_seconds:8.3f} {1.0:7.2f}x {count:10d} {1.0:8.2f}")
+        for name in tiers:
+            seconds, fusion, count = measure(video_path, video_info, interval, get_preview_tier(name), args.repeat)
+            print(f"{name:12} {seconds:8.3f} {full_seconds / seconds:7.2f}x {count:10d} "
+                  f"{overlap(fusion['highlights'], full['highlights']):8.2f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# benchmarks/bench_startup.py
+"""Cold-start benchmark: import time of the main modules and CLI startup
+
+Every measurement runs in a fresh interpreter, since the point is what a new
+process (a CLI call or a spawned worker) pays before doing any work. The
+script exits non-zero when a median goes over its budget or when importing
+a module drags in one of the heavy ML/media libraries, which must only be
+imported by the stage that uses them.
+
+    python benchmarks/bench_startup.py [--repeat 5] [--import-budget 0.5] [--cli-budget 1.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    'src.main',
+    'src.core.pipeline',
+    'src.core.video_processor',
+    'src.core.audio_analyzer',
+    'src.core.keyframe_extractor',
+    'src.core.transcription_service',
+    'src.export.export_manager',
+    'src.utils.batch_runner',
+    'src.utils.parallel_processor',
+    'src.utils.performance_optimizer',
+    'src.utils.memory_manager',
+]
+
+# Libraries that take seconds to import and belong to individual stages
+HEAVY_MODULES = ['torch', 'librosa', 'cv2', 'whisper', 'pydub', 'transformers']
+
+_IMPORT_PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+'''
+
+
+def measure_import(module: str) -> dict:
+    """Seconds spent importing module in a new interpreter, and heavy modules it loaded"""
+    output = subprocess.run([sys.executable, '-c', _IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_command(command: list) -> float:
+    """Wall-clock seconds for a command, including interpreter startup"""
+    started = time.perf_counter()
+    subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - started
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the median is reported')
+    parser.add_argument('--import-budget', type=float, default=0.5, help='Max seconds to import any one module')
+    parser.add_argument('--cli-budget', type=float, default=1.0, help='Max seconds for `python -m src.main --help`')
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f"{'module':40} {'import (s)':>10}  heavy imports")
+    for module in MODULES:
+        runs = [measure_import(module) for _ in range(args.repeat)]
+        seconds = statistics.median(run['seconds'] for run in runs)
+        heavy = sorted({name for run in runs for name in run['heavy']})
+        print(f"{module:40} {seconds:10.3f}  {', '.join(heavy) or '-'}")
+        if seconds > args.import_budget:
+            failures.append(f"importing {module} took {seconds:.3f} s (budget {args.import_budget} s)")
+        if heavy:
+            failures.append(f"importing {module} loads {', '.join(heavy)}")
+
+    interpreter = statistics.median(measure_command([sys.executable, '-c', 'pass'])
+                                    for _ in range(args.repeat))
+    cli = statistics.median(measure_command([sys.executable, '-m', 'src.main', '--help'])
+                            for _ in range(args.repeat))
+    print(f"\n{'bare interpreter':40} {interpreter:10.3f}")
+    print(f"{'python -m src.main --help':40} {cli:10.3f}")
+    if cli > args.cli_budget:
+        failures.append(f"CLI startup took {cli:.3f} s (budget {args.cli_budget} s)")
+
+    if failures:
+        print('\nFAILED:\n  ' + '\n  '.join(failures))
+        return 1
+    print('\nAll startup times within budget')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
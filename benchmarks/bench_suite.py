@@ -0,0 +1,423 @@
+# benchmarks/bench_suite.py
+"""End-to-end benchmark suite on synthetic media, with regression thresholds
+
+Test clips are generated locally with ffmpeg's lavfi sources, so every run
+measures the same input: a test pattern that cuts to a different source
+every --scene-length seconds (scripted scene cuts) and a tone whose pitch
+follows the scenes, silent for --silence seconds out of every --pause-every
+(scripted pauses). Each case is DURATION@WIDTHxHEIGHT.
+
+Every stage is timed on its own, then the whole pipeline end to end:
+get_video_info, extract_audio, extract_frames, keyframes, audio_features,
+transcription, fusion, each exporter, end_to_end. Per stage the suite
+records wall time, CPU time (this process plus child ffmpeg processes),
+peak RSS of this process and throughput in media seconds per second.
+Transcription uses a deterministic stand-in recognizer, and the emotion and
+tone models are feature-based, so the suite runs offline on a CPU. The
+stage cache is disabled, so no run reuses another's work.
+
+For every case the suite also checks SceneDetector against the script: each
+scripted cut must be found within one sampling interval, with no cuts
+elsewhere. Its scoring throughput on 1920x1080 frames must reach
+--scene-fps frames per second (the target in SceneDetector's docstring).
+
+Results are written as JSON and compared with a stored baseline. The script
+exits non-zero when a scene check fails, when a stage fails that worked in
+the baseline, or when wall time, CPU time or peak RSS of a stage grows by
+more than --threshold percent, ignoring differences below a small
+absolute noise floor. Baselines are machine specific: regenerate them
+with --update-baseline on the reference machine, which needs ffmpeg and
+ffprobe; a run with a failing stage is not stored.
+
+    python benchmarks/bench_suite.py [--cases 30@640x360 120@1280x720] [--repeat 3]
+                                     [--baseline benchmarks/baseline.json] [--threshold 20]
+                                     [--output bench_results.json] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from src.core import pipeline  # noqa: E402
+from src.utils.cache import StageCache  # noqa: E402
+from src.utils.config import get_config  # noqa: E402
+from src.utils.file_handler import MediaCatalog  # noqa: E402
+from src.utils.pipeline_scheduler import PipelineScheduler, Stage  # noqa: E402
+
+DEFAULT_CASES = ['30@640x360', '120@1280x720']
+SCENE_SOURCES = ['testsrc2', 'smptehdbars', 'rgbtestsrc', 'testsrc', 'yuvtestsrc', 'pal100bars']
+EXPORT_COMPONENTS = ['summary', 'transcript', 'keyframes', 'audio']
+
+# SceneDetector's throughput target on 1080p frames, in frames per second
+SCENE_FPS_TARGET = 500.0
+SCENE_FPS_SIZE = (1920, 1080)
+
+# Metrics compared against the baseline, with the absolute change below which
+# a difference counts as noise
+COMPARED_METRICS = {'wall_s': 0.05, 'cpu_s': 0.05, 'peak_rss_mb': 10.0}
+
+
+# Deterministic stand-ins for the speech models
+
+def standin_recognizer(samples, sample_rate: int, language: str = 'en') -> List[Dict]:
+    """One segment per two seconds of audio, with a word count that follows the length"""
+    duration = len(samples) / sample_rate
+    segments = []
+    start = 0.0
+    while start < duration:
+        end = min(start + 2.0, duration)
+        words = max(1, int((end - start) * 2.5))
+        segments.append({'start': start, 'end': end, 'text': ' '.join(['word'] * words)})
+        start = end
+    return segments
+
+
+def standin_language_id(samples, sample_rate: int, candidates=('en', 'th')) -> str:
+    return candidates[0]
+
+
+# Pure functions of their input, so chunks may run in parallel
+standin_recognizer.thread_safe = True
+standin_language_id.thread_safe = True
+
+
+def standin_transcribe(audio) -> Dict:
+    from src.core.transcription_service import TranscriptionService
+
+    recognizers = {language: standin_recognizer for language in get_config().transcription.languages}
+    return TranscriptionService(recognizers, standin_language_id).transcribe(audio)
+
+
+# Synthetic media
+
+def parse_case(case: str) -> Dict:
+    duration, size = case.split('@')
+    width, height = map(int, size.lower().split('x'))
+    return {'name': case, 'duration': float(duration), 'width': width, 'height': height}
+
+
+def synthetic_video(path: str, case: Dict, fps: int, scene_length: float,
+                    pause_every: float, silence: float) -> Dict:
+    """Write the clip for a case and return its known metadata"""
+    duration, size = case['duration'], f"{case['width']}x{case['height']}"
+    scenes = max(1, int(-(-duration // scene_length)))
+    inputs = []
+    for scene in range(scenes):
+        length = min(scene_length, duration - scene * scene_length)
+        source = SCENE_SOURCES[scene % len(SCENE_SOURCES)]
+        inputs += ['-f', 'lavfi', '-i', f"{source}=size={size}:rate={fps}:duration={length}"]
+    video_graph = ''.join(f"[{index}:v]format=yuv420p,setsar=1[v{index}];" for index in range(scenes))
+    video_graph += ''.join(f"[v{index}]" for index in range(scenes)) + f"concat=n={scenes}:v=1:a=0[video]"
+    tone = (f"0.4*sin(2*PI*(220+55*mod(floor(t/{scene_length}),4))*t)"
+            f"*gte(mod(t,{pause_every}),{silence})")
+    inputs += ['-f', 'lavfi', '-i', f"aevalsrc='{tone}':sample_rate=44100:duration={duration}"]
+    subprocess.run(['ffmpeg', '-v', 'error', '-y'] + inputs + [
+        '-filter_complex', video_graph,
+        '-map', '[video]', '-map', f"{scenes}:a",
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-g', str(2 * fps),
+        '-c:a', 'aac', '-shortest', path
+    ], check=True)
+    return {'duration': duration, 'fps': float(fps), 'resolution': (case['width'], case['height']),
+            'frame_count': int(duration * fps), 'codec': 'h264', 'path': path,
+            'audio_codec': 'aac', 'audio_channels': 1, 'audio_sample_rate': 44100}
+
+
+# Measurement
+
+def _reset_peak_rss() -> bool:
+    """Reset this process's peak RSS (Linux); False where it cannot be reset"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb(reset: bool) -> float:
+    if reset:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    # Lifetime peak, in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def timed(func: Callable, *args, **kwargs):
+    """Run func once and return (its result, wall time, CPU time, peak RSS)"""
+    reset = _reset_peak_rss()
+    cpu = _cpu_seconds()
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    wall = time.perf_counter() - started
+    return result, {'wall_s': wall, 'cpu_s': _cpu_seconds() - cpu, 'peak_rss_mb': _peak_rss_mb(reset)}
+
+
+def end_to_end(video_path: str, video_info: Dict, output_dir: str) -> Dict:
+    """The single-video pipeline with every exporter and the stand-in transcription"""
+    scheduler = pipeline.build_video_pipeline(include_export=True, export_components=EXPORT_COMPONENTS)
+    stages = [Stage('transcript', standin_transcribe, inputs=['audio'], executor='process')
+              if stage.name == 'transcript' else stage for stage in scheduler.stages.values()]
+    scheduler = PipelineScheduler(stages, max_processes=scheduler.max_processes)
+    initial = {'video_path': video_path, 'output_dir': output_dir}
+    if video_info is not None:
+        initial['video_info'] = video_info
+    return scheduler.run(initial, targets=['export'])
+
+
+def run_case(video_path: str, known_info: Dict, work_dir: str) -> Dict[str, Dict]:
+    """One timed pass over every stage; returns metrics (or an error) per stage"""
+    from src.core.audio_analyzer import AudioAnalyzer
+    from src.core.keyframe_extractor import KeyframeExtractor
+    from src.core.multimodal_fusion import MultimodalFusion
+    from src.core.video_processor import VideoProcessor
+    from src.export.export_manager import ExportManager
+
+    interval = get_config().optimization.frame_extraction_interval
+    metrics = {}
+
+    def stage(name: str, func: Callable, *args, **kwargs):
+        try:
+            result, metrics[name] = timed(func, *args, **kwargs)
+            return result
+        except Exception as e:
+            metrics[name] = {'error': f"{type(e).__name__}: {e}"}
+            return None
+
+    processor = VideoProcessor(video_path)
+    video_info = stage('get_video_info', processor.get_video_info)
+    probed = video_info is not None
+    if not probed:
+        # Without ffprobe the remaining stages run on the known metadata
+        video_info = processor._apply_video_info(dict(known_info))
+
+    stage('extract_audio', processor.extract_audio)
+    audio = processor.audio_buffer
+    frames = stage('extract_frames', processor.extract_frames, interval) or []
+    # Batched as the pipeline streams them; extract_frames samples every interval seconds
+    batches = list(processor._batch_frames(((index * interval, frame) for index, frame in enumerate(frames)), 32))
+    keyframes = stage('keyframes', KeyframeExtractor().select_keyframes, batches) or []
+    analysis = stage('audio_features', AudioAnalyzer().analyze_audio_comprehensive, audio)
+    transcript = stage('transcription', standin_transcribe, audio)
+    fusion = stage('fusion', MultimodalFusion().fuse_modalities, analysis, transcript,
+                   {'keyframes': keyframes, 'duration': video_info['duration']})
+
+    manager = ExportManager()
+    data = {'summary': fusion, 'transcript': transcript, 'keyframes': keyframes,
+            'audio': {'source': video_path, 'segments': (fusion or {}).get('highlights', [])}}
+    for component in EXPORT_COMPONENTS:
+        output_dir = os.path.join(work_dir, f"export-{component}")
+        stage(f"export_{component}", manager.get_exporter(component).export,
+              data[component], output_dir, {})
+
+    stage('end_to_end', end_to_end, video_path, video_info if not probed else None,
+          os.path.join(work_dir, 'end-to-end'))
+    return metrics
+
+
+def check_scene_cuts(video_path: str, known_info: Dict, scene_length: float, min_fps: float) -> Dict:
+    """Compare SceneDetector's cuts on the clip with the scripted ones and measure its throughput
+
+    Frames are sampled every optimization.frame_extraction_interval
+    seconds, as in the pipeline, so a scripted cut counts as found when a
+    detected cut lies within one interval of it. Throughput is measured on
+    the clip's frames scaled to SCENE_FPS_SIZE.
+    """
+    import cv2
+    import numpy as np
+    from src.core.scene_detector import SceneDetector, iter_scene_changes
+    from src.core.video_processor import VideoProcessor
+
+    interval = get_config().optimization.frame_extraction_interval
+    processor = VideoProcessor(video_path)
+    processor._apply_video_info(dict(known_info))
+    batches = list(processor.iter_frames(interval, batch_size=32))
+    found = [timestamp for _, timestamp in iter_scene_changes(SceneDetector(), iter(batches))]
+
+    scripted = [scene * scene_length for scene in range(1, int(-(-known_info['duration'] // scene_length)))]
+    missed = [cut for cut in scripted if not any(abs(timestamp - cut) <= interval for timestamp in found)]
+    spurious = [timestamp for timestamp in found if not any(abs(timestamp - cut) <= interval for cut in scripted)]
+
+    frames = np.stack([cv2.resize(frame, SCENE_FPS_SIZE) for frame in batches[0][1]])
+    detector = SceneDetector()
+    repeats = max(1, -(-256 // len(frames)))
+    started = time.perf_counter()
+    for _ in range(repeats):
+        detector.scores(frames)
+    frames_per_s = repeats * len(frames) / (time.perf_counter() - started)
+
+    failures = [f"missed scripted cut at {cut:g} s" for cut in missed]
+    failures += [f"spurious cut at {timestamp:g} s" for timestamp in spurious]
+    if frames_per_s < min_fps:
+        failures.append(f"{frames_per_s:.0f} frames/s at {SCENE_FPS_SIZE[0]}x{SCENE_FPS_SIZE[1]}, "
+                        f"below the {min_fps:g} frames/s target")
+    return {'scripted': scripted, 'found': [round(timestamp, 3) for timestamp in found],
+            'frames_per_s': round(frames_per_s, 1), 'failures': failures}
+
+
+def summarize_runs(runs: List[Dict[str, Dict]], duration: float) -> Dict[str, Dict]:
+    """Median wall and CPU time and the highest peak RSS of each stage over the repeats"""
+    stages = {}
+    for name in runs[0]:
+        samples = [run[name] for run in runs]
+        errors = [sample['error'] for sample in samples if 'error' in sample]
+        if errors:
+            stages[name] = {'error': errors[0]}
+            continue
+        wall = statistics.median(sample['wall_s'] for sample in samples)
+        stages[name] = {
+            'wall_s': round(wall, 4),
+            'cpu_s': round(statistics.median(sample['cpu_s'] for sample in samples), 4),
+            'peak_rss_mb': round(max(sample['peak_rss_mb'] for sample in samples), 1),
+            'media_s_per_s': round(duration / wall, 2) if wall else None,
+        }
+    return stages
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Regressions of results against baseline, one line each"""
+    regressions = []
+    for case, stages in results['cases'].items():
+        for name, current in stages.items():
+            previous = baseline.get('cases', {}).get(case, {}).get(name)
+            if 'error' in current:
+                # A stage that stopped working is the largest regression of all
+                if not previous or 'error' not in previous:
+                    regressions.append(f"{case} {name} fails: {current['error']}")
+                continue
+            if not previous or 'error' in previous:
+                continue
+            for metric, noise in COMPARED_METRICS.items():
+                before, after = previous.get(metric), current.get(metric)
+                if before is None or after is None or after - before <= noise:
+                    continue
+                change = (after - before) / before * 100 if before else float('inf')
+                if change > threshold:
+                    regressions.append(f"{case} {name} {metric}: {before} -> {after} (+{change:.0f}%)")
+    return regressions
+
+
+def environment() -> Dict:
+    tools = {}
+    for tool in ('ffmpeg', 'ffprobe'):
+        try:
+            tools[tool] = subprocess.run([tool, '-version'], stdout=subprocess.PIPE, text=True).stdout.split('\n')[0]
+        except OSError:
+            tools[tool] = None
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'cpus': os.cpu_count(), **tools}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', nargs='+', default=DEFAULT_CASES, help='Clips as DURATION@WIDTHxHEIGHT')
+    parser.add_argument('--fps', type=int, default=25)
+    parser.add_argument('--scene-length', type=float, default=10.0, help='Seconds between scripted scene cuts')
+    parser.add_argument('--pause-every', type=float, default=8.0, help='Seconds between scripted silences')
+    parser.add_argument('--silence', type=float, default=1.5, help='Length of each silence in seconds')
+    parser.add_argument('--scene-fps', type=float, default=SCENE_FPS_TARGET,
+                        help='Required SceneDetector throughput on 1080p frames, in frames per second')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case; medians are reported')
+    parser.add_argument('--baseline', default=os.path.join('benchmarks', 'baseline.json'))
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed growth per metric, in percent')
+    parser.add_argument('--output', default='bench_results.json', help='Where the results JSON is written')
+    parser.add_argument('--update-baseline', action='store_true', help='Store the results as the new baseline')
+    args = parser.parse_args(argv)
+
+    results = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'environment': environment(),
+               'settings': {'fps': args.fps, 'scene_length': args.scene_length, 'pause_every': args.pause_every,
+                            'silence': args.silence, 'repeat': args.repeat},
+               'cases': {}, 'scene_checks': {}}
+    work_dir = tempfile.mkdtemp(prefix='bench-suite-')
+    try:
+        for case in map(parse_case, args.cases):
+            video_path = os.path.join(work_dir, f"{case['duration']:.0f}s-{case['width']}x{case['height']}.mp4")
+            known_info = synthetic_video(video_path, case, args.fps, args.scene_length,
+                                         args.pause_every, args.silence)
+            runs = []
+            for repeat in range(args.repeat):
+                run_dir = tempfile.mkdtemp(prefix=f"run{repeat}-", dir=work_dir)
+                # A disabled cache still streams audio and frames through its scratch space
+                StageCache._default = StageCache(os.path.join(run_dir, 'cache'), enabled=False)
+                MediaCatalog._default = MediaCatalog(os.path.join(run_dir, 'catalog.sqlite'), enabled=False)
+                runs.append(run_case(video_path, known_info, run_dir))
+                shutil.rmtree(run_dir, ignore_errors=True)
+            stages = summarize_runs(runs, case['duration'])
+            results['cases'][case['name']] = stages
+            scenes = check_scene_cuts(video_path, known_info, args.scene_length, args.scene_fps)
+            results['scene_checks'][case['name']] = scenes
+
+            print(f"\n{case['name']}")
+            print(f"{'stage':18} {'wall s':>8} {'cpu s':>8} {'peak MB':>8} {'media s/s':>10}")
+            for name, metrics in stages.items():
+                if 'error' in metrics:
+                    print(f"{name:18} error: {metrics['error']}")
+                else:
+                    print(f"{name:18} {metrics['wall_s']:8.3f} {metrics['cpu_s']:8.3f} "
+                          f"{metrics['peak_rss_mb']:8.1f} {metrics['media_s_per_s']:10.1f}")
+            print(f"scene cuts: {len(scenes['found'])} found, {len(scenes['scripted'])} scripted; "
+                  f"{scenes['frames_per_s']:.0f} frames/s at 1080p")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    scene_failures = [f"{case} {failure}" for case, scenes in results['scene_checks'].items()
+                      for failure in scenes['failures']]
+    if scene_failures:
+        print(f"\n{len(scene_failures)} scene check failure(s):")
+        for line in scene_failures:
+            print(f"  {line}")
+
+    if args.update_baseline:
+        # A stage that errors would go ungated; a baseline needs the complete toolchain
+        failed = [f"{case} {name}: {metrics['error']}" for case, stages in results['cases'].items()
+                  for name, metrics in stages.items() if 'error' in metrics]
+        if failed:
+            print(f"\nBaseline not updated, {len(failed)} stage(s) failed:")
+            for line in failed:
+                print(f"  {line}")
+            return 1
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 1 if scene_failures else 0
+    if not os.path.isfile(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 1 if scene_failures else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0f}%:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions over {args.threshold:.0f}% against {args.baseline}")
+    return 1 if scene_failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,28 +0,0 @@
-# src/models/fusion_strategy.py
-import numpy as np
-from typing import Dict
-
-class FusionStrategy:
-    def __init__(self, config_path: str = None):
-        self.weights = {
-            'audio': 0.3,
-            'text': 0.4,
-            'visual': 0.3
-        }
-        if config_path:
-            self._load_config(config_path)
-    
-    def weighted_fusion(self, modality_scores: Dict) -> np.ndarray:
-        """Combine scores from different modalities"""
-        final_scores = np.zeros(len(modality_scores['audio']))
-        
-        for modality, weight in self.weights.items():
-            if modality in modality_scores:
-                final_scores += weight * modality_scores[modality]
-                
-        return final_scores
-    
-    def adaptive_fusion(self, modality_scores: Dict, confidence_scores: Dict) -> np.ndarray:
-        """Fusion with adaptive weights based on confidence"""
-        # Implementation here
-        pass
@@ -1,46 +1,79 @@
 # src/core/audio_analyzer.py
-import librosa
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Union
+from .audio_buffer import AudioBuffer
+from .audio_features import AudioFeatureEngine
+from ..models.registry import get_registry
+from ..utils.cache import StageCache
+from ..utils.config import get_config
+from ..utils.logger import span
 
 class AudioAnalyzer:
-    def __init__(self):
-        self.emotion_model = self._load_emotion_model()
-        self.tone_analyzer = self._load_tone_analyzer()
+    # Bump when feature extraction changes so cached features are recomputed
+    FEATURE_VERSION = 2
+    
+    def __init__(self, cache: StageCache = None):
+        self.cache = cache if cache is not None else StageCache.default()
+        self._feature_engines = {}
 
-    def _load_emotion_model(self):
-        # Placeholder for loading emotion model
-        pass
+    @property
+    def emotion_model(self):
+        """Emotion model from the shared registry, loaded on first use"""
+        return get_registry().get('emotion')
         
-    def _load_tone_analyzer(self):
-        # Placeholder for loading tone analyzer
-        pass
+    @property
+    def tone_analyzer(self):
+        """Tone analyzer from the shared registry, loaded on first use"""
+        return get_registry().get('tone')
         
     def analyze_emotions(self, audio_data: np.ndarray) -> Dict:
         """Detect emotions using pre-trained models"""
-        pass
+        sr = get_config().audio.sample_rate
+        return self.emotion_model.predict(self.feature_engine(sr).compute(audio_data))
 
     def detect_tone(self, audio_data: np.ndarray) -> Dict:
         """Analyze tone and sentiment"""
-        pass
-        
-    def analyze_audio_comprehensive(self, audio_path: str) -> Dict:
-        """Complete audio analysis pipeline"""
-        # Load audio
-        audio, sr = librosa.load(audio_path)
-        
-        # Extract features
-        features = {
-            'mfcc': librosa.feature.mfcc(audio, sr),
-            'spectral_centroid': librosa.feature.spectral_centroid(audio, sr),
-            'zero_crossing_rate': librosa.feature.zero_crossing_rate(audio)
-        }
+        return self.analyze_tone(audio_data, get_config().audio.sample_rate)
+        
+    def analyze_audio_comprehensive(self, audio: Union[str, AudioBuffer]) -> Dict:
+        """Complete audio analysis pipeline
+        
+        Accepts either a path, which is decoded here, or the AudioBuffer
+        produced by VideoProcessor.extract_audio, which is read in place
+        chunk by chunk without decoding the file a second time. All features
+        come from one STFT per chunk (AudioFeatureEngine) and are cached per
+        source content and sample rate.
+        """
+        if isinstance(audio, AudioBuffer):
+            sr = audio.sample_rate
+            signal = audio.samples
+            digest = audio.source_digest
+        else:
+            import librosa
+            
+            # Load audio
+            signal, sr = librosa.load(audio, sr=get_config().audio.sample_rate)
+            digest = self.cache.file_digest(audio)
         
-        # Emotion detection
-        emotions = self.emotion_model.predict(features)
+        key = None
+        features = None
+        if digest is not None:
+            key = self.cache.make_key(digest, 'audio_features',
+                                      {'sample_rate': sr, 'version': self.FEATURE_VERSION})
+            features = self.cache.get(key)
         
-        # Tone analysis
-        tone = self.analyze_tone(audio, sr)
+        if features is None:
+            with span('audio.features', 'audio', sample_rate=sr):
+                features = self.feature_engine(sr).compute(audio if isinstance(audio, AudioBuffer) else signal)
+            if key is not None:
+                self.cache.put(key, features)
+        
+        with span('audio.models', 'audio'):
+            # Emotion detection
+            emotions = self.emotion_model.predict(features)
+            
+            # Tone analysis
+            tone = self.tone_analyzer.analyze(features)
         
         return {
             'emotions': emotions,
@@ -49,11 +82,21 @@ class AudioAnalyzer:
             'key_points': self.extract_key_points(features)
         }
     
+    def feature_engine(self, sample_rate: int) -> AudioFeatureEngine:
+        """Feature engine for the given sample rate, built once and reused"""
+        if sample_rate not in self._feature_engines:
+            chunk_seconds = get_config().optimization.chunk_size
+            self._feature_engines[sample_rate] = AudioFeatureEngine(sample_rate, chunk_seconds=chunk_seconds)
+        return self._feature_engines[sample_rate]
+    
     def extract_key_points(self, audio_features: Dict) -> List[Dict]:
-        """Identify important audio segments"""
-        pass
+        """Identify important audio segments
+        
+        Vectorized peak/segment detection over the frame-level feature
+        arrays; see AudioFeatureEngine.extract_key_points.
+        """
+        return self.feature_engine(audio_features['sample_rate']).extract_key_points(audio_features)
         
     def analyze_tone(self, audio: np.ndarray, sr: int) -> Dict:
         """Analyze tone from audio data"""
-        # Implementation of tone analysis
-        pass
+        return self.tone_analyzer.analyze(self.feature_engine(sr).compute(audio))
@@ -0,0 +1,72 @@
+# src/core/audio_buffer.py
+import numpy as np
+from typing import Generator, Tuple
+
+
+class AudioBuffer:
+    """Read-only, memory-mapped mono PCM audio shared between analyzers
+    
+    Samples live in an int16 .npy file on disk and are paged in on access, so
+    slicing or windowing the buffer never copies the whole track. Pickling
+    only carries the file path, which lets worker processes reopen the same
+    mapping instead of receiving a copy of the samples.
+    
+    source_digest identifies the content the audio was decoded from, so
+    analyzers can key their own cached results on it.
+    """
+    
+    def __init__(self, path: str, sample_rate: int, source_digest: str = None):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.source_digest = source_digest
+        self.samples = np.load(path, mmap_mode='r', allow_pickle=False)
+        self.dtype = self.samples.dtype
+    
+    def __len__(self) -> int:
+        return len(self.samples)
+    
+    def __getstate__(self):
+        return {'path': self.path, 'sample_rate': self.sample_rate, 'source_digest': self.source_digest}
+    
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['sample_rate'], state['source_digest'])
+    
+    @property
+    def duration(self) -> float:
+        """Length of the audio in seconds"""
+        return len(self.samples) / self.sample_rate
+    
+    def to_float(self, start: int = 0, end: int = None) -> np.ndarray:
+        """Return samples [start, end) as float32 in [-1, 1]
+        
+        Only the requested range is converted, so callers working window by
+        window never materialize a float copy of the full track.
+        """
+        view = self.samples[start:end]
+        if self.dtype.kind == 'f':
+            return np.asarray(view, dtype=np.float32)
+        return view.astype(np.float32) / np.iinfo(self.dtype).max
+    
+    def iter_windows(self, window: float, overlap: float = 0.0) -> Generator[Tuple[float, np.ndarray], None, None]:
+        """Iterate over overlapping windows of the buffer
+        
+        Args:
+            window (float): Window length in seconds
+            overlap (float): Overlap between consecutive windows in seconds
+            
+        Yields:
+            Tuple[float, np.ndarray]: (start time in seconds, view of the raw samples)
+        """
+        window_samples = int(window * self.sample_rate)
+        step = window_samples - int(overlap * self.sample_rate)
+        if window_samples <= 0 or step <= 0:
+            raise ValueError(f"Invalid audio window {window}s with overlap {overlap}s")
+        
+        total = len(self.samples)
+        start = 0
+        while start < total:
+            end = min(start + window_samples, total)
+            yield start / self.sample_rate, self.samples[start:end]
+            if end >= total:
+                break
+            start += step
@@ -0,0 +1,259 @@
+# src/core/audio_features.py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Union
+from .audio_buffer import AudioBuffer
+from ..utils.memory_manager import get_memory_controller
+
+
+class AudioFeatureEngine:
+    """Frame-level audio features computed from a single STFT per chunk
+
+    The signal is cut into frames of frame_length seconds every hop_length
+    seconds. For each chunk of frames the windowed spectrum is computed once
+    and MFCCs, spectral centroid and an autocorrelation pitch track are all
+    derived from it; RMS energy and zero-crossing rate come from the same
+    framed samples. Results are float32 arrays on one shared frame grid,
+    preallocated for the whole signal, so only one chunk of samples and
+    spectra is in memory at a time.
+    """
+
+    # Fraction of the strongest autocorrelation peak a shorter lag must reach
+    OCTAVE_TOLERANCE = 0.9
+
+    def __init__(self, sample_rate: int = 16000, frame_length: float = 0.032,
+                 hop_length: float = 0.010, n_mfcc: int = 13, n_mels: int = 40,
+                 pitch_range: tuple = (60.0, 400.0), voicing_threshold: float = 0.3,
+                 chunk_seconds: float = 60.0):
+        self.sample_rate = sample_rate
+        self.win_length = int(round(frame_length * sample_rate))
+        self.hop_length = int(round(hop_length * sample_rate))
+        self.n_mfcc = n_mfcc
+        self.voicing_threshold = voicing_threshold
+        self.chunk_frames = max(1, int(chunk_seconds * sample_rate / self.hop_length))
+
+        self.min_lag = max(1, int(sample_rate / pitch_range[1]))
+        self.max_lag = min(self.win_length - 1, int(np.ceil(sample_rate / pitch_range[0])))
+        # Zero-pad so the autocorrelation from the power spectrum does not wrap around
+        self.n_fft = 1 << int(np.ceil(np.log2(self.win_length + self.max_lag)))
+
+        self.window = np.hanning(self.win_length + 1)[:-1].astype(np.float32)
+        self.window_autocorr = np.fft.irfft(
+            np.abs(np.fft.rfft(self.window, n=self.n_fft)) ** 2, n=self.n_fft)[:self.max_lag + 2].astype(np.float32)
+        self.frequencies = np.fft.rfftfreq(self.n_fft, 1.0 / sample_rate).astype(np.float32)
+        self.mel_filters = _mel_filterbank(sample_rate, self.n_fft, n_mels)
+        self.dct = _dct_matrix(n_mfcc, n_mels)
+
+    def num_frames(self, num_samples: int) -> int:
+        """Frames on the grid for a signal of num_samples samples"""
+        return 0 if num_samples <= 0 else 1 + (num_samples - 1) // self.hop_length
+
+    def frame_times(self, num_frames: int) -> np.ndarray:
+        """Center time in seconds of each frame"""
+        return ((np.arange(num_frames) * self.hop_length + self.win_length / 2) /
+                self.sample_rate).astype(np.float32)
+
+    def compute(self, audio: Union[AudioBuffer, np.ndarray]) -> Dict:
+        """Compute all features for a whole signal, chunk by chunk
+
+        Args:
+            audio: An AudioBuffer, or mono samples (int16 or float in [-1, 1])
+                at the engine's sample rate
+
+        Returns:
+            Dict: 'mfcc' (n_mfcc, T), and 'spectral_centroid', 'rms',
+                'zero_crossing_rate', 'pitch', 'voicing' and 'times' of shape (T,),
+                plus 'sample_rate' and 'hop_length'
+        """
+        if isinstance(audio, AudioBuffer):
+            if audio.sample_rate != self.sample_rate:
+                raise ValueError(f"Audio is {audio.sample_rate} Hz, engine expects {self.sample_rate} Hz")
+            read = audio.to_float
+            num_samples = len(audio)
+        else:
+            samples = np.asarray(audio)
+            scale = np.float32(np.iinfo(samples.dtype).max) if samples.dtype.kind == 'i' else np.float32(1.0)
+            read = lambda start, end: samples[start:end].astype(np.float32) / scale
+            num_samples = len(samples)
+
+        total = self.num_frames(num_samples)
+        features = {
+            'mfcc': np.zeros((self.n_mfcc, total), dtype=np.float32),
+            'spectral_centroid': np.zeros(total, dtype=np.float32),
+            'rms': np.zeros(total, dtype=np.float32),
+            'zero_crossing_rate': np.zeros(total, dtype=np.float32),
+            'pitch': np.zeros(total, dtype=np.float32),
+            'voicing': np.zeros(total, dtype=np.float32),
+            'times': self.frame_times(total),
+            'sample_rate': self.sample_rate,
+            'hop_length': self.hop_length
+        }
+
+        # Chunks shrink under memory pressure; each frame's features do not depend on the chunking
+        controller = get_memory_controller()
+        chunk_frames = self.chunk_frames
+        first = 0
+        while first < total:
+            controller.wait_for_headroom()
+            chunk_frames = controller.adjust(chunk_frames, max(1, self.chunk_frames // 16), self.chunk_frames)
+            last = min(first + chunk_frames, total)
+            start = first * self.hop_length
+            end = (last - 1) * self.hop_length + self.win_length
+            chunk = read(start, end)
+            if len(chunk) < end - start:
+                chunk = np.pad(chunk, (0, end - start - len(chunk)))
+            self._compute_chunk(chunk, features, first, last)
+            first = last
+
+        return features
+
+    def _compute_chunk(self, chunk: np.ndarray, features: Dict, first: int, last: int):
+        frames = sliding_window_view(chunk, self.win_length)[::self.hop_length]
+
+        features['rms'][first:last] = np.sqrt(np.mean(np.square(frames), axis=1))
+        features['zero_crossing_rate'][first:last] = (
+            np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1) / (self.win_length - 1))
+
+        # The one spectrum every spectral feature below is derived from
+        power = np.abs(np.fft.rfft(frames * self.window, n=self.n_fft, axis=1)) ** 2
+        power = power.astype(np.float32)
+        magnitude = np.sqrt(power)
+
+        magnitude_sum = magnitude.sum(axis=1)
+        features['spectral_centroid'][first:last] = np.where(
+            magnitude_sum > 0, magnitude @ self.frequencies / np.maximum(magnitude_sum, 1e-10), 0.0)
+
+        log_mel = np.log(power @ self.mel_filters.T + 1e-10)
+        features['mfcc'][:, first:last] = self.dct @ log_mel.T
+
+        # Wiener-Khinchin: autocorrelation is the inverse transform of the power
+        # spectrum; dividing by the window's own autocorrelation undoes its taper
+        autocorr = np.fft.irfft(power, n=self.n_fft, axis=1)[:, :self.max_lag + 2] / self.window_autocorr
+        energy = autocorr[:, 0]
+        candidates = autocorr[:, self.min_lag - 1:self.max_lag + 2]
+        peaks = ((candidates[:, 1:-1] >= candidates[:, :-2]) &
+                 (candidates[:, 1:-1] >= candidates[:, 2:]))
+        # Take the shortest lag whose peak is close to the best one; multiples
+        # of the period score almost as high and would halve the pitch
+        strong = peaks & (candidates[:, 1:-1] >= self.OCTAVE_TOLERANCE * candidates[:, 1:-1].max(axis=1, keepdims=True))
+        lag = np.where(strong.any(axis=1), np.argmax(strong, axis=1),
+                       np.argmax(candidates[:, 1:-1], axis=1)) + self.min_lag
+        rows = np.arange(len(lag))
+
+        # Parabolic interpolation around the peak for sub-sample lag precision
+        left, center, right = autocorr[rows, lag - 1], autocorr[rows, lag], autocorr[rows, lag + 1]
+        curvature = left - 2 * center + right
+        valid = np.abs(curvature) > 1e-10
+        shift = np.where(valid, 0.5 * (left - right) / np.where(valid, curvature, 1.0), 0.0)
+        refined_lag = lag + np.clip(shift, -0.5, 0.5)
+
+        voicing = np.where(energy > 1e-10, center / np.maximum(energy, 1e-10), 0.0)
+        features['voicing'][first:last] = np.clip(voicing, 0.0, 1.0)
+        features['pitch'][first:last] = np.where(voicing >= self.voicing_threshold,
+                                                 self.sample_rate / refined_lag, 0.0)
+
+    def extract_key_points(self, features: Dict, smoothing: float = 0.5,
+                           threshold: float = 1.0, min_duration: float = 0.5,
+                           merge_gap: float = 0.3) -> List[Dict]:
+        """Find salient segments over the feature arrays
+
+        Per-frame salience is the z-scored loudness (RMS in dB) plus the
+        z-scored pitch of voiced frames, smoothed over `smoothing` seconds.
+        Runs of frames more than `threshold` standard deviations above the
+        mean become segments; gaps shorter than merge_gap are bridged and
+        segments shorter than min_duration dropped. Everything is computed
+        with array operations, with no loop over frames.
+
+        Returns:
+            List[Dict]: 'start', 'end' and 'peak_time' in seconds plus 'score'
+                (peak salience), in time order
+        """
+        rms = np.asarray(features['rms'], dtype=np.float32)
+        if not len(rms):
+            return []
+        times = np.asarray(features['times'], dtype=np.float32)
+        frame_rate = features['sample_rate'] / features['hop_length']
+        hop = 1.0 / frame_rate
+
+        salience = frame_salience(features, self.voicing_threshold)
+        width = max(1, int(round(smoothing * frame_rate)))
+        salience = np.convolve(salience, np.ones(width, dtype=np.float32) / width, mode='same')
+        cutoff = salience.mean() + threshold * salience.std()
+
+        edges = np.diff(np.concatenate([[0], (salience > cutoff).astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        if not len(starts):
+            return []
+
+        # Bridge short gaps: keep a boundary only where the gap is long enough
+        keep = (starts[1:] - ends[:-1]) * hop >= merge_gap
+        starts = starts[np.concatenate([[True], keep])]
+        ends = ends[np.concatenate([keep, [True]])]
+
+        long_enough = (ends - starts) * hop >= min_duration
+        starts, ends = starts[long_enough], ends[long_enough]
+        if not len(starts):
+            return []
+
+        # Peak of each segment: sort in-segment frames by (segment, -salience)
+        lengths = ends - starts
+        segment_ids = np.repeat(np.arange(len(starts)), lengths)
+        positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+        order = np.lexsort((-salience[positions], segment_ids))
+        first_in_segment = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        peaks = positions[order[first_in_segment]]
+
+        return [
+            {'start': float(times[s] - hop / 2), 'end': float(times[e - 1] + hop / 2),
+             'peak_time': float(times[p]), 'score': float(salience[p])}
+            for s, e, p in zip(starts, ends, peaks)
+        ]
+
+
+def frame_salience(features: Dict, voicing_threshold: float = 0.3) -> np.ndarray:
+    """Per-frame salience: z-scored loudness plus half the z-scored pitch of voiced frames"""
+    loudness = 20 * np.log10(np.asarray(features['rms'], dtype=np.float32) + 1e-6)
+    salience = _zscore(loudness)
+    voiced = np.asarray(features['voicing']) >= voicing_threshold
+    if voiced.any():
+        pitch = np.asarray(features['pitch'], dtype=np.float32)
+        pitch_z = np.zeros_like(pitch)
+        pitch_z[voiced] = _zscore(pitch[voiced])
+        salience = salience + 0.5 * pitch_z
+    return salience
+
+
+def _zscore(values: np.ndarray) -> np.ndarray:
+    std = values.std()
+    return (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Triangular mel filters of shape (n_mels, n_fft // 2 + 1)"""
+    frequencies = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    edges = _mel_to_hz(np.linspace(_hz_to_mel(0.0), _hz_to_mel(sample_rate / 2), n_mels + 2))
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (frequencies - lower) / (center - lower)
+    falling = (upper - frequencies) / (upper - center)
+    filters = np.maximum(0.0, np.minimum(rising, falling))
+    # Slaney-style normalization so each filter has unit area
+    filters *= (2.0 / (upper - lower))
+    return filters.astype(np.float32)
+
+
+def _dct_matrix(n_out: int, n_in: int) -> np.ndarray:
+    """Orthonormal DCT-II basis of shape (n_out, n_in)"""
+    k = np.arange(n_out)[:, None]
+    n = np.arange(n_in)[None, :]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)) * np.sqrt(2.0 / n_in)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
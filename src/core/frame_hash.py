@@ -0,0 +1,104 @@
+# src/core/frame_hash.py
+import numpy as np
+from typing import Tuple
+
+# dHash compares each of HASH_SIZE columns with its right neighbour on a
+# HASH_SIZE x (HASH_SIZE + 1) grayscale thumbnail, giving a 64-bit hash
+HASH_SIZE = 8
+# Pixels sampled along each axis of a thumbnail cell
+SAMPLES_PER_CELL = 4
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def dhash(frames: np.ndarray) -> np.ndarray:
+    """64-bit difference hashes for a batch of RGB frames
+
+    Args:
+        frames (np.ndarray): uint8 frames of shape (n, h, w, 3), or a single (h, w, 3) frame
+
+    Returns:
+        np.ndarray: uint64 hashes of shape (n,), or a uint64 scalar for a single frame
+    """
+    single = frames.ndim == 3
+    if single:
+        frames = frames[None]
+
+    n, height, width = frames.shape[:3]
+    rows = _cell_samples(height, HASH_SIZE)
+    cols = _cell_samples(width, HASH_SIZE + 1)
+
+    # Gather a small grid of pixels per cell for the whole batch at once
+    sampled = frames[:, rows[:, None], cols].astype(np.float32)
+    gray = sampled @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    thumbnail = gray.reshape(n, HASH_SIZE, SAMPLES_PER_CELL, HASH_SIZE + 1, SAMPLES_PER_CELL).mean(axis=(2, 4))
+
+    bits = thumbnail[:, :, 1:] > thumbnail[:, :, :-1]
+    hashes = np.packbits(bits.reshape(n, -1), axis=1).view('>u8').astype(np.uint64).ravel()
+    return hashes[0] if single else hashes
+
+
+def hamming_distance(hashes: np.ndarray, other) -> np.ndarray:
+    """Number of differing bits between hashes and other (broadcasting)"""
+    diff = np.bitwise_xor(np.asarray(hashes, dtype=np.uint64), np.asarray(other, dtype=np.uint64))
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(diff).astype(np.int32)
+    counts = _POPCOUNT_TABLE[np.ascontiguousarray(diff).view(np.uint8)]
+    return counts.reshape(diff.shape + (8,)).sum(axis=-1, dtype=np.int32)
+
+
+class PerceptualHashIndex:
+    """Growable index of 64-bit perceptual hashes with Hamming lookups
+
+    Hashes are packed into one contiguous uint64 array, so a lookup is a
+    single vectorized XOR + popcount over every stored hash.
+    """
+
+    def __init__(self, max_distance: int = 6, capacity: int = 256):
+        self.max_distance = max_distance
+        self._hashes = np.empty(capacity, dtype=np.uint64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def hashes(self) -> np.ndarray:
+        return self._hashes[:self._size]
+
+    def add(self, frame_hash) -> int:
+        """Store a hash and return its position in the index"""
+        if self._size == len(self._hashes):
+            grown = np.empty(max(1, 2 * len(self._hashes)), dtype=np.uint64)
+            grown[:self._size] = self._hashes[:self._size]
+            self._hashes = grown
+        self._hashes[self._size] = frame_hash
+        self._size += 1
+        return self._size - 1
+
+    def nearest(self, frame_hash) -> Tuple[int, int]:
+        """(position, distance) of the closest stored hash, or (-1, 65) when empty"""
+        if not self._size:
+            return -1, HASH_SIZE * HASH_SIZE + 1
+        distances = hamming_distance(self.hashes, frame_hash)
+        position = int(np.argmin(distances))
+        return position, int(distances[position])
+
+    def is_duplicate(self, frame_hash) -> bool:
+        """Whether a stored hash lies within max_distance bits of frame_hash"""
+        return self.nearest(frame_hash)[1] <= self.max_distance
+
+    def add_if_unique(self, frame_hash) -> bool:
+        """Store frame_hash unless it is a near-duplicate; return whether it was stored"""
+        if self.is_duplicate(frame_hash):
+            return False
+        self.add(frame_hash)
+        return True
+
+
+def _cell_samples(length: int, cells: int) -> np.ndarray:
+    """Pixel offsets sampling SAMPLES_PER_CELL points inside each of cells equal cells"""
+    cell = length / cells
+    offsets = (np.arange(SAMPLES_PER_CELL) + 0.5) * cell / SAMPLES_PER_CELL
+    positions = np.arange(cells)[:, None] * cell + offsets
+    return np.minimum(positions.astype(np.int64), length - 1).ravel()
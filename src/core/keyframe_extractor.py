@@ -1,16 +1,145 @@
-from typing import Dict, List
+import heapq
+from typing import Dict, Iterable, List, Tuple
 import numpy as np
+from .frame_hash import PerceptualHashIndex, dhash
+from .scene_detector import SceneDetector, iter_frame_batches, iter_scene_changes
+from ..models.visual_models import ContentAnalyzer
+from ..utils.config import get_config
+from ..utils.logger import count
 
 class KeyframeExtractor:
-    def __init__(self):
+    # Frames scored per vectorized scene-detection pass
+    SCENE_BATCH_SIZE = 32
+    # Importance added to the first frame of each scene
+    SCENE_START_BONUS = 0.25
+    
+    def __init__(self, max_frames: int = None, duplicate_distance: int = None):
+        keyframe_settings = get_config().keyframes
+        self.max_frames = max_frames if max_frames is not None else keyframe_settings.max_frames
+        if self.max_frames < 0:
+            raise ValueError(f"max_frames must be 0 or more, got {self.max_frames}")
+        self.duplicate_distance = (duplicate_distance if duplicate_distance is not None
+                                   else keyframe_settings.duplicate_distance)
         self.scene_detector = SceneDetector()
         self.content_analyzer = ContentAnalyzer()
         
     def detect_scene_changes(self, frames: List[np.ndarray]) -> List[int]:
-        """Detect scene boundaries"""
+        """Detect scene boundaries
         
-    def extract_important_frames(self, frames: List[np.ndarray]) -> List[Dict]:
-        """Select visually important frames"""
+        Returns the indices of frames that start a new scene, scored with
+        keyframes.scene_threshold from settings.yaml.
+        """
+        return self.scene_detector.detect(iter_frame_batches(frames, self.SCENE_BATCH_SIZE))
+    
+    def detect_scene_changes_stream(self, frame_batches: Iterable[Tuple[np.ndarray, np.ndarray]]) -> Iterable[Tuple[int, float]]:
+        """Detect scene boundaries while frames are being decoded
+        
+        Consumes the (timestamps, frames) batches produced by
+        VideoProcessor.iter_frames(batch_size=...) and yields
+        (frame index, timestamp) for each cut as soon as its batch is scored.
+        """
+        return iter_scene_changes(self.scene_detector, frame_batches)
+        
+    def extract_important_frames(self, frames: List[np.ndarray], timestamps: List[float] = None) -> List[Dict]:
+        """Select visually important frames
+        
+        List-based wrapper around select_keyframes(); see there for details.
+        """
+        if timestamps is None:
+            timestamps = np.arange(len(frames), dtype=np.float64)
+        batches = ((np.asarray(timestamps[start:start + self.SCENE_BATCH_SIZE]), batch)
+                   for start, batch in zip(range(0, len(frames), self.SCENE_BATCH_SIZE),
+                                           iter_frame_batches(frames, self.SCENE_BATCH_SIZE)))
+        return self.select_keyframes(batches)
+    
+    def select_keyframes(self, frame_batches: Iterable[Tuple[np.ndarray, np.ndarray]]) -> List[Dict]:
+        """Pick the max_frames most important unique frames from a frame stream
+        
+        Consumes (timestamps, frames) batches, e.g. from
+        VideoProcessor.iter_frames(batch_size=...). Each decoded frame is
+        hashed and dropped right away if it is within duplicate_distance bits
+        of a frame already kept, so content analysis only runs on unique
+        frames. Survivors compete for max_frames slots in a min-heap, which
+        bounds memory to max_frames frames regardless of video length;
+        max_frames=0 selects none.
+        
+        Returns:
+            List[Dict]: Selected frames in time order, each with 'index',
+                'timestamp', 'scene', 'hash', 'importance', 'analysis' and 'frame'
+        """
+        selection = self.start_selection()
+        for timestamps, frames in frame_batches:
+            selection.add(timestamps, frames)
+        keyframes = selection.keyframes()
+        count('keyframes', len(keyframes))
+        return keyframes
+    
+    def start_selection(self) -> 'KeyframeSelection':
+        """Incremental form of select_keyframes(), fed one batch at a time"""
+        self.scene_detector.reset()
+        return KeyframeSelection(self)
         
     def analyze_visual_content(self, frame: np.ndarray) -> Dict:
         """Analyze frame content for importance"""
+        return self.content_analyzer.analyze(frame)
+
+
+class KeyframeSelection:
+    """Running state of KeyframeExtractor.select_keyframes()
+    
+    Scene detection, duplicate hashes and the max_frames heap carry over
+    between add() calls, so the current best keyframes of a stream that is
+    still growing can be read at any time with keyframes().
+    """
+    
+    def __init__(self, extractor: KeyframeExtractor):
+        self.extractor = extractor
+        self.hash_index = PerceptualHashIndex(extractor.duplicate_distance)
+        self.heap = []
+        self.scene = -1
+    
+    @property
+    def frame_count(self) -> int:
+        return self.extractor.scene_detector.frame_index
+    
+    def add(self, timestamps: np.ndarray, frames: np.ndarray):
+        extractor = self.extractor
+        start = extractor.scene_detector.frame_index
+        cuts = set(extractor.scene_detector.update(frames))
+        if start == 0:
+            cuts.add(0)
+        hashes = dhash(frames)
+        
+        for offset in range(len(frames)):
+            index = start + offset
+            if index in cuts:
+                self.scene += 1
+            if not self.hash_index.add_if_unique(hashes[offset]):
+                continue
+            # With max_frames=0 no frame is kept, so none needs analyzing
+            if not extractor.max_frames:
+                continue
+            
+            analysis = extractor.analyze_visual_content(frames[offset])
+            importance = analysis['importance'] + (extractor.SCENE_START_BONUS if index in cuts else 0.0)
+            if len(self.heap) == extractor.max_frames and importance <= self.heap[0][0]:
+                continue
+            
+            entry = (importance, index, {
+                'index': index,
+                'timestamp': float(timestamps[offset]),
+                'scene': self.scene,
+                'hash': int(hashes[offset]),
+                'importance': importance,
+                'analysis': analysis,
+                # Copy so the kept frame does not pin its whole batch in memory
+                'frame': frames[offset].copy()
+            })
+            if len(self.heap) < extractor.max_frames:
+                heapq.heappush(self.heap, entry)
+            else:
+                heapq.heapreplace(self.heap, entry)
+    
+    def keyframes(self) -> List[Dict]:
+        """Frames kept so far, in time order"""
+        return [entry[2] for entry in sorted(self.heap, key=lambda entry: entry[1])]
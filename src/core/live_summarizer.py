@@ -0,0 +1,488 @@
+# src/core/live_summarizer.py
+import os
+import stat
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from ..utils.config import get_config
+
+
+class LiveSource:
+    """Decode a growing file or a pipe into audio samples and sampled frames
+
+    One ffmpeg process writes mono s16le PCM to an extra pipe and
+    letterboxed RGB frames (one every frame_interval seconds) to stdout.
+    Reader threads drain both continuously, so ffmpeg never waits on the
+    consumer: audio accumulates until taken, and when the consumer falls
+    behind on frames the oldest buffered frames are dropped. The live edge
+    is therefore always the latest media time ffmpeg has produced.
+
+    ffmpeg refuses to start when the source has no audio stream (e.g. a
+    screen capture), because the PCM output would be empty. LiveSource then
+    starts it again without that output and has_audio turns False. Pipes
+    are fed to ffmpeg through this process, keeping what was sent before
+    the first output so a restart can replay it.
+
+    Args:
+        source (str): A file (followed while it grows when follow is set),
+            a FIFO, or '-' for this process's stdin
+        follow (bool): Keep reading at end of file until no data has
+            arrived for idle_timeout seconds (default: for regular files)
+    """
+
+    # Bytes per read from the PCM pipe (0.1 s at 16 kHz)
+    AUDIO_READ_SIZE = 3200
+    # Bytes per read from a piped source
+    INPUT_READ_SIZE = 1 << 16
+    # Most piped input kept for a restart; ffmpeg probes far less than this
+    MAX_REPLAY_BYTES = 64 << 20
+
+    def __init__(self, source: str, frame_interval: float, frame_size: Tuple[int, int],
+                 sample_rate: int, follow: bool = None, idle_timeout: float = 10.0,
+                 frame_buffer: int = 256):
+        self.source = source
+        self.frame_interval = frame_interval
+        self.frame_size = tuple(frame_size)
+        self.sample_rate = sample_rate
+        self.follow = os.path.isfile(source) if follow is None else follow
+        self.idle_timeout = idle_timeout
+        self.has_audio = True
+        self.samples_read = 0
+        self.frames_read = 0
+        self.dropped_frames = 0
+        self.error = None
+        self._audio = []
+        self._frames = deque(maxlen=frame_buffer)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stderr = deque(maxlen=20)
+        self.process = None
+        self.piped = source == '-' or (os.path.exists(source) and stat.S_ISFIFO(os.stat(source).st_mode))
+        self._input_lock = threading.Lock()
+        self._input_done = False
+        self._replay = bytearray() if self.piped else None
+
+    def command(self, audio_fd: int = None) -> List[str]:
+        width, height = self.frame_size
+        command = ['ffmpeg', '-v', 'error'] + (['-nostdin'] if not self.piped else [])
+        if self.follow:
+            # rw_timeout is in microseconds; it is what ends a followed file
+            command += ['-follow', '1', '-rw_timeout', str(int(self.idle_timeout * 1e6)),
+                        '-i', f"file:{self.source}"]
+        else:
+            command += ['-i', 'pipe:0' if self.piped else self.source]
+        command += [
+            '-map', '0:v:0',
+            '-vf', (f"fps=1/{self.frame_interval},"
+                    f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                    f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"),
+            '-pix_fmt', 'rgb24', '-f', 'rawvideo', 'pipe:1'
+        ]
+        if audio_fd is not None:
+            command += ['-map', '0:a:0?', '-ac', '1', '-ar', str(self.sample_rate),
+                        '-f', 's16le', '-flush_packets', '1', f"pipe:{audio_fd}"]
+        return command
+
+    def start(self):
+        self._launch()
+        self._start_thread(self._read_stderr)
+        if self.piped:
+            # Not joined: it may block on a source that outlives ffmpeg
+            threading.Thread(target=self._pump_input, daemon=True).start()
+
+    def _launch(self):
+        """Start ffmpeg and the readers of its outputs"""
+        audio_read = audio_write = None
+        if self.has_audio:
+            audio_read, audio_write = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                self.command(audio_write),
+                stdin=subprocess.PIPE if self.piped else subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                pass_fds=(audio_write,) if audio_write is not None else ())
+        finally:
+            if audio_write is not None:
+                os.close(audio_write)
+        if audio_read is not None:
+            self._start_thread(self._read_audio, os.fdopen(audio_read, 'rb'))
+        self._start_thread(self._read_frames, self.process)
+
+    def _start_thread(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    @property
+    def finished(self) -> bool:
+        """True once ffmpeg has exited and everything it wrote has been read"""
+        return all(not thread.is_alive() for thread in self._threads)
+
+    @property
+    def edge(self) -> float:
+        """Latest media time decoded so far, in seconds"""
+        return max(self.samples_read / self.sample_rate, self.frames_read * self.frame_interval)
+
+    def take_audio(self) -> np.ndarray:
+        """All int16 samples read since the previous call"""
+        with self._lock:
+            chunks, self._audio = self._audio, []
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+
+    def take_frames(self, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Up to limit buffered (timestamps, frames), oldest first"""
+        with self._lock:
+            taken = [self._frames.popleft() for _ in range(min(limit, len(self._frames)))]
+        if not taken:
+            return np.zeros(0), None
+        return np.array([timestamp for timestamp, _ in taken]), np.stack([frame for _, frame in taken])
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait()
+        for thread in self._threads:
+            thread.join()
+
+    def _read_audio(self, pipe):
+        remainder = b''
+        with pipe:
+            for data in iter(lambda: pipe.read1(self.AUDIO_READ_SIZE), b''):
+                data = remainder + data
+                usable = len(data) - len(data) % 2
+                remainder = data[usable:]
+                samples = np.frombuffer(data[:usable], dtype='<i2')
+                with self._lock:
+                    self._audio.append(samples)
+                    self.samples_read += len(samples)
+
+    def _read_frames(self, process: subprocess.Popen):
+        width, height = self.frame_size
+        frame_bytes = width * height * 3
+        for data in iter(lambda: process.stdout.read(frame_bytes), b''):
+            if len(data) < frame_bytes:
+                break
+            frame = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+            with self._lock:
+                if len(self._frames) == self._frames.maxlen:
+                    self.dropped_frames += 1
+                self._frames.append((self.frames_read * self.frame_interval, frame))
+                self.frames_read += 1
+
+    def _read_stderr(self):
+        while True:
+            for line in self.process.stderr:
+                self._stderr.append(line.decode(errors='replace').strip())
+            returncode = self.process.wait()
+            if returncode != 0 and self._missing_audio():
+                # Runs on this thread, which keeps finished False across the restart
+                self.has_audio = False
+                self._stderr.clear()
+                with self._input_lock:
+                    self._launch()
+                    self._replay_input()
+                continue
+            # A followed file always ends with rw_timeout's I/O error
+            if returncode != 0 and not self.follow:
+                self.error = '\n'.join(self._stderr) or f"ffmpeg exited with status {returncode}"
+            return
+
+    def _missing_audio(self) -> bool:
+        """Whether ffmpeg refused to start because the source has no audio stream"""
+        return (self.has_audio and not self.frames_read and not self.samples_read
+                and (not self.piped or self._replay is not None)
+                and any('does not contain any stream' in line for line in self._stderr))
+
+    def _pump_input(self):
+        """Copy a piped source into ffmpeg's stdin, keeping the start for a restart"""
+        source = sys.stdin.buffer if self.source == '-' else open(self.source, 'rb')
+        try:
+            for data in iter(lambda: source.read1(self.INPUT_READ_SIZE), b''):
+                with self._input_lock:
+                    if self._replay is not None:
+                        if self.frames_read or self.samples_read or len(self._replay) > self.MAX_REPLAY_BYTES:
+                            self._replay = None
+                        else:
+                            self._replay += data
+                    self._write_input(data)
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+            with self._input_lock:
+                self._input_done = True
+                self._close_input()
+
+    def _replay_input(self):
+        """Send a restarted ffmpeg what its predecessor had read; caller holds _input_lock"""
+        if self._replay:
+            self._write_input(bytes(self._replay))
+        if self._input_done:
+            self._close_input()
+
+    def _write_input(self, data: bytes):
+        try:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            # ffmpeg has exited; a restart replays the data if it needs it
+            pass
+
+    def _close_input(self):
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+class LiveSummarizer:
+    """Incremental summarization of a recording that is still being written
+
+    Audio features are computed window by window on a continuous frame
+    grid, frames feed an incremental keyframe selection (scene detection,
+    duplicate hashing, importance heap), and speech is transcribed on a
+    background thread in spans cut at pauses, holding back an utterance
+    that is still going on for at most transcription.max_chunk_length
+    seconds. Every update_interval seconds the fusion runs over everything
+    so far and a partial summary is written to live_summary.json.
+
+    Lag behind the live edge is bounded by max_lag: LiveSource buffers at
+    most max_lag seconds of frames and drops older ones, and while the
+    recognizer is busy, audio waiting for it more than max_lag behind the
+    edge is skipped (keeping the last max_lag / 2 seconds) and
+    recorded in 'transcript_gaps'. The transcript can thus trail the edge
+    by max_lag plus the time of the recognizer call in flight.
+
+    Args:
+        transcription_service: Service used for speech (default: a
+            TranscriptionService; False skips transcription)
+        on_update (Callable): Called with every partial and the final summary
+    """
+
+    # Frames per keyframe-selection batch
+    FRAME_BATCH_SIZE = 32
+
+    def __init__(self, source: str, output_dir: str, update_interval: float = None,
+                 max_lag: float = None, frame_interval: float = None, follow: bool = None,
+                 transcription_service=None, on_update: Callable[[Dict], None] = None):
+        from .audio_features import AudioFeatureEngine
+        from .keyframe_extractor import KeyframeExtractor
+        from .multimodal_fusion import MultimodalFusion
+
+        config = get_config()
+        self.output_dir = output_dir
+        self.update_interval = update_interval or config.live.update_interval
+        self.max_lag = max_lag or config.live.max_lag
+        self.on_update = on_update
+        self.sample_rate = config.audio.sample_rate
+        frame_interval = frame_interval or config.keyframes.extraction_interval
+        # Buffer at most max_lag worth of frames; older ones are dropped
+        self.source = LiveSource(source, frame_interval, config.live.frame_size, self.sample_rate, follow,
+                                 config.live.idle_timeout,
+                                 frame_buffer=max(self.FRAME_BATCH_SIZE, int(self.max_lag / frame_interval)))
+
+        self.engine = AudioFeatureEngine(self.sample_rate)
+        self.window_samples = int(config.live.analysis_window * self.sample_rate)
+        self.features = {name: [] for name in ('rms', 'voicing', 'pitch')}
+        self.feature_frames = 0
+        self._carry = np.zeros(0, dtype=np.int16)
+        self.selection = KeyframeExtractor().start_selection()
+        self.visual_until = 0.0
+        self.fusion = MultimodalFusion()
+
+        if transcription_service is None:
+            from .transcription_service import TranscriptionService
+            transcription_service = TranscriptionService()
+        self.transcription = transcription_service or None
+        self.max_chunk_length = config.transcription.max_chunk_length
+        self.segments = []
+        self.transcript_gaps = []
+        self.errors = []
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._pending_start = 0.0
+        self._transcribed_until = 0.0
+        self._job = None
+        self._job_span = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def run(self) -> Dict:
+        """Process the source until it ends; returns the final summary"""
+        self.source.start()
+        next_update = time.monotonic() + self.update_interval
+        try:
+            while True:
+                done = self.source.finished
+                progressed = self._process_audio(flush=done)
+                progressed |= self._process_frames()
+                progressed |= self._transcribe(final=done)
+                if time.monotonic() >= next_update:
+                    self.update()
+                    next_update = time.monotonic() + self.update_interval
+                if done and not progressed and self._job is None:
+                    break
+                if not progressed:
+                    time.sleep(0.05)
+        finally:
+            self.source.close()
+            self._executor.shutdown(wait=True)
+
+        if self.source.error:
+            self.errors.append(self.source.error)
+        summary = self.update(final=True)
+        self._export_final()
+        return summary
+
+    def update(self, final: bool = False) -> Dict:
+        """Fuse everything processed so far and write live_summary.json"""
+        from ..export.summary_exporter import SummaryExporter
+
+        edge = self.source.edge
+        analysis = {'features': dict(self._feature_arrays(), times=self.engine.frame_times(self.feature_frames))}
+        keyframes = self.selection.keyframes()
+        summary = self.fusion.fuse_modalities(analysis, {'segments': self.segments},
+                                              {'keyframes': keyframes, 'duration': edge})
+        summary['keyframes'] = [{key: keyframe[key] for key in ('timestamp', 'scene', 'importance')}
+                                for keyframe in keyframes]
+        audio_until = self.feature_frames * self.engine.hop_length / self.sample_rate
+        summary['live'] = {
+            'final': final,
+            'live_edge': edge,
+            'lag': {'audio': max(0.0, edge - audio_until) if self.source.has_audio else None,
+                    'visual': max(0.0, edge - self.visual_until),
+                    'transcript': (max(0.0, edge - self._transcribed_until)
+                                   if self.transcription and self.source.has_audio else None)},
+            'has_audio': self.source.has_audio,
+            'dropped_frames': self.source.dropped_frames,
+            'transcript_gaps': list(self.transcript_gaps),
+            'errors': list(self.errors),
+            'updated_at': time.time()
+        }
+        SummaryExporter().export({key: value for key, value in summary.items() if key != 'timeline'},
+                                 self.output_dir, {'filename': 'live_summary'})
+        if self.on_update is not None:
+            self.on_update(summary)
+        return summary
+
+    def _feature_arrays(self) -> Dict:
+        arrays = {name: np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+                  for name, chunks in self.features.items()}
+        arrays.update(sample_rate=self.sample_rate, hop_length=self.engine.hop_length)
+        return arrays
+
+    def _process_audio(self, flush: bool = False) -> bool:
+        samples = self.source.take_audio()
+        if len(samples) and self.transcription:
+            self._pending = np.concatenate([self._pending, samples])
+        self._carry = np.concatenate([self._carry, samples])
+        if len(self._carry) < (1 if flush else self.window_samples):
+            return len(samples) > 0
+
+        # Whole feature frames only; the rest starts the next window, which
+        # keeps the frame grid continuous across windows
+        hop, win = self.engine.hop_length, self.engine.win_length
+        frames = (len(self._carry) - win) // hop + 1 if len(self._carry) >= win else 0
+        if flush and len(self._carry):
+            frames = self.engine.num_frames(len(self._carry))
+        if frames <= 0:
+            return len(samples) > 0
+        window = self._carry[:(frames - 1) * hop + win]
+        features = self.engine.compute(window)
+        for name in self.features:
+            self.features[name].append(features[name][:frames])
+        self.feature_frames += frames
+        self._carry = self._carry[frames * hop:]
+        return True
+
+    def _process_frames(self) -> bool:
+        timestamps, frames = self.source.take_frames(self.FRAME_BATCH_SIZE)
+        if not len(timestamps):
+            return False
+        self.selection.add(timestamps, frames)
+        self.visual_until = float(timestamps[-1]) + self.source.frame_interval
+        return True
+
+    def _transcribe(self, final: bool = False) -> bool:
+        """Collect a finished transcription job and start the next one"""
+        if not self.transcription:
+            return False
+        if self._job is not None:
+            if not self._job.done():
+                self._skip_if_behind()
+                return False
+            start, end = self._job_span
+            try:
+                transcript = self._job.result()
+                self.segments.extend(dict(segment, start=segment['start'] + start, end=segment['end'] + start)
+                                     for segment in transcript['segments'])
+            except Exception as e:
+                self.errors.append(f"Transcription of {start:.1f}-{end:.1f} s failed: {e}")
+            self._transcribed_until = end
+            self._job = None
+
+        cut = self._cut_point(final)
+        if cut is None:
+            return False
+        span = self._pending[:cut]
+        start = self._pending_start
+        end = start + cut / self.sample_rate
+        self._pending = self._pending[cut:]
+        self._pending_start = end
+        if not len(span):
+            self._transcribed_until = end
+            return False
+        self._job = self._executor.submit(self.transcription.transcribe, span)
+        self._job_span = (start, end)
+        return True
+
+    def _cut_point(self, final: bool):
+        """Samples of pending audio to transcribe now, or None to wait for more"""
+        total = len(self._pending)
+        if final:
+            return total if total else None
+        duration = total / self.sample_rate
+        if duration < 1.0:
+            return None
+        regions = self.transcription.segmenter.speech_regions(self._pending, self.sample_rate)
+        if not len(regions):
+            # Silence only: nothing to transcribe, keep a little in case speech starts
+            return max(0, total - self.sample_rate // 2)
+        if regions[-1][1] < duration - self.transcription.segmenter.min_silence:
+            return total
+        if duration < self.max_chunk_length:
+            return None
+        # Speech runs up to the edge: hold back the last utterance, unless it
+        # is the only one and already a full chunk long
+        held = regions[-1][0] if regions[-1][0] > 1.0 else duration
+        return int(held * self.sample_rate)
+
+    def _skip_if_behind(self):
+        """Drop untranscribed audio further than max_lag behind the edge"""
+        behind = self.source.edge - self._pending_start
+        if behind <= self.max_lag:
+            return
+        keep_from = self.source.edge - min(self.max_lag / 2, self.max_chunk_length)
+        # The edge can be ahead of the audio taken so far; only pending samples can go
+        drop = min(int((keep_from - self._pending_start) * self.sample_rate), len(self._pending))
+        if drop <= 0:
+            return
+        gap_end = self._pending_start + drop / self.sample_rate
+        if self.transcript_gaps and self.transcript_gaps[-1][1] >= self._pending_start:
+            self.transcript_gaps[-1] = (self.transcript_gaps[-1][0], gap_end)
+        else:
+            self.transcript_gaps.append((self._pending_start, gap_end))
+        self._pending = self._pending[drop:]
+        self._pending_start += drop / self.sample_rate
+
+    def _export_final(self):
+        from ..export.export_manager import ExportManager
+
+        data = {'transcript': {'segments': self.segments}, 'keyframes': self.selection.keyframes()}
+        components = [component for component in ('transcript', 'keyframes')
+                      if component != 'transcript' or self.transcription]
+        results = ExportManager().selective_export(components, {}, self.output_dir, data)
+        self.errors.extend(result for result in results.values()
+                           if isinstance(result, str) and result.startswith('Error'))
@@ -1,14 +1,126 @@
-from typing import Dict
+# src/core/multimodal_fusion.py
+from typing import Dict, List, Sequence
 import numpy as np
+from .timeline import SegmentTimeline
+
 
 class MultimodalFusion:
-    def __init__(self):
-        self.fusion_model = load_fusion_model()
-        
-    def fuse_modalities(self, audio_features: Dict, 
-                       text_features: Dict, 
+    """Summary highlights from aligned audio, transcript and keyframe scores
+
+    The modalities are resampled onto a SegmentTimeline, fused with the
+    confidence-adaptive FusionStrategy, smoothed, and the best segments are
+    picked under the summary duration budget (fusion.summary_ratio of the
+    video, at most fusion.max_summary_duration seconds). The fusion result
+    keeps the timeline, so a library can be re-scored with new weights via
+    rescore() without touching any audio or video.
+    """
+
+    def __init__(self, strategy=None):
+        from ..utils.config import get_config
+
+        self.config = get_config().fusion
+        self._strategy = strategy
+
+    @property
+    def strategy(self):
+        if self._strategy is None:
+            from ..models.fusion_strategy import FusionStrategy
+            self._strategy = FusionStrategy()
+        return self._strategy
+
+    def fuse_modalities(self, audio_features: Dict,
+                       text_features: Dict,
                        visual_features: Dict) -> Dict:
-        """Combine multimodal features"""
-        
-    def compute_importance_scores(self, fused_features: Dict) -> np.ndarray:
+        """Combine multimodal features
+
+        Args:
+            audio_features (Dict): AudioAnalyzer.analyze_audio_comprehensive output
+            text_features (Dict): TranscriptionService.transcribe output
+            visual_features (Dict): 'keyframes' from KeyframeExtractor.select_keyframes,
+                optionally 'duration' of the video in seconds
+
+        Returns:
+            Dict: 'duration', 'summary_duration', 'weights', 'highlights'
+                (time-ordered dicts with 'start', 'end', 'score' and the
+                transcript 'text' spoken in them) and 'timeline'
+                (SegmentTimeline.to_dict() plus the fused 'importance')
+        """
+        visual_features = visual_features or {}
+        timeline = SegmentTimeline.from_analysis(audio_features, text_features,
+                                                 visual_features.get('keyframes'),
+                                                 duration=visual_features.get('duration'),
+                                                 segment_length=self.config.segment_length)
+        importance = self.compute_importance_scores(timeline)
+        segments = (text_features or {}).get('segments') or []
+        result = self._summarize(timeline, importance, segments)
+        result['timeline'] = dict(timeline.to_dict(), importance=importance)
+        return result
+
+    def compute_importance_scores(self, fused_features: SegmentTimeline) -> np.ndarray:
         """Calculate importance scores for content segments"""
+        return self._smooth(self.strategy.adaptive_fusion(fused_features), fused_features.segment_length)
+
+    def rescore(self, fusion_results: Sequence[Dict], weights: Dict[str, float] = None,
+                transcripts: Sequence[Dict] = None) -> List[Dict]:
+        """Recompute highlights for many stored fusion results at once
+
+        The stored timelines are fused together in one vectorized pass with
+        the given weights (default: the current ones); only highlight
+        selection runs per video.
+        """
+        from ..models.fusion_strategy import FusionStrategy
+
+        strategy = FusionStrategy(weights=weights) if weights else self.strategy
+        timelines = [SegmentTimeline.from_dict(result['timeline']) for result in fusion_results]
+        transcripts = transcripts or [None] * len(timelines)
+        rescored = []
+        for timeline, fused, transcript in zip(timelines, strategy.fuse_batch(timelines), transcripts):
+            importance = self._smooth(fused, timeline.segment_length)
+            result = self._summarize(timeline, importance, (transcript or {}).get('segments') or [],
+                                     strategy.weights)
+            result['timeline'] = dict(timeline.to_dict(), importance=importance)
+            rescored.append(result)
+        return rescored
+
+    def _summarize(self, timeline: SegmentTimeline, importance: np.ndarray, segments: Sequence[Dict],
+                   weights: Dict[str, float] = None) -> Dict:
+        budget = min(timeline.duration * self.config.summary_ratio, self.config.max_summary_duration)
+        starts, ends = timeline.starts, timeline.ends
+        chosen = self.strategy.select_segments(importance, ends - starts, budget)
+        highlights = []
+        if len(chosen):
+            # Runs of consecutive chosen segments become one highlight
+            breaks = np.flatnonzero(np.diff(chosen) > 1) + 1
+            for run in np.split(chosen, breaks):
+                highlights.append({'start': float(starts[run[0]]), 'end': float(ends[run[-1]]),
+                                   'score': float(importance[run].mean())})
+            self._attach_text(highlights, segments)
+        return {
+            'duration': timeline.duration,
+            'summary_duration': float(sum(highlight['end'] - highlight['start'] for highlight in highlights)),
+            'weights': dict(weights or self.strategy.weights),
+            'highlights': highlights
+        }
+
+    def _smooth(self, scores: np.ndarray, segment_length: float) -> np.ndarray:
+        width = int(round(self.config.smoothing / segment_length))
+        if width <= 1 or len(scores) < width:
+            return scores.astype(np.float32, copy=False)
+        kernel = np.ones(width, dtype=np.float32) / width
+        return np.convolve(scores, kernel, mode='same').astype(np.float32)
+
+    @staticmethod
+    def _attach_text(highlights: List[Dict], segments: Sequence[Dict]):
+        """Transcript text overlapping each highlight, found by binary search"""
+        if not segments:
+            for highlight in highlights:
+                highlight['text'] = ''
+            return
+        segments = sorted(segments, key=lambda segment: segment['start'])
+        seg_starts = np.array([segment['start'] for segment in segments])
+        # Running maximum keeps the end times sorted for searchsorted
+        seg_ends = np.maximum.accumulate(np.array([segment['end'] for segment in segments]))
+        for highlight in highlights:
+            first = np.searchsorted(seg_ends, highlight['start'], side='right')
+            last = np.searchsorted(seg_starts, highlight['end'], side='left')
+            highlight['text'] = ' '.join(segment['text'] for segment in segments[first:last])
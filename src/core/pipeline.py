@@ -0,0 +1,171 @@
+# src/core/pipeline.py
+from functools import partial
+from typing import Dict, List
+from ..utils.pipeline_scheduler import PipelineScheduler, Stage
+
+# Stage functions live at module level so process-pool stages can pickle them.
+# Heavy modules are imported inside each function, in the process that runs it.
+
+
+def probe_video(video_path: str) -> Dict:
+    from .video_processor import VideoProcessor
+    return VideoProcessor(video_path).get_video_info()
+
+
+def extract_audio(video_path: str, sample_rate: int = None):
+    from .video_processor import VideoProcessor
+    processor = VideoProcessor(video_path)
+    processor.extract_audio(sample_rate)
+    return processor.audio_buffer
+
+
+def decode_frames(video_path: str, video_info: Dict, interval: float = 1.0, batch_size: int = 32,
+                  width: int = None, intra_only: bool = False):
+    from .video_processor import VideoProcessor
+    processor = VideoProcessor(video_path)
+    processor._apply_video_info(video_info)
+    return processor.iter_frames(interval, batch_size=batch_size, width=width, intra_only=intra_only)
+
+
+def analyze_audio(audio) -> Dict:
+    from .audio_analyzer import AudioAnalyzer
+    return AudioAnalyzer().analyze_audio_comprehensive(audio)
+
+
+def transcribe(audio) -> Dict:
+    from .transcription_service import TranscriptionService
+    return TranscriptionService().transcribe(audio)
+
+
+def skip_transcript(audio) -> Dict:
+    """Empty transcript for preview tiers without speech recognition"""
+    return {'language': None, 'text': '', 'segments': [], 'chunks': []}
+
+
+def select_keyframes(frames) -> List[Dict]:
+    from .keyframe_extractor import KeyframeExtractor
+    return KeyframeExtractor().select_keyframes(frames)
+
+
+def fuse(audio_analysis: Dict, transcript: Dict, keyframes: List[Dict], video_info: Dict) -> Dict:
+    from .multimodal_fusion import MultimodalFusion
+    return MultimodalFusion().fuse_modalities(audio_analysis, transcript,
+                                              {'keyframes': keyframes, 'duration': video_info.get('duration') or None})
+
+
+def _export_selected(data: Dict, output_dir: str, components: List[str] = None,
+                     format_options: Dict = None) -> Dict:
+    """Export the selected components found in data; returns their results and timings"""
+    from ..export.export_manager import ExportManager
+    manager = ExportManager()
+    selected = [component for component in components or ['summary'] if component in data]
+    results = manager.selective_export(selected, format_options or {}, output_dir, data)
+    return {'results': results, 'timings': manager.timings}
+
+
+def export_transcript(transcript: Dict, output_dir: str, components: List[str] = None,
+                      format_options: Dict = None) -> Dict:
+    return _export_selected({'transcript': transcript}, output_dir, components, format_options)
+
+
+def export_keyframes(keyframes: List[Dict], output_dir: str, components: List[str] = None,
+                     format_options: Dict = None) -> Dict:
+    return _export_selected({'keyframes': keyframes}, output_dir, components, format_options)
+
+
+def export_summary(fusion: Dict, video_path: str, output_dir: str, components: List[str] = None,
+                   format_options: Dict = None) -> Dict:
+    return _export_selected({'summary': fusion, 'audio': {'source': video_path, 'segments': fusion['highlights']}},
+                            output_dir, components, format_options)
+
+
+def export(output_dir: str, components: List[str] = None, **parts: Dict) -> Dict:
+    """Combine the results of the export stages and write export_report.json"""
+    from ..export.export_manager import ExportManager
+    manager = ExportManager()
+    results = {}
+    for part in parts.values():
+        results.update(part['results'])
+        manager.timings.update(part['timings'])
+    order = list(dict.fromkeys(components or ['summary']))
+    results = dict(sorted(results.items(), key=lambda item: order.index(item[0])))
+    results['report'] = manager.create_combined_report(results, {'output_dir': output_dir})
+    return results
+
+
+# Export stages by the components they write; only summary and audio need the fusion result
+_EXPORT_STAGES = {
+    'export_transcript': (export_transcript, ['transcript'], ('transcript',)),
+    'export_keyframes': (export_keyframes, ['keyframes'], ('keyframes',)),
+    'export_summary': (export_summary, ['fusion', 'video_path'], ('summary', 'audio')),
+}
+
+
+def build_video_pipeline(frame_interval: float = None, batch_size: int = 32,
+                         include_export: bool = False, max_processes: int = None,
+                         export_components: List[str] = None, export_options: Dict = None,
+                         preview: str = None) -> PipelineScheduler:
+    """Scheduler for the standard single-video summarization DAG
+
+        video_path -> video_info -> frames (streamed) -> keyframes ----.
+        video_path -> audio -> audio_analysis --------------------------+-> fusion
+                      audio -> transcript ------------------------------'
+
+    With include_export, each exported component is written as soon as
+    the artifact it comes from is ready: the transcript and the keyframes
+    while the rest of the pipeline is still running, and only the summary
+    and the audio highlights after fusion. The 'export' artifact collects
+    their results and the path of export_report.json.
+
+    Decoding and probing are I/O bound and run in threads; audio analysis and
+    transcription run in the process pool, whose workers load the models
+    declared for them as they start. Keyframe selection consumes frame
+    batches while they are decoded. Run it with the initial artifact
+    'video_path' (plus 'output_dir' for export); passing 'audio' as well,
+    e.g. a separate audio file, skips extracting it from the video.
+
+    preview names a quality tier from settings.yaml (preview.tiers) for a
+    quick triage run: frames are decoded at reduced resolution, optionally
+    key frames only, audio is analyzed at a lower sample rate, and
+    transcription can be skipped. The keyframe and fusion stages are the
+    same as in a full run.
+    """
+    from ..utils.config import get_config, get_preview_tier
+
+    if frame_interval is None:
+        frame_interval = get_config().optimization.frame_extraction_interval
+    audio_stage = Stage('audio', extract_audio, inputs=['video_path'])
+    frames_stage = Stage('frames', partial(decode_frames, interval=frame_interval, batch_size=batch_size),
+                         inputs=['video_path', 'video_info'], streaming=True)
+    transcript_stage = Stage('transcript', transcribe, inputs=['audio'], executor='process',
+                             models=['whisper'])
+    if preview:
+        tier = get_preview_tier(preview)
+        audio_stage = Stage('audio', partial(extract_audio, sample_rate=tier.sample_rate), inputs=['video_path'])
+        frames_stage = Stage('frames', partial(decode_frames, interval=max(frame_interval, tier.min_interval),
+                                               batch_size=batch_size, width=tier.frame_width,
+                                               intra_only=tier.intra_only),
+                             inputs=['video_path', 'video_info'], streaming=True)
+        if not tier.transcribe:
+            transcript_stage = Stage('transcript', skip_transcript, inputs=['audio'])
+
+    stages = [
+        Stage('video_info', probe_video, inputs=['video_path']),
+        audio_stage,
+        frames_stage,
+        Stage('audio_analysis', analyze_audio, inputs=['audio'], executor='process',
+              models=['emotion', 'tone']),
+        transcript_stage,
+        Stage('keyframes', select_keyframes, inputs=['frames'], stream_inputs=['frames']),
+        Stage('fusion', fuse, inputs=['audio_analysis', 'transcript', 'keyframes', 'video_info']),
+    ]
+    if include_export:
+        components = export_components or ['summary']
+        parts = [name for name, (_, _, written) in _EXPORT_STAGES.items() if set(written) & set(components)]
+        for name in parts:
+            func, inputs, _ = _EXPORT_STAGES[name]
+            stages.append(Stage(name, partial(func, components=components, format_options=export_options),
+                                inputs=inputs + ['output_dir']))
+        stages.append(Stage('export', partial(export, components=components), inputs=parts + ['output_dir']))
+
+    return PipelineScheduler(stages, max_processes=max_processes)
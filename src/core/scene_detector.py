@@ -0,0 +1,153 @@
+# src/core/scene_detector.py
+import numpy as np
+from typing import Iterable, List, Tuple
+
+
+class SceneDetector:
+    """Incremental scene-change detector over batches of RGB frames
+
+    Each batch is downsampled by block averaging, then scored against the
+    preceding frame in one vectorized pass: a joint color-histogram distance
+    (half the L1 distance between normalized histograms, in [0, 1]) blended
+    with the mean absolute luma difference between the downsampled frames.
+    A cut is reported where the blended distance exceeds the threshold.
+
+    The last frame's histogram and thumbnail are carried over to the next
+    call, so frames can be streamed batch by batch without keeping the whole
+    video in memory and cuts on batch boundaries are still detected.
+
+    Throughput target: at least 500 frames/s for 1920x1080 input on one CPU
+    core with the default 64-pixel analysis width.
+    """
+
+    # Pixels sampled along each axis of a downsampling block
+    SAMPLES_PER_BLOCK = 4
+
+    def __init__(self, threshold: float = None, analysis_width: int = 64,
+                 histogram_bins: int = 8, histogram_weight: float = 0.5,
+                 min_scene_length: int = 1):
+        if threshold is None:
+            from ..utils.config import get_config
+            threshold = get_config().keyframes.scene_threshold
+        if 256 % histogram_bins:
+            raise ValueError(f"histogram_bins must divide 256, got {histogram_bins}")
+
+        self.threshold = threshold
+        self.analysis_width = analysis_width
+        self.histogram_bins = histogram_bins
+        self.histogram_weight = histogram_weight
+        self.min_scene_length = min_scene_length
+        self.reset()
+
+    def reset(self):
+        """Forget the carried-over state before starting a new video"""
+        self.frame_index = 0
+        self._last_cut = None
+        self._prev_histogram = None
+        self._prev_luma = None
+
+    def scores(self, frames: np.ndarray) -> np.ndarray:
+        """Distance of every frame in the batch to the frame before it
+
+        Args:
+            frames (np.ndarray): uint8 RGB frames of shape (n, h, w, 3)
+
+        Returns:
+            np.ndarray: float32 distances in [0, 1]; the first frame of a video scores 0
+        """
+        if len(frames) == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        small = self._downsample(frames)
+        histograms = self._histograms(small)
+        luma = small @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+        prev_histograms = np.concatenate([
+            histograms[:1] if self._prev_histogram is None else self._prev_histogram[None],
+            histograms[:-1]
+        ])
+        prev_luma = np.concatenate([
+            luma[:1] if self._prev_luma is None else self._prev_luma[None],
+            luma[:-1]
+        ])
+
+        histogram_distance = 0.5 * np.abs(histograms - prev_histograms).sum(axis=1)
+        block_distance = np.abs(luma - prev_luma).mean(axis=(1, 2)) / 255.0
+
+        self._prev_histogram = histograms[-1]
+        self._prev_luma = luma[-1]
+
+        return (self.histogram_weight * histogram_distance +
+                (1.0 - self.histogram_weight) * block_distance).astype(np.float32)
+
+    def update(self, frames: np.ndarray) -> List[int]:
+        """Consume the next batch and return the indices of frames that start a new scene
+
+        Indices count frames across all batches seen since the last reset().
+        """
+        scores = self.scores(frames)
+        candidates = np.flatnonzero(scores > self.threshold) + self.frame_index
+        self.frame_index += len(scores)
+
+        # Only the (few) candidates are walked here, never every frame
+        cuts = []
+        for index in candidates.tolist():
+            if self._last_cut is None or index - self._last_cut >= self.min_scene_length:
+                cuts.append(index)
+                self._last_cut = index
+        return cuts
+
+    def detect(self, batches: Iterable[np.ndarray]) -> List[int]:
+        """Run update() over a stream of frame batches from a fresh state"""
+        self.reset()
+        cuts = []
+        for frames in batches:
+            cuts.extend(self.update(frames))
+        return cuts
+
+    def _downsample(self, frames: np.ndarray) -> np.ndarray:
+        """Block-average frames down to about analysis_width pixels wide
+
+        Only a SAMPLES_PER_BLOCK x SAMPLES_PER_BLOCK grid of pixels is read
+        from each block, gathered for the whole batch in one indexing call.
+        """
+        n, height, width = frames.shape[:3]
+        factor = max(1, width // self.analysis_width)
+        out_height, out_width = height // factor, width // factor
+        samples = min(factor, self.SAMPLES_PER_BLOCK)
+
+        offsets = (np.arange(samples) * factor) // samples
+        rows = (np.arange(out_height)[:, None] * factor + offsets).ravel()
+        cols = (np.arange(out_width)[:, None] * factor + offsets).ravel()
+        sampled = frames[:, rows[:, None], cols]
+        return sampled.reshape(n, out_height, samples, out_width, samples, 3).mean(
+            axis=(2, 4), dtype=np.float32)
+
+    def _histograms(self, small: np.ndarray) -> np.ndarray:
+        """Normalized joint RGB histograms, one row per frame"""
+        n = len(small)
+        bins = self.histogram_bins
+        quantized = small.astype(np.int32) // (256 // bins)
+        index = (quantized[..., 0] * bins + quantized[..., 1]) * bins + quantized[..., 2]
+
+        # Offset each frame into its own range so one bincount covers the batch
+        total_bins = bins ** 3
+        index = index.reshape(n, -1) + (np.arange(n) * total_bins)[:, None]
+        counts = np.bincount(index.ravel(), minlength=n * total_bins).reshape(n, total_bins)
+        return counts.astype(np.float32) / index.shape[1]
+
+
+def iter_frame_batches(frames: List[np.ndarray], batch_size: int) -> Iterable[np.ndarray]:
+    """Stack consecutive slices of a frame list into (n, h, w, 3) batches"""
+    for start in range(0, len(frames), batch_size):
+        yield np.stack(frames[start:start + batch_size])
+
+
+def iter_scene_changes(detector: SceneDetector,
+                       frame_batches: Iterable[Tuple[np.ndarray, np.ndarray]]):
+    """Yield (frame index, timestamp) for every cut in a (timestamps, frames) stream"""
+    detector.reset()
+    for timestamps, frames in frame_batches:
+        start = detector.frame_index
+        for index in detector.update(frames):
+            yield index, float(timestamps[index - start])
@@ -0,0 +1,117 @@
+# src/core/speech_segmenter.py
+import numpy as np
+from typing import List, Tuple, Union
+from .audio_buffer import AudioBuffer
+
+
+class SpeechSegmenter:
+    """Energy-based voice activity detection and transcription chunk planning
+
+    Loudness is measured on short non-overlapping frames; frames louder than
+    the recording's noise floor (its 10th loudness percentile) by
+    threshold_db count as speech. Pauses shorter than min_silence are
+    bridged and isolated blips shorter than min_speech dropped. The speech
+    regions are then packed into chunks of at most max_chunk_length seconds
+    that start and end in silence, so nothing is cut mid-word and silent
+    stretches are never sent to a recognizer. Only a region that is itself
+    longer than max_chunk_length is split, into pieces overlapping by
+    chunk_overlap seconds.
+    """
+
+    def __init__(self, frame_length: float = 0.02, threshold_db: float = 10.0,
+                 silence_db: float = -50.0, max_threshold_db: float = -30.0,
+                 min_silence: float = 0.3, min_speech: float = 0.1, padding: float = 0.2,
+                 max_chunk_length: float = 30.0, chunk_overlap: float = 1.0,
+                 block_seconds: float = 60.0):
+        if chunk_overlap >= max_chunk_length:
+            raise ValueError("chunk_overlap must be shorter than max_chunk_length")
+        self.frame_length = frame_length
+        self.threshold_db = threshold_db
+        self.silence_db = silence_db
+        self.max_threshold_db = max_threshold_db
+        self.min_silence = min_silence
+        self.min_speech = min_speech
+        self.padding = padding
+        self.max_chunk_length = max_chunk_length
+        self.chunk_overlap = chunk_overlap
+        self.block_seconds = block_seconds
+
+    def frame_loudness(self, audio: Union[AudioBuffer, np.ndarray], sample_rate: int) -> np.ndarray:
+        """Loudness in dBFS of each frame, read block by block"""
+        frame = max(1, int(round(self.frame_length * sample_rate)))
+        total = len(audio)
+        num_frames = total // frame
+        loudness = np.empty(num_frames, dtype=np.float32)
+        frames_per_block = max(1, int(self.block_seconds * sample_rate) // frame)
+
+        for first in range(0, num_frames, frames_per_block):
+            last = min(first + frames_per_block, num_frames)
+            block = read_float(audio, first * frame, last * frame).reshape(last - first, frame)
+            loudness[first:last] = 10 * np.log10(np.mean(np.square(block), axis=1) + 1e-10)
+        return loudness
+
+    def speech_regions(self, audio: Union[AudioBuffer, np.ndarray], sample_rate: int) -> np.ndarray:
+        """(n, 2) array of speech start and end times in seconds"""
+        loudness = self.frame_loudness(audio, sample_rate)
+        if not len(loudness):
+            return np.zeros((0, 2), dtype=np.float64)
+        hop = max(1, int(round(self.frame_length * sample_rate))) / sample_rate
+
+        floor = np.percentile(loudness, 10)
+        threshold = np.clip(floor + self.threshold_db, self.silence_db, self.max_threshold_db)
+        edges = np.diff(np.concatenate([[0], (loudness > threshold).astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        if not len(starts):
+            return np.zeros((0, 2), dtype=np.float64)
+
+        keep = (starts[1:] - ends[:-1]) * hop >= self.min_silence
+        starts = starts[np.concatenate([[True], keep])]
+        ends = ends[np.concatenate([keep, [True]])]
+        long_enough = (ends - starts) * hop >= self.min_speech
+        return np.stack([starts[long_enough], ends[long_enough]], axis=1) * hop
+
+    def plan_chunks(self, regions: np.ndarray, duration: float) -> List[Tuple[float, float]]:
+        """Pack speech regions into chunks for transcription
+
+        Returns:
+            List[Tuple[float, float]]: (start, end) in seconds, in time order.
+                Consecutive chunks only overlap where a long region was split.
+        """
+        chunks = []
+        current = None
+        for start, end in regions:
+            start = max(0.0, start - self.padding)
+            end = min(duration, end + self.padding)
+            if current is not None and end - current[0] <= self.max_chunk_length:
+                current[1] = max(current[1], end)
+                continue
+            if current is not None:
+                chunks.append(tuple(current))
+                start = max(start, current[1])
+            if end - start <= self.max_chunk_length:
+                current = [start, end]
+                continue
+            # One region longer than a chunk: overlapping fixed-length pieces
+            step = self.max_chunk_length - self.chunk_overlap
+            pieces = int(np.ceil((end - start - self.chunk_overlap) / step))
+            for index in range(pieces - 1):
+                chunks.append((start + index * step, start + index * step + self.max_chunk_length))
+            current = [start + (pieces - 1) * step, end]
+        if current is not None:
+            chunks.append(tuple(current))
+        return [(float(start), float(end)) for start, end in chunks]
+
+    def chunks(self, audio: Union[AudioBuffer, np.ndarray], sample_rate: int) -> List[Tuple[float, float]]:
+        """Speech chunks of a whole recording; empty for pure silence"""
+        return self.plan_chunks(self.speech_regions(audio, sample_rate), len(audio) / sample_rate)
+
+
+def read_float(audio: Union[AudioBuffer, np.ndarray], start: int, end: int) -> np.ndarray:
+    """Samples [start, end) as float32 in [-1, 1]"""
+    if isinstance(audio, AudioBuffer):
+        return audio.to_float(start, end)
+    samples = np.asarray(audio[start:end])
+    if samples.dtype.kind == 'i':
+        return samples.astype(np.float32) / np.iinfo(samples.dtype).max
+    return samples.astype(np.float32, copy=False)
@@ -0,0 +1,213 @@
+# src/core/timeline.py
+import math
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+from .audio_features import frame_salience
+
+MODALITIES = ('audio', 'text', 'visual')
+
+
+class SegmentTimeline:
+    """Per-modality scores and confidences on one fixed segment grid
+
+    The video is cut into segments of segment_length seconds (the last one
+    may be shorter). Each modality contributes two contiguous float32
+    columns, a score in [0, 1] and a confidence in [0, 1] saying how much
+    that score can be trusted for the segment, e.g. 0 where there was no
+    speech or no keyframe. Audio feature frames, transcript segments and
+    keyframes are resampled onto the grid with array operations only.
+    """
+
+    def __init__(self, duration: float, segment_length: float = 1.0,
+                 scores: Dict[str, np.ndarray] = None, confidence: Dict[str, np.ndarray] = None):
+        self.duration = float(duration)
+        self.segment_length = float(segment_length)
+        self.scores = {}
+        self.confidence = {}
+        for modality, values in (scores or {}).items():
+            weight = None if confidence is None else confidence.get(modality)
+            self.set(modality, values, weight)
+
+    def __len__(self) -> int:
+        return max(0, math.ceil(self.duration / self.segment_length - 1e-9))
+
+    @property
+    def starts(self) -> np.ndarray:
+        return np.arange(len(self), dtype=np.float64) * self.segment_length
+
+    @property
+    def ends(self) -> np.ndarray:
+        return np.minimum(self.starts + self.segment_length, self.duration)
+
+    @property
+    def boundaries(self) -> np.ndarray:
+        """len + 1 segment edges in seconds"""
+        return np.append(self.starts, self.duration)
+
+    def set(self, modality: str, scores: np.ndarray, confidence: np.ndarray = None):
+        scores = np.ascontiguousarray(scores, dtype=np.float32)
+        if scores.shape != (len(self),):
+            raise ValueError(f"{modality} scores have shape {scores.shape}, timeline has {len(self)} segments")
+        if confidence is None:
+            confidence = np.ones(len(self), dtype=np.float32)
+        self.scores[modality] = scores
+        self.confidence[modality] = np.ascontiguousarray(confidence, dtype=np.float32)
+
+    @classmethod
+    def from_analysis(cls, audio_analysis: Dict = None, transcript: Dict = None,
+                      keyframes: Sequence[Dict] = None, duration: float = None,
+                      segment_length: float = 1.0) -> 'SegmentTimeline':
+        """Align the pipeline's audio analysis, transcript and keyframes
+
+        Args:
+            audio_analysis (Dict): AudioAnalyzer.analyze_audio_comprehensive
+                output, or its 'features' on their own
+            transcript (Dict): TranscriptionService.transcribe output
+            keyframes (Sequence[Dict]): KeyframeExtractor.select_keyframes output
+            duration (float): Video length in seconds (default: the latest
+                time any modality covers)
+            segment_length (float): Grid step in seconds
+
+        Missing modalities are left out of the timeline.
+        """
+        features = None
+        if audio_analysis:
+            features = audio_analysis.get('features', audio_analysis)
+        segments = (transcript or {}).get('segments') or []
+        keyframes = keyframes or []
+
+        if duration is None:
+            ends = [0.0]
+            if features is not None and len(features['times']):
+                ends.append(float(features['times'][-1]) + features['hop_length'] / features['sample_rate'] / 2)
+            if segments:
+                ends.append(max(float(segment['end']) for segment in segments))
+            if keyframes:
+                ends.append(max(float(keyframe['timestamp']) for keyframe in keyframes) + segment_length)
+            duration = max(ends)
+
+        timeline = cls(duration, segment_length)
+        if not len(timeline):
+            return timeline
+        if features is not None:
+            timeline.set('audio', *audio_columns(features, timeline))
+        if transcript is not None:
+            timeline.set('text', *text_columns(segments, timeline))
+        if keyframes:
+            timeline.set('visual', *visual_columns(keyframes, timeline))
+        return timeline
+
+    def to_dict(self) -> Dict:
+        """Plain dict of scalars and arrays, storable with save_structured/StageCache"""
+        return {'duration': self.duration, 'segment_length': self.segment_length,
+                'scores': dict(self.scores), 'confidence': dict(self.confidence)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SegmentTimeline':
+        return cls(data['duration'], data['segment_length'], data['scores'], data['confidence'])
+
+    @staticmethod
+    def concatenate(timelines: Sequence['SegmentTimeline'],
+                    modalities: Sequence[str] = MODALITIES) -> Tuple[Dict, Dict, np.ndarray]:
+        """Columns of many timelines laid end to end, for fusing them in one pass
+
+        A modality a timeline lacks is filled with zero scores and zero
+        confidence.
+
+        Returns:
+            Tuple: (scores, confidence, offsets), where scores and confidence
+                map each modality to one array over all segments and
+                offsets[i]:offsets[i + 1] are the segments of timelines[i]
+        """
+        lengths = [len(timeline) for timeline in timelines]
+        offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+        scores = {}
+        confidence = {}
+        for modality in modalities:
+            if not any(modality in timeline.scores for timeline in timelines):
+                continue
+            scores[modality] = np.zeros(offsets[-1], dtype=np.float32)
+            confidence[modality] = np.zeros(offsets[-1], dtype=np.float32)
+            for timeline, start, end in zip(timelines, offsets[:-1], offsets[1:]):
+                if modality in timeline.scores:
+                    scores[modality][start:end] = timeline.scores[modality]
+                    confidence[modality][start:end] = timeline.confidence[modality]
+        return scores, confidence, offsets
+
+
+def audio_columns(features: Dict, timeline: SegmentTimeline) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean frame salience per segment, squashed to (0, 1), and the share of non-silent frames"""
+    times = np.asarray(features['times'], dtype=np.float64)
+    if not len(times):
+        return np.zeros(len(timeline), np.float32), np.zeros(len(timeline), np.float32)
+    cells = np.minimum((times / timeline.segment_length).astype(np.int64), len(timeline) - 1)
+    counts = np.bincount(cells, minlength=len(timeline))
+    salience = np.bincount(cells, weights=frame_salience(features), minlength=len(timeline))
+    loudness = 20 * np.log10(np.asarray(features['rms'], dtype=np.float32) + 1e-6)
+    active = np.bincount(cells, weights=loudness > -50.0, minlength=len(timeline))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(counts > 0, salience / counts, 0.0)
+        confidence = np.where(counts > 0, active / counts, 0.0)
+    return 1.0 / (1.0 + np.exp(-mean)), confidence
+
+
+def text_columns(segments: Sequence[Dict], timeline: SegmentTimeline) -> Tuple[np.ndarray, np.ndarray]:
+    """Speech density per segment and the share of it covered by speech
+
+    Density counts non-space characters rather than words, so it also works
+    for Thai, and is scaled by the transcript's 95th percentile so one
+    unusually dense segment does not flatten the rest. Confidence is the
+    covered share, times each transcript segment's own 'confidence' where
+    the recognizer reported one.
+    """
+    if not segments:
+        return np.zeros(len(timeline), np.float32), np.zeros(len(timeline), np.float32)
+    starts = np.array([segment['start'] for segment in segments], dtype=np.float64)
+    ends = np.array([segment['end'] for segment in segments], dtype=np.float64)
+    characters = np.array([len(''.join(segment['text'].split())) for segment in segments], dtype=np.float64)
+    reliability = np.array([segment.get('confidence', 1.0) for segment in segments], dtype=np.float64)
+    order = np.argsort(starts, kind='stable')
+    starts, ends, characters, reliability = starts[order], ends[order], characters[order], reliability[order]
+    durations = np.maximum(ends - starts, 1e-6)
+
+    lengths = np.diff(timeline.boundaries)
+    covered = interval_coverage(starts, ends, timeline.boundaries)
+    density = interval_coverage(starts, ends, timeline.boundaries, characters / durations)
+    trusted = interval_coverage(starts, ends, timeline.boundaries, reliability)
+
+    scale = np.percentile(density[density > 0], 95) if (density > 0).any() else 1.0
+    return np.clip(density / scale, 0.0, 1.0), np.clip(trusted / lengths, 0.0, 1.0)
+
+
+def visual_columns(keyframes: Sequence[Dict], timeline: SegmentTimeline) -> Tuple[np.ndarray, np.ndarray]:
+    """Best keyframe importance per segment relative to the video's best; confidence 1 where a keyframe falls"""
+    timestamps = np.array([keyframe['timestamp'] for keyframe in keyframes], dtype=np.float64)
+    importance = np.array([keyframe.get('importance', 1.0) for keyframe in keyframes], dtype=np.float64)
+    cells = np.clip((timestamps / timeline.segment_length).astype(np.int64), 0, len(timeline) - 1)
+
+    scores = np.zeros(len(timeline), dtype=np.float64)
+    np.maximum.at(scores, cells, np.maximum(importance, 0.0))
+    peak = scores.max()
+    confidence = np.zeros(len(timeline), dtype=np.float32)
+    confidence[cells] = 1.0
+    return scores / peak if peak > 0 else scores, confidence
+
+
+def interval_coverage(starts: np.ndarray, ends: np.ndarray, boundaries: np.ndarray,
+                      rates: np.ndarray = None) -> np.ndarray:
+    """Integral of a piecewise-constant signal over each [boundaries[i], boundaries[i+1])
+
+    The signal is rates[j] on [starts[j], ends[j]) and 0 elsewhere (rate 1
+    when rates is None, i.e. plain covered seconds). Intervals must be
+    sorted by start and must not overlap. O((n + m) log n) through the
+    cumulative integral at every boundary, with no loop over intervals.
+    """
+    rates = np.ones(len(starts)) if rates is None else np.asarray(rates, dtype=np.float64)
+    durations = np.maximum(ends - starts, 0.0)
+    # Integral up to the start of each interval
+    before = np.concatenate([[0.0], np.cumsum(durations * rates)])
+    index = np.searchsorted(starts, boundaries, side='right') - 1
+    inside = np.clip(boundaries - starts[np.maximum(index, 0)], 0.0, durations[np.maximum(index, 0)])
+    cumulative = np.where(index >= 0, before[np.maximum(index, 0)] + rates[np.maximum(index, 0)] * inside, 0.0)
+    return np.diff(cumulative)
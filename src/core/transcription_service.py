@@ -1,16 +1,209 @@
-from typing import Dict
+import os
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Generator, List, Tuple, Union
+import numpy as np
+from .audio_buffer import AudioBuffer
+from .speech_segmenter import SpeechSegmenter, read_float
+from ..models.registry import get_registry
+from ..utils.config import get_config
+from ..utils.logger import count, span
+from ..utils.memory_manager import get_memory_controller
 
 
 class TranscriptionService:
-    def __init__(self):
-        self.whisper_model = whisper.load_model("base")
-        self.thai_model = load_thai_stt_model()
-        
+    """Chunked, parallel speech-to-text on a single timeline
+
+    The audio is split at silences into speech chunks (SpeechSegmenter),
+    silent stretches are skipped, and the chunks are transcribed on a
+    thread pool. Chunks only run in parallel when every recognizer (and the
+    language identifier, for 'auto') declares itself safe to call from
+    several threads with a true thread_safe attribute. The Whisper and Thai
+    recognizers are: each call leases a model instance of its own from the
+    registry, which loads extra instances while they fit the model budget.
+    Others run one chunk at a time while the next is read ahead. Segment
+    times are shifted onto the global timeline; where two chunks overlap,
+    each keeps the segments on its side of the middle of the overlap.
+
+    Args:
+        recognizers (Dict[str, Callable]): Recognizer per language code,
+            called as recognizer(samples, sample_rate, language) with float32
+            samples and returning segments with chunk-relative 'start', 'end'
+            and 'text' (default: Whisper for 'en', the Thai ASR model for 'th')
+        language_identifier (Callable): Called as
+            identifier(samples, sample_rate, candidates) to pick a chunk's
+            language when transcribing with language='auto'
+        segmenter (SpeechSegmenter): Chunk planner (default: from the
+            transcription settings)
+        max_workers (int): Chunks transcribed at once by thread-safe
+            recognizers (default: processing.max_parallel_workers)
+    """
+
+    def __init__(self, recognizers: Dict[str, Callable] = None, language_identifier: Callable = None,
+                 segmenter: SpeechSegmenter = None, max_workers: int = None):
+        config = get_config()
+        if recognizers is None:
+            from ..models.stt_models import thai_recognizer, whisper_recognizer
+            recognizers = {'en': whisper_recognizer, 'th': thai_recognizer}
+        if language_identifier is None:
+            from ..models.stt_models import whisper_language_id
+            language_identifier = whisper_language_id
+
+        self.recognizers = recognizers
+        self.language_identifier = language_identifier
+        self.segmenter = segmenter or SpeechSegmenter(
+            min_silence=config.transcription.min_silence,
+            max_chunk_length=config.transcription.max_chunk_length,
+            chunk_overlap=config.transcription.chunk_overlap)
+        self.max_workers = max_workers or config.processing.max_parallel_workers
+
+    # Models come from the process-wide registry, so creating a service is
+    # cheap and an English-only job never loads the Thai model
+    @property
+    def whisper_model(self):
+        return get_registry().get('whisper')
+
+    @property
+    def thai_model(self):
+        return get_registry().get('thai_stt')
+
+    def transcribe(self, audio: Union[str, AudioBuffer, np.ndarray], language: str = None) -> Dict:
+        """Transcribe a recording with timestamps
+
+        Args:
+            audio: A media path, the AudioBuffer from VideoProcessor.extract_audio,
+                or mono samples at the configured sample rate
+            language (str): A language code, 'auto' to identify it per chunk,
+                or None for the configured language ('auto' if several are
+                configured)
+
+        Returns:
+            Dict: 'language' (the one covering most speech), 'text',
+                'segments' with global 'start'/'end', 'text' and 'language',
+                and 'chunks' with the transcribed spans and their language
+        """
+        chunks = []
+        segments = []
+        for chunk, chunk_segments in self._iter_chunks(audio, language):
+            chunks.append(chunk)
+            segments.extend(chunk_segments)
+
+        count('segments', len(segments))
+        durations = Counter()
+        for chunk in chunks:
+            durations[chunk['language']] += chunk['end'] - chunk['start']
+        return self.post_process_transcript({
+            'language': durations.most_common(1)[0][0] if durations else None,
+            'text': ' '.join(segment['text'] for segment in segments),
+            'segments': segments,
+            'chunks': chunks
+        })
+
+    def iter_segments(self, audio: Union[str, AudioBuffer, np.ndarray],
+                      language: str = None) -> Generator[Dict, None, None]:
+        """Yield stitched segments in time order as soon as their chunk is done"""
+        for _, segments in self._iter_chunks(audio, language):
+            yield from self.post_process_transcript({'text': '', 'segments': segments})['segments']
+
     def transcribe_english(self, audio_path: str) -> Dict:
         """Transcribe English audio with timestamps"""
-        
+        return self.transcribe(audio_path, language='en')
+
     def transcribe_thai(self, audio_path: str) -> Dict:
         """Transcribe Thai audio with timestamps"""
-        
+        return self.transcribe(audio_path, language='th')
+
     def post_process_transcript(self, transcript: Dict) -> Dict:
-        """Clean and format transcription"""
\ No newline at end of file
+        """Clean and format transcription"""
+        segments = []
+        for segment in transcript['segments']:
+            text = re.sub(r'\s+', ' ', segment['text']).strip()
+            if text:
+                segments.append(dict(segment, text=text))
+        return dict(transcript, text=re.sub(r'\s+', ' ', transcript['text']).strip(), segments=segments)
+
+    def _iter_chunks(self, audio, language: str) -> Generator[Tuple[Dict, List[Dict]], None, None]:
+        """Transcribe chunks in parallel, yielding each with its stitched segments in order"""
+        audio, sample_rate = self._load_audio(audio)
+        language = language or self._default_language()
+        spans = self.segmenter.chunks(audio, sample_rate)
+        if not spans:
+            return
+
+        last = None
+        with ThreadPoolExecutor(max_workers=self._workers(language)) as executor:
+            futures = [executor.submit(self._recognize_chunk, audio, sample_rate, start, end, language)
+                       for start, end in spans]
+            for index, ((start, end), future) in enumerate(zip(spans, futures)):
+                chunk_language, segments = future.result()
+
+                # Overlapping neighbours split their shared span at its middle
+                previous_end = spans[index - 1][1] if index > 0 else -np.inf
+                next_start = spans[index + 1][0] if index + 1 < len(spans) else np.inf
+                cut_before = (start + previous_end) / 2 if previous_end > start else -np.inf
+                cut_after = (end + next_start) / 2 if next_start < end else np.inf
+
+                kept = []
+                for segment in segments:
+                    segment = dict(segment, start=start + segment['start'], end=start + segment['end'],
+                                   language=chunk_language)
+                    if not cut_before <= (segment['start'] + segment['end']) / 2 < cut_after:
+                        continue
+                    # The same words recognized on both sides of a cut
+                    if (last is not None and segment['text'].strip() == last['text'].strip()
+                            and segment['start'] < last['end']):
+                        continue
+                    kept.append(segment)
+                    last = segment
+
+                yield {'start': start, 'end': end, 'language': chunk_language}, kept
+
+    def _recognize_chunk(self, audio, sample_rate: int, start: float, end: float,
+                         language: str) -> Tuple[str, List[Dict]]:
+        # Chunks are read as workers pick them up; hold off while memory is at the limit
+        get_memory_controller().wait_for_headroom()
+        with span('transcribe.chunk', 'transcription', start=start, end=end) as args:
+            samples = read_float(audio, int(start * sample_rate), int(end * sample_rate))
+            if language == 'auto':
+                language = self.language_identifier(samples, sample_rate, tuple(self._candidate_languages()))
+            if args is not None:
+                args['language'] = language
+            return language, self.recognizers[language](samples, sample_rate, language)
+
+    def _workers(self, language: str) -> int:
+        """Chunks to transcribe at once: max_workers only if every model involved is thread-safe"""
+        if language == 'auto':
+            callables = [self.recognizers[name] for name in self._candidate_languages()]
+            callables.append(self.language_identifier)
+        else:
+            callables = [self.recognizers[language]]
+        return self.max_workers if all(getattr(func, 'thread_safe', False) for func in callables) else 1
+
+    def _candidate_languages(self) -> List[str]:
+        return [language for language in get_config().transcription.languages
+                if language in self.recognizers] or list(self.recognizers)
+
+    def _default_language(self) -> str:
+        candidates = self._candidate_languages()
+        return candidates[0] if len(candidates) == 1 else 'auto'
+
+    @staticmethod
+    def _load_audio(audio) -> Tuple[Union[AudioBuffer, np.ndarray], int]:
+        """Audio samples and their sample rate, decoding a path if needed"""
+        config = get_config()
+        if isinstance(audio, AudioBuffer):
+            return audio, audio.sample_rate
+        if isinstance(audio, np.ndarray):
+            return audio, config.audio.sample_rate
+
+        if os.path.splitext(audio)[1].lower() in config.video.supported_formats:
+            # Shares the cached, memory-mapped track with the other stages
+            from .video_processor import VideoProcessor
+            processor = VideoProcessor(audio)
+            processor.extract_audio()
+            return processor.audio_buffer, processor.audio_buffer.sample_rate
+
+        import librosa
+        samples, sample_rate = librosa.load(audio, sr=config.audio.sample_rate, mono=True)
+        return samples, sample_rate
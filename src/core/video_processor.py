@@ -1,123 +1,436 @@
-from typing import Dict, List
+from typing import Dict, Generator, Iterator, List
 import numpy as np
+from ..utils.cache import StageCache
+from ..utils.file_handler import MediaCatalog
+from ..utils.logger import count, get_logger, get_tracer
+
+logger = get_logger(__name__)
 
 class VideoProcessor:
-    def __init__(self, video_path: str):
+    # Bytes copied per read from ffmpeg's stdout into the PCM file
+    AUDIO_COPY_CHUNK = 1 << 20
+    
+    def __init__(self, video_path: str, cache: StageCache = None, catalog: MediaCatalog = None):
         self.video_path = video_path
         self.metadata = {}
+        self.audio_buffer = None
+        self.cache = cache if cache is not None else StageCache.default()
+        self.catalog = catalog if catalog is not None else MediaCatalog.default()
+        self._content_digest = None
+        
+    @property
+    def content_digest(self) -> str:
+        """Hash of the video file's content, used to key cached stage results"""
+        if self._content_digest is None:
+            self._content_digest = self.cache.file_digest(self.video_path)
+        return self._content_digest
         
-    def extract_audio(self) -> np.ndarray:
+    def extract_audio(self, sample_rate: int = None) -> np.ndarray:
         """Extract audio using FFmpeg
     
+        The audio is decoded once and streamed straight into a PCM .npy entry
+        of the stage cache, which is then memory-mapped; later calls for the
+        same content and sample rate skip ffmpeg entirely. The result is also
+        kept as self.audio_buffer so analyzers can share it without decoding
+        the file again.
+    
+        Args:
+            sample_rate (int): Output sample rate (default: audio.sample_rate);
+                preview tiers resample lower to cut analysis time
+    
         Returns:
-            np.ndarray: The extracted audio data as a numpy array
+            np.ndarray: The extracted mono int16 audio, memory-mapped from disk
         """
-        # Load settings from yaml file
-        import yaml
+        import os
+        from ..utils.config import get_config
+        from .audio_buffer import AudioBuffer
 
-        with open('config/settings.yaml', 'r') as f:
-            settings = yaml.safe_load(f)
+        config = get_config()
 
         # Get supported video formats and allowed extensions
-        supported_formats = settings['video']['supported_formats']
+        supported_formats = config.video.supported_formats
         # Check if the given video_path has a format that is supported, else throw an exception or return error message.
         file_extension = '.' + self.video_path.split('.')[-1].lower()
         if file_extension not in supported_formats:
             raise ValueError(f"Unsupported video format: {file_extension}. Supported formats are {supported_formats}")
 
         # Get audio extraction parameters
-        sample_rate = settings['audio']['sample_rate']
-        extraction_format = settings['audio']['extraction_format']
+        sample_rate = sample_rate or config.audio.sample_rate
 
-        # Use FFmpeg to extract audio with the specified sample rate and output format.
-        import subprocess
+        key = self.cache.make_key(self.content_digest, 'audio', {'sample_rate': sample_rate, 'channels': 1})
+        samples = self.cache.get(key)
+        if samples is not None:
+            self._set_audio_buffer(AudioBuffer(samples.filename, sample_rate, self.content_digest))
+            return self.audio_data
 
+        # Raw little-endian PCM, appended to the cache entry as it arrives;
+        # '?' keeps ffmpeg from failing on a missing stream where it can
         command = [
             'ffmpeg',
+            '-v', 'error',
             '-i', self.video_path,
+            '-map', '0:a:0?',
+            '-vn',
+            '-ac', '1',
             '-ar', str(sample_rate),
             '-acodec', 'pcm_s16le',
-            '-f', extraction_format.lower(),
+            '-f', 's16le',
             'pipe:'
         ]
 
         try:
-            # Run the FFmpeg command and capture output
-            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            self.audio_data = np.frombuffer(result.stdout, dtype=np.int16)
-            self.sample_rate = sample_rate
+            with self.cache.array_writer(key, np.int16) as writer:
+                # Files probed without an audio stream get an empty buffer
+                if getattr(self, 'has_audio', True):
+                    self._decode_audio(command, writer)
+            
+            if get_tracer().enabled:
+                count('bytes_read', os.path.getsize(self.video_path))
+                count('bytes_decoded', os.path.getsize(writer.path))
+            self._set_audio_buffer(AudioBuffer(writer.path, sample_rate, self.content_digest))
             return self.audio_data
         
         except Exception as e:
-            print(f"Error extracting audio: {e}")
+            logger.error(f"Error extracting audio: {e}")
             raise RuntimeError(f"Audio extraction failed: {str(e)}")
+    
+    def _decode_audio(self, command: List[str], writer):
+        """Copy ffmpeg's PCM output into writer
+        
+        stderr is drained on a thread so a chatty ffmpeg cannot fill its
+        pipe and stall while stdout is being read. When ffmpeg fails
+        without producing any audio, the file is probed: one without an
+        audio stream leaves writer empty instead of failing.
+        """
+        import subprocess
+        import threading
+        
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stderr = []
+        reader = threading.Thread(target=lambda: stderr.append(process.stderr.read()), daemon=True)
+        reader.start()
+        try:
+            for chunk in iter(lambda: process.stdout.read(self.AUDIO_COPY_CHUNK), b''):
+                writer.write(chunk)
+        finally:
+            process.stdout.close()
+            process.wait()
+            reader.join()
         
+        if process.returncode != 0 and (writer.bytes_written or self._has_audio_stream()):
+            raise RuntimeError(b''.join(stderr).decode(errors='replace').strip())
+    
+    def _has_audio_stream(self) -> bool:
+        """Whether the probed file has audio; assumed so when it cannot be probed"""
+        if not hasattr(self, 'has_audio'):
+            try:
+                self.get_video_info()
+            except RuntimeError:
+                return True
+        return self.has_audio
+    
+    def _set_audio_buffer(self, audio_buffer):
+        self.audio_buffer = audio_buffer
+        self.audio_data = audio_buffer.samples
+        self.sample_rate = audio_buffer.sample_rate
+    
+    def iter_audio_windows(self, window: float = None, overlap: float = None) -> Generator:
+        """Iterate over overlapping windows of the extracted audio
+    
+        Audio is extracted on first use. Windows are views into the shared
+        memory-mapped buffer, so no samples are copied.
+    
+        Args:
+            window (float): Window length in seconds (default: optimization.chunk_size)
+            overlap (float): Overlap in seconds (default: optimization.chunk_overlap)
+            
+        Yields:
+            Tuple[float, np.ndarray]: (start time in seconds, int16 samples)
+        """
+        from ..utils.config import get_config
+        
+        optimization = get_config().optimization
+        if window is None:
+            window = optimization.chunk_size
+        if overlap is None:
+            overlap = optimization.chunk_overlap
+        
+        if self.audio_buffer is None:
+            self.extract_audio()
+        yield from self.audio_buffer.iter_windows(window, overlap)
+    
     def extract_frames(self, interval: float = 1.0) -> List[np.ndarray]:
         """Extract frames at specified intervals
     
+        Thin wrapper around iter_frames() kept for callers that need the
+        full list. Prefer iter_frames() for long videos. Frames are stored in
+        the stage cache while they are decoded, and a cache hit returns views
+        into a memory-mapped array instead of decoding again. Frame sets
+        larger than the cache's max_entry_size are not cached.
+    
         Args:
             interval (float): Time interval between frames in seconds (default: 1.0)
             
         Returns:
             List[np.ndarray]: List of extracted frames as numpy arrays
         """
-        import cv2
+        key = self.cache.make_key(self.content_digest, 'frames', {'interval': interval})
+        cached = self.cache.get(key)
+        if cached is not None:
+            return list(cached)
+        
+        frames = []
+        writer = None
+        cache_frames = self.cache.enabled
+        try:
+            for _, frame in self.iter_frames(interval):
+                if writer is None and cache_frames:
+                    writer = self.cache.array_writer(key, frame.dtype, frame.shape)
+                if writer is not None and writer.bytes_written + frame.nbytes > self.cache.max_entry_size:
+                    # Too large to cache without evicting most other entries
+                    writer.abort()
+                    writer = None
+                    cache_frames = False
+                if writer is not None:
+                    writer.write(frame)
+                frames.append(frame)
+        except Exception:
+            if writer is not None:
+                writer.abort()
+            raise
+        
+        if writer is not None:
+            writer.commit()
+        
+        logger.info(f"Extracted {len(frames)} frames at {interval} second intervals")
+        return frames
+    
+    def iter_frames(self, interval: float = 1.0, batch_size: int = None,
+                    backend: str = 'opencv', width: int = None, intra_only: bool = False) -> Generator:
+        """Stream frames at specified intervals in decode order
+    
+        Frames are decoded sequentially instead of seeking before every read,
+        so each GOP is decoded once. Only the sampled frames are converted to
+        RGB, and at most one batch is held in memory at a time.
+    
+        Args:
+            interval (float): Time interval between frames in seconds (default: 1.0)
+            batch_size (int): If set, yield batches of up to this many frames
+                stacked into one array instead of single frames; under
+                memory pressure decoding pauses between batches and later
+                batches get smaller (see MemoryPressureController)
+            backend (str): 'opencv' to decode with cv2.VideoCapture, or 'ffmpeg'
+                to pipe rawvideo out of ffmpeg's fps filter
+            width (int): Scale frames down to this width, keeping the aspect
+                ratio (ffmpeg backend only, which is then used regardless)
+            intra_only (bool): Decode key frames (I-frames) only and keep
+                those at least interval seconds apart, skipping the decode of
+                every other frame; timestamps then follow the key frames
+                (ffmpeg backend only, which is then used regardless)
+            
+        Yields:
+            Tuple[float, np.ndarray]: (timestamp, RGB frame) when batch_size is None
+            Tuple[np.ndarray, np.ndarray]: (timestamps, frames of shape (n, h, w, 3))
+                when batch_size is set
+        """
         import os
         
+        if interval <= 0:
+            raise ValueError(f"Frame interval must be positive, got {interval}")
+        
         # Check if the file exists
         if not os.path.isfile(self.video_path):
             raise FileNotFoundError(f"Video file not found: {self.video_path}")
         
+        if width or intra_only:
+            backend = 'ffmpeg'
+        if backend == 'opencv':
+            frames = self._iter_frames_opencv(interval)
+        elif backend == 'ffmpeg':
+            frames = self._iter_frames_ffmpeg(interval, width, intra_only)
+        else:
+            raise ValueError(f"Unsupported frame backend: {backend}. Use 'opencv' or 'ffmpeg'")
+        if get_tracer().enabled:
+            count('bytes_read', os.path.getsize(self.video_path))
+            frames = self._count_frames(frames)
+        
+        if batch_size:
+            from ..utils.memory_manager import get_memory_controller
+            yield from self._batch_frames(frames, batch_size, get_memory_controller())
+        else:
+            yield from frames
+    
+    def _iter_frames_opencv(self, interval: float) -> Generator:
+        """Decode sequentially with OpenCV, retrieving only sampled frames"""
+        import cv2
+        
         # Open the video file
         cap = cv2.VideoCapture(self.video_path)
         if not cap.isOpened():
             raise RuntimeError(f"Could not open video file: {self.video_path}")
         
         # Get video properties
-        if not hasattr(self, 'fps') or not hasattr(self, 'duration'):
-            info = self.get_video_info()
-            fps = info['fps']
-            duration = info['duration']
+        if not hasattr(self, 'fps'):
+            self.get_video_info()
+        fps = self.fps or cap.get(cv2.CAP_PROP_FPS)
+        if not fps:
+            cap.release()
+            raise RuntimeError(f"Could not determine frame rate of: {self.video_path}")
+        
+        frame_index = 0
+        next_index = 0
+        samples = 0
+        
+        try:
+            # grab() advances the decoder without the copy and color conversion
+            # that retrieve() does, so skipped frames stay cheap
+            while cap.grab():
+                if frame_index == next_index:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    
+                    # Convert to RGB (OpenCV uses BGR)
+                    yield frame_index / fps, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    
+                    samples += 1
+                    next_index = max(frame_index + 1, int(round(samples * interval * fps)))
+                
+                frame_index += 1
+                
+        except Exception as e:
+            logger.error(f"Error extracting frames: {e}")
+            raise
+        finally:
+            # Release the video capture object
+            cap.release()
+    
+    def _iter_frames_ffmpeg(self, interval: float, width: int = None, intra_only: bool = False) -> Generator:
+        """Pipe RGB frames sampled by ffmpeg's fps filter, or its key frames only
+        
+        With intra_only the decoder skips every non-key frame (-skip_frame
+        nokey) and a select filter thins the key frames to one per interval;
+        their timestamps are read from showinfo's log on stderr.
+        """
+        import re
+        import subprocess
+        import threading
+        from queue import Queue
+        
+        if not hasattr(self, 'resolution'):
+            self.get_video_info()
+        width, height = self._output_size(width)
+        frame_size = width * height * 3
+        
+        filters = []
+        if intra_only:
+            filters.append(f"select='isnan(prev_selected_t)+gte(t-prev_selected_t,{interval})'")
         else:
-            fps = self.fps
-            duration = self.duration
+            filters.append(f'fps={1.0 / interval}')
+        if (width, height) != tuple(self.resolution):
+            filters.append(f'scale={width}:{height}')
         
-        # Calculate frame interval in terms of frame count
-        frame_interval = int(fps * interval)
+        if intra_only:
+            filters.append('showinfo')
+            # showinfo logs at info level; passthrough keeps one output frame per key frame
+            command = ['ffmpeg', '-hide_banner', '-nostats', '-v', 'info', '-skip_frame', 'nokey',
+                       '-i', self.video_path, '-map', '0:v:0', '-vf', ','.join(filters),
+                       '-fps_mode', 'passthrough']
+        else:
+            command = ['ffmpeg', '-v', 'error', '-i', self.video_path, '-vf', ','.join(filters)]
+        command += [
+            '-f', 'rawvideo',
+            '-pix_fmt', 'rgb24',
+            'pipe:'
+        ]
         
-        frames = []
-        frame_count = 0
+        process = subprocess.Popen(command, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE if intra_only else subprocess.DEVNULL,
+                                   bufsize=frame_size)
+        timestamps = Queue()
+        if intra_only:
+            pattern = re.compile(rb'Parsed_showinfo.*?pts_time:\s*(-?[\d.]+)')
+            
+            def read_timestamps():
+                for line in process.stderr:
+                    match = pattern.search(line)
+                    if match:
+                        timestamps.put(float(match.group(1)))
+                timestamps.put(None)
+            
+            # Drained on a thread so a full stderr pipe never stalls ffmpeg
+            threading.Thread(target=read_timestamps, daemon=True).start()
+        index = 0
         
         try:
             while True:
-                # Set frame position
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count)
-                
-                # Read the frame
-                ret, frame = cap.read()
-                if not ret:
+                buffer = process.stdout.read(frame_size)
+                if len(buffer) < frame_size:
                     break
                 
-                # Convert to RGB (OpenCV uses BGR)
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frames.append(frame_rgb)
+                # showinfo logs a frame before it reaches the output pipe
+                timestamp = timestamps.get() if intra_only else index * interval
+                if timestamp is None:
+                    raise RuntimeError(f"No timestamp for key frame {index} of: {self.video_path}")
+                yield timestamp, np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
+                index += 1
                 
-                # Update frame count
-                frame_count += frame_interval
-                
-                # Check if we've reached the end of the video
-                if frame_count >= fps * duration:
-                    break
-                    
         except Exception as e:
-            print(f"Error extracting frames: {e}")
+            logger.error(f"Error extracting frames: {e}")
             raise
         finally:
-            # Release the video capture object
-            cap.release()
+            process.stdout.close()
+            if process.poll() is None:
+                process.kill()
+            process.wait()
         
-        print(f"Extracted {len(frames)} frames at {interval} second intervals")
-        return frames
+        if process.returncode not in (0, None) and index == 0:
+            raise RuntimeError(f"FFmpeg frame extraction failed for: {self.video_path}")
+    
+    def _output_size(self, width: int = None):
+        """(width, height) for frames scaled down to width, both even, aspect kept"""
+        source_width, source_height = self.resolution
+        if not width or width >= source_width:
+            return source_width, source_height
+        height = max(2, int(round(source_height * width / source_width / 2)) * 2)
+        return width - width % 2, height
+    
+    @staticmethod
+    def _count_frames(frames: Iterator) -> Generator:
+        """Pass frames through, adding them to the trace counters"""
+        for timestamp, frame in frames:
+            count('frames')
+            count('bytes_decoded', frame.nbytes)
+            yield timestamp, frame
+    
+    @staticmethod
+    def _batch_frames(frames: Iterator, batch_size: int, controller=None) -> Generator:
+        """Group (timestamp, frame) pairs into stacked batches
+        
+        Batches hold batch_size frames. With a MemoryPressureController the
+        next batch waits for memory headroom and its size is adjusted
+        between 1 and batch_size.
+        """
+        max_size = batch_size
+        timestamps = []
+        batch = None
+        
+        for timestamp, frame in frames:
+            if batch is None:
+                if controller is not None:
+                    controller.wait_for_headroom()
+                    batch_size = controller.adjust(batch_size, 1, max_size)
+                batch = np.empty((batch_size,) + frame.shape, dtype=frame.dtype)
+            batch[len(timestamps)] = frame
+            timestamps.append(timestamp)
+            
+            if len(timestamps) == batch_size:
+                yield np.asarray(timestamps), batch
+                timestamps = []
+                batch = None
+        
+        if timestamps:
+            yield np.asarray(timestamps), batch[:len(timestamps)]
         
     def get_video_info(self) -> Dict:
         """Get video metadata (duration, fps, resolution, codec info)
@@ -132,99 +445,123 @@ class VideoProcessor:
                 - size (int): File size in bytes
                 - audio_codec (str): Audio codec if available
                 - audio_channels (int): Number of audio channels
-        """
-        import subprocess
-        import json
-        import os
         
+        Answered from the media catalog while the file's size and mtime are
+        unchanged; new and modified files are probed with ffprobe (see
+        probe_media).
+        """
         try:
-            # Prepare FFprobe command to extract video information in JSON format
-            command = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                self.video_path
-            ]
-            
-            # Run FFprobe and capture output
-            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            
-            if result.returncode != 0:
-                raise ValueError(f"FFprobe failed: {result.stderr}")
-                
-            # Parse the JSON output
-            probe_data = json.loads(result.stdout)
-            
-            # Initialize variables
-            video_stream = None
-            audio_stream = None
-            
-            # Find video and audio streams
-            for stream in probe_data.get('streams', []):
-                if stream.get('codec_type') == 'video' and not video_stream:
-                    video_stream = stream
-                elif stream.get('codec_type') == 'audio' and not audio_stream:
-                    audio_stream = stream
-            
-            # Extract video information
-            if not video_stream:
-                raise ValueError("No video stream found in the file")
-                
-            # Get format information
-            format_info = probe_data.get('format', {})
-            
-            # Extract key information
-            width = int(video_stream.get('width', 0))
-            height = int(video_stream.get('height', 0))
-            
-            # Calculate fps - handle different formats
-            fps_str = video_stream.get('r_frame_rate', '0/0')
-            if '/' in fps_str:
-                num, den = map(int, fps_str.split('/'))
-                fps = num / den if den else 0
-            else:
-                fps = float(fps_str)
-            
-            # Extract duration
-            duration = float(format_info.get('duration', video_stream.get('duration', 0)))
-            
-            # File size
-            size = int(format_info.get('size', os.path.getsize(self.video_path)))
-            
-            # Store as instance attributes
-            self.fps = fps
-            self.duration = duration
-            self.resolution = (width, height)
-            self.frame_count = int(fps * duration) if fps and duration else 0
-            self.video_codec = video_stream.get('codec_name')
-            
-            # Create info dictionary
-            video_info = {
-                'duration': duration,
-                'fps': fps,
-                'resolution': (width, height),
-                'frame_count': self.frame_count,
-                'codec': video_stream.get('codec_name'),
-                'bit_rate': int(format_info.get('bit_rate', 0)),
-                'size': size,
-                'path': self.video_path
-            }
-            
-            # Add audio information if available
-            if audio_stream:
-                self.audio_codec = audio_stream.get('codec_name')
-                self.audio_channels = int(audio_stream.get('channels', 0))
-                
-                video_info.update({
-                    'audio_codec': self.audio_codec,
-                    'audio_channels': self.audio_channels,
-                    'audio_sample_rate': int(audio_stream.get('sample_rate', 0))
-                })
-            
-            return video_info
+            # Entries of the media catalog stay valid while size and mtime do,
+            # so a cold probe never has to hash the whole file
+            video_info = self.catalog.get(self.video_path)
+            if video_info is None:
+                video_info = probe_media(self.video_path)
+                self.catalog.put(self.video_path, video_info)
+            return self._apply_video_info(video_info)
             
         except Exception as e:
-            print(f"Error getting video info: {e}")
+            logger.error(f"Error getting video info: {e}")
             raise RuntimeError(f"Failed to get video information: {str(e)}")
+    
+    def _apply_video_info(self, video_info: Dict) -> Dict:
+        """Store probed metadata as instance attributes"""
+        self.fps = video_info['fps']
+        self.duration = video_info['duration']
+        self.resolution = tuple(video_info['resolution'])
+        self.frame_count = video_info['frame_count']
+        self.video_codec = video_info['codec']
+        self.has_audio = 'audio_codec' in video_info
+        
+        if 'audio_codec' in video_info:
+            self.audio_codec = video_info['audio_codec']
+            self.audio_channels = video_info['audio_channels']
+        
+        return video_info
+
+
+def probe_media(path: str) -> Dict:
+    """Metadata of one media file from ffprobe, as returned by VideoProcessor.get_video_info
+
+    Raises:
+        ValueError: If ffprobe fails or the file has no video stream
+    """
+    import json
+    import os
+    import subprocess
+    
+    # Prepare FFprobe command to extract video information in JSON format
+    command = [
+        'ffprobe',
+        '-v', 'quiet',
+        '-print_format', 'json',
+        '-show_format',
+        '-show_streams',
+        path
+    ]
+    
+    # Run FFprobe and capture output
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    
+    if result.returncode != 0:
+        raise ValueError(f"FFprobe failed: {result.stderr}")
+        
+    # Parse the JSON output
+    probe_data = json.loads(result.stdout)
+    
+    # Initialize variables
+    video_stream = None
+    audio_stream = None
+    
+    # Find video and audio streams
+    for stream in probe_data.get('streams', []):
+        if stream.get('codec_type') == 'video' and not video_stream:
+            video_stream = stream
+        elif stream.get('codec_type') == 'audio' and not audio_stream:
+            audio_stream = stream
+    
+    # Extract video information
+    if not video_stream:
+        raise ValueError("No video stream found in the file")
+        
+    # Get format information
+    format_info = probe_data.get('format', {})
+    
+    # Extract key information
+    width = int(video_stream.get('width', 0))
+    height = int(video_stream.get('height', 0))
+    
+    # Calculate fps - handle different formats
+    fps_str = video_stream.get('r_frame_rate', '0/0')
+    if '/' in fps_str:
+        num, den = map(int, fps_str.split('/'))
+        fps = num / den if den else 0
+    else:
+        fps = float(fps_str)
+    
+    # Extract duration
+    duration = float(format_info.get('duration', video_stream.get('duration', 0)))
+    
+    # File size
+    size = int(format_info.get('size', os.path.getsize(path)))
+    
+    # Create info dictionary
+    video_info = {
+        'duration': duration,
+        'fps': fps,
+        'resolution': (width, height),
+        'frame_count': int(fps * duration) if fps and duration else 0,
+        'codec': video_stream.get('codec_name'),
+        'bit_rate': int(format_info.get('bit_rate', 0)),
+        'size': size,
+        'path': path
+    }
+    
+    # Add audio information if available
+    if audio_stream:
+        video_info.update({
+            'audio_codec': audio_stream.get('codec_name'),
+            'audio_channels': int(audio_stream.get('channels', 0)),
+            'audio_sample_rate': int(audio_stream.get('sample_rate', 0))
+        })
+    
+    return video_info
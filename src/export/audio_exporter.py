@@ -1,16 +1,144 @@
 # src/export/audio_exporter.py
 import os
-from typing import Dict
-from pydub import AudioSegment
+from typing import Dict, List, Sequence, Tuple, Union
+import numpy as np
+from ..core.audio_buffer import AudioBuffer
+
+# Output container and encoder arguments per format and quality
+ENCODERS = {
+    'wav': ('wav', {'high': ['-c:a', 'pcm_s16le'], 'medium': ['-c:a', 'pcm_s16le'], 'low': ['-c:a', 'pcm_s16le']}),
+    'mp3': ('mp3', {'high': ['-c:a', 'libmp3lame', '-q:a', '2'], 'medium': ['-c:a', 'libmp3lame', '-q:a', '4'],
+                    'low': ['-c:a', 'libmp3lame', '-q:a', '7']}),
+    'flac': ('flac', {'high': ['-c:a', 'flac', '-compression_level', '8'],
+                      'medium': ['-c:a', 'flac', '-compression_level', '5'],
+                      'low': ['-c:a', 'flac', '-compression_level', '0']}),
+    'ogg': ('ogg', {'high': ['-c:a', 'libvorbis', '-q:a', '6'], 'medium': ['-c:a', 'libvorbis', '-q:a', '4'],
+                    'low': ['-c:a', 'libvorbis', '-q:a', '1']}),
+}
+
 
 class AudioExporter:
+    """Full-track or highlight-reel audio export through a single ffmpeg pass
+
+    Each highlight becomes its own ffmpeg input opened with -ss/-t, so
+    ffmpeg seeks straight to it and only decodes the highlighted audio;
+    consecutive highlights are joined with acrossfade. The audio never
+    passes through Python, so memory use depends on neither the source
+    length nor the highlight length.
+    """
+
     def __init__(self):
-        self.supported_formats = ['wav', 'mp3', 'flac', 'ogg']
-    
-    def export(self, audio_data: Dict, output_dir: str, format_options: Dict = None) -> str:
-        """Export audio with specified format and quality"""
+        self.supported_formats = list(ENCODERS)
+
+    def export(self, audio_data: Union[Dict, str, AudioBuffer], output_dir: str, format_options: Dict = None) -> str:
+        """Export audio with specified format and quality
+
+        Args:
+            audio_data: The source (a media file path or an AudioBuffer), or a
+                dict with 'source' and optionally 'segments', a list of
+                (start, end) pairs or dicts with 'start' and 'end' in seconds.
+                Without segments the whole track is exported.
+            output_dir (str): Directory to write into
+            format_options (Dict):
+                format (str): wav, mp3, flac or ogg (default: wav)
+                quality (str): high, medium or low (default: high)
+                crossfade (float): Seconds of crossfade between highlights (default: 0.05)
+                sample_rate (int): Output sample rate (default: the source's)
+                filename (str): Output name without extension
+                    (default: highlights with segments, audio without)
+
+        Returns:
+            str: The written file
+        """
+        import subprocess
+
+        format_options = format_options or {}
         format_type = format_options.get('format', 'wav')
+        if format_type not in self.supported_formats:
+            raise ValueError(f"Unsupported audio format {format_type}; supported: {self.supported_formats}")
         quality = format_options.get('quality', 'high')
-        
-        # Implementation for audio export
-        pass
+        muxer, qualities = ENCODERS[format_type]
+        if quality not in qualities:
+            raise ValueError(f"Unsupported audio quality {quality}; use one of {list(qualities)}")
+
+        if isinstance(audio_data, dict):
+            source, segments = audio_data['source'], audio_data.get('segments')
+        else:
+            source, segments = audio_data, None
+        segments = merge_segments(segments) if segments is not None else None
+        if segments is not None and not segments:
+            raise ValueError("No highlight segments to export")
+
+        os.makedirs(output_dir, exist_ok=True)
+        default_name = 'audio' if segments is None else 'highlights'
+        path = os.path.join(output_dir, f"{format_options.get('filename', default_name)}.{format_type}")
+        tmp_path = f"{path}.part"
+
+        command = ['ffmpeg', '-v', 'error', '-y']
+        source_args = _source_args(source)
+        if segments is None:
+            command += [*source_args, '-vn']
+        else:
+            for start, end in segments:
+                command += ['-ss', f"{start:.3f}", '-t', f"{end - start:.3f}", *source_args]
+            command += ['-filter_complex', crossfade_graph([end - start for start, end in segments],
+                                                           float(format_options.get('crossfade', 0.05))),
+                        '-map', '[out]']
+        if format_options.get('sample_rate'):
+            command += ['-ar', str(format_options['sample_rate'])]
+        command += [*qualities[quality], '-f', muxer, tmp_path]
+
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise RuntimeError(f"Audio export failed: {result.stderr.decode(errors='replace').strip()}")
+        os.replace(tmp_path, path)
+        return path
+
+
+def merge_segments(segments: Sequence[Union[Tuple[float, float], Dict]]) -> List[Tuple[float, float]]:
+    """Sorted, non-overlapping (start, end) pairs with empty segments dropped"""
+    pairs = sorted((max(0.0, float(segment['start'])), float(segment['end'])) if isinstance(segment, dict)
+                   else (max(0.0, float(segment[0])), float(segment[1])) for segment in segments)
+    merged = []
+    for start, end in pairs:
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def crossfade_graph(durations: List[float], crossfade: float) -> str:
+    """filter_complex joining inputs 0..n-1 with acrossfade, output labelled [out]
+
+    Each crossfade is capped at half of the shorter of the two segments it
+    joins, so very short highlights are never swallowed by their fades.
+    """
+    if len(durations) == 1:
+        return '[0:a]anull[out]'
+    filters = []
+    previous = '[0:a]'
+    for index in range(1, len(durations)):
+        label = '[out]' if index == len(durations) - 1 else f"[x{index}]"
+        duration = min(crossfade, durations[index - 1] / 2, durations[index] / 2)
+        if duration > 0.001:
+            filters.append(f"{previous}[{index}:a]acrossfade=d={duration:.3f}:c1=tri:c2=tri{label}")
+        else:
+            filters.append(f"{previous}[{index}:a]concat=n=2:v=0:a=1{label}")
+        previous = label
+    return ';'.join(filters)
+
+
+def _source_args(source: Union[str, AudioBuffer]) -> List[str]:
+    """ffmpeg input arguments reading a media file or an AudioBuffer's PCM in place"""
+    if not isinstance(source, AudioBuffer):
+        return ['-i', source]
+    if source.dtype != np.int16:
+        raise ValueError(f"Only int16 audio buffers can be exported, not {source.dtype}")
+    # The .npy payload is raw PCM after its header, which ffmpeg is told to skip
+    return ['-f', 's16le', '-ar', str(source.sample_rate), '-ac', '1',
+            '-skip_initial_bytes', str(source.samples.offset), '-i', source.path]
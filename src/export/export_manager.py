@@ -1,37 +1,124 @@
 # src/export/export_manager.py
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
-from .audio_exporter import AudioExporter
-from .transcript_exporter import TranscriptExporter
-from .keyframe_exporter import KeyframeExporter
-from .summary_exporter import SummaryExporter
+from ..utils.logger import get_tracer
+
+# Exporter class per component, as (module, class name); each is imported
+# and constructed on first use so unused exporters cost nothing
+EXPORTERS = {
+    'audio': ('.audio_exporter', 'AudioExporter'),
+    'transcript': ('.transcript_exporter', 'TranscriptExporter'),
+    'keyframes': ('.keyframe_exporter', 'KeyframeExporter'),
+    'summary': ('.summary_exporter', 'SummaryExporter')
+}
 
 class ExportManager:
     def __init__(self):
-        self.exporters = {
-            'audio': AudioExporter(),
-            'transcript': TranscriptExporter(),
-            'keyframes': KeyframeExporter(),
-            'summary': SummaryExporter()
-        }
+        self.exporters = {}
+        self.timings = {}
     
-    def selective_export(self, components: List[str], format_options: Dict, output_dir: str) -> Dict[str, str]:
-        """Export selected components in specified formats"""
-        results = {}
-        
-        for component in components:
-            if component in self.exporters:
-                try:
-                    export_path = self.exporters[component].export(
-                        format_options.get(component, {}),
-                        output_dir
-                    )
-                    results[component] = export_path
-                except Exception as e:
-                    results[component] = f"Error: {str(e)}"
-                    
-        return results
+    def get_exporter(self, component: str):
+        """Exporter for a component, imported and created on first use"""
+        if component not in self.exporters:
+            module_name, class_name = EXPORTERS[component]
+            module = importlib.import_module(module_name, __package__)
+            self.exporters[component] = getattr(module, class_name)()
+        return self.exporters[component]
+    
+    def selective_export(self, components: List[str], format_options: Dict, output_dir: str,
+                         data: Dict[str, Any] = None, max_workers: int = None) -> Dict[str, str]:
+        """Export selected components in specified formats
+        
+        Components are exported concurrently on a thread pool: each one is
+        dominated by file I/O, encoding in native code or a child ffmpeg
+        process. A failing component is reported as "Error: ..." without
+        affecting the others. Timings of the run are kept in self.timings
+        for create_combined_report.
+        
+        Args:
+            components (List[str]): Components to export, e.g. ['transcript', 'summary']
+            format_options (Dict): Options per component, passed to its exporter
+            output_dir (str): Directory the files are written to
+            data (Dict[str, Any]): Content per component; a transcript may
+                carry its segments as an iterator, which is written while
+                it is being produced
+            max_workers (int): Components exported at once (default: all)
+        """
+        data = data or {}
+        selected = [component for component in dict.fromkeys(components) if component in EXPORTERS]
+        self.timings = {}
+        if not selected:
+            return {}
+        
+        def run(component: str):
+            started = time.perf_counter()
+            try:
+                result = self.get_exporter(component).export(
+                    data.get(component, {}),
+                    output_dir,
+                    format_options.get(component, {})
+                )
+            except Exception as e:
+                result = f"Error: {str(e)}"
+            ended = time.perf_counter()
+            self.timings[component] = {'start': started, 'end': ended, 'duration': ended - started}
+            get_tracer().record(f"export.{component}", started, ended, 'export',
+                                {'error': result} if str(result).startswith('Error:') else None)
+            return result
+        
+        with ThreadPoolExecutor(max_workers=max_workers or len(selected)) as executor:
+            futures = {component: executor.submit(run, component) for component in selected}
+        return {component: future.result() for component, future in futures.items()}
     
     def create_combined_report(self, export_results: Dict, metadata: Dict) -> str:
-        """Create a comprehensive report of all exports"""
-        # Implementation here
-        pass
+        """Create a comprehensive report of all exports
+        
+        Writes export_report.json to metadata['output_dir'] (default: the
+        directory of the first exported file) with each component's status,
+        files, total size in bytes and export time from the last
+        selective_export, plus the remaining metadata.
+        
+        Returns:
+            str: Path of the report
+        """
+        metadata = dict(metadata or {})
+        components = {}
+        for component, result in export_results.items():
+            entry = {'duration': self.timings.get(component, {}).get('duration')}
+            if isinstance(result, str) and result.startswith('Error: '):
+                entry.update(status='failed', error=result[len('Error: '):])
+            else:
+                paths = [result] if isinstance(result, str) else list(result or [])
+                entry.update(status='completed', files=paths, size=sum(_size_on_disk(path) for path in paths))
+            components[component] = entry
+        
+        output_dir = metadata.pop('output_dir', None)
+        if output_dir is None:
+            files = [path for entry in components.values() for path in entry.get('files', [])]
+            output_dir = os.path.dirname(files[0]) if files else '.'
+        
+        report = {
+            'components': components,
+            'total_size': sum(entry.get('size', 0) for entry in components.values()),
+            # Components overlap, so the wall time is less than the sum of durations
+            'wall_time': (max(timing['end'] for timing in self.timings.values()) -
+                          min(timing['start'] for timing in self.timings.values())) if self.timings else 0.0,
+            'metadata': metadata
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, 'export_report.json')
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        return path
+
+
+def _size_on_disk(path: str) -> int:
+    """Bytes in a file, or in all files under a directory"""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(directory, name))
+                   for directory, _, files in os.walk(path) for name in files)
+    return os.path.getsize(path) if os.path.exists(path) else 0
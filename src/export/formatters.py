@@ -0,0 +1,28 @@
+# src/export/formatters.py
+
+
+def format_timestamp(seconds: float, decimal_marker: str = '.', always_hours: bool = True) -> str:
+    """HH:MM:SS.mmm timestamp, as used by SRT (with ',') and WebVTT (with '.')"""
+    milliseconds = max(0, int(round(seconds * 1000)))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    prefix = f"{hours:02d}:" if always_hours or hours else ''
+    return f"{prefix}{minutes:02d}:{seconds:02d}{decimal_marker}{milliseconds:03d}"
+
+
+def format_srt_timestamp(seconds: float) -> str:
+    return format_timestamp(seconds, ',')
+
+
+def format_vtt_timestamp(seconds: float) -> str:
+    return format_timestamp(seconds, '.')
+
+
+def format_clock(seconds: float) -> str:
+    """[H:]MM:SS for human-readable listings"""
+    seconds = max(0, int(seconds))
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
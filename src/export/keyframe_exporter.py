@@ -0,0 +1,229 @@
+# src/export/keyframe_exporter.py
+import json
+import math
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple, Union
+import numpy as np
+from .formatters import format_clock
+
+# Fewer frames than this per worker are not worth a process start
+MIN_FRAMES_PER_WORKER = 8
+# Jobs per worker, so a slow batch does not leave the others idle
+JOBS_PER_WORKER = 4
+
+
+class KeyframeExporter:
+    """Keyframe images, thumbnails and a contact sheet, encoded in parallel
+
+    Frames are copied once into a file-backed buffer (in /dev/shm where
+    available) that worker processes map read-only, so only offsets and
+    paths are pickled. Each worker encodes the full-size image, resizes the
+    frame once to the thumbnail size, encodes that and writes it back into a
+    second mapped buffer, from which the contact sheet is tiled without any
+    further resizing. Every file is written under a temporary name and
+    renamed into place.
+    """
+
+    def __init__(self):
+        self.supported_formats = ['jpg', 'png']
+
+    def export(self, keyframes: Sequence[Union[Dict, np.ndarray]], output_dir: str,
+               format_options: Dict = None) -> str:
+        """Write keyframes/ with full/, thumbs/, contact_sheet and keyframes.json
+
+        Args:
+            keyframes: Dicts from KeyframeExtractor.select_keyframes (RGB
+                'frame' plus 'timestamp' and scores) or bare RGB frames
+            output_dir (str): Parent directory of the keyframes/ folder
+            format_options (Dict):
+                format (str): jpg or png (default: jpg)
+                quality (int): JPEG quality (default: 90)
+                png_compression (int): PNG compression level 0-9 (default: 3)
+                thumbnail_width (int): Thumbnail width in pixels (default: 320)
+                columns (int): Contact sheet columns (default: 5)
+                max_workers (int): Encoding processes (default: processing.max_parallel_workers)
+
+        Returns:
+            str: The keyframes/ directory
+        """
+        from ..utils.config import get_config
+
+        format_options = format_options or {}
+        format_type = format_options.get('format', 'jpg')
+        if format_type not in self.supported_formats:
+            raise ValueError(f"Unsupported keyframe format {format_type}; supported: {self.supported_formats}")
+
+        entries = [item if isinstance(item, dict) else {'frame': item} for item in keyframes]
+        directory = os.path.join(output_dir, 'keyframes')
+        for name in ('full', 'thumbs'):
+            os.makedirs(os.path.join(directory, name), exist_ok=True)
+        if not entries:
+            return directory
+
+        options = {
+            'format': format_type,
+            'quality': int(format_options.get('quality', 90)),
+            'png_compression': int(format_options.get('png_compression', 3))
+        }
+        thumbnail_width = int(format_options.get('thumbnail_width', 320))
+        max_workers = format_options.get('max_workers') or get_config().processing.max_parallel_workers
+
+        names = [f"keyframe_{number:04d}.{format_type}" for number in range(1, len(entries) + 1)]
+        paths = [(os.path.join(directory, 'full', name), os.path.join(directory, 'thumbs', name))
+                 for name in names]
+
+        scratch = tempfile.mkdtemp(prefix='keyframes-', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+        try:
+            frames_path = os.path.join(scratch, 'frames.bin')
+            thumbs_path = os.path.join(scratch, 'thumbs.bin')
+            frame_layout = _pack_frames([entry['frame'] for entry in entries], frames_path)
+            thumb_layout = _layout([_thumbnail_shape(shape, thumbnail_width) for _, shape in frame_layout])
+            np.memmap(thumbs_path, dtype=np.uint8, mode='w+', shape=(max(1, _layout_size(thumb_layout)),)).flush()
+
+            jobs, workers = _split(list(range(len(entries))), max_workers)
+            job_args = [(frames_path, frame_layout, thumbs_path, thumb_layout, indices,
+                         [paths[index] for index in indices], options) for indices in jobs]
+            if workers == 1:
+                _encode_frames(*job_args[0])
+            else:
+                # Exporters run on ExportManager's threads, so never fork here
+                method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=mp.get_context(method)) as executor:
+                    for future in [executor.submit(_encode_frames, *args) for args in job_args]:
+                        future.result()
+
+            thumbnails = np.memmap(thumbs_path, dtype=np.uint8, mode='r')
+            sheet = _contact_sheet([_view(thumbnails, offset, shape) for offset, shape in thumb_layout],
+                                   [entry.get('timestamp') for entry in entries],
+                                   int(format_options.get('columns', 5)))
+            del thumbnails
+            _write_image(os.path.join(directory, f"contact_sheet.{format_type}"), sheet, options)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        index = [{
+            'file': os.path.join('full', name),
+            'thumbnail': os.path.join('thumbs', name),
+            **{key: entry[key] for key in ('index', 'timestamp', 'scene', 'importance') if key in entry}
+        } for name, entry in zip(names, entries)]
+        _write_atomic(os.path.join(directory, 'keyframes.json'),
+                      json.dumps(index, indent=2, default=str).encode())
+        return directory
+
+
+def _layout(shapes: List[Tuple[int, ...]]) -> List[Tuple[int, Tuple[int, ...]]]:
+    """(byte offset, shape) of each array packed back to back"""
+    layout = []
+    offset = 0
+    for shape in shapes:
+        layout.append((offset, tuple(int(size) for size in shape)))
+        offset += int(np.prod(shape))
+    return layout
+
+
+def _layout_size(layout: List[Tuple[int, Tuple[int, ...]]]) -> int:
+    offset, shape = layout[-1]
+    return offset + int(np.prod(shape))
+
+
+def _pack_frames(frames: List[np.ndarray], path: str) -> List[Tuple[int, Tuple[int, ...]]]:
+    """Copy uint8 frames into one flat file-backed buffer and return its layout"""
+    layout = _layout([frame.shape for frame in frames])
+    buffer = np.memmap(path, dtype=np.uint8, mode='w+', shape=(_layout_size(layout),))
+    for frame, (offset, shape) in zip(frames, layout):
+        _view(buffer, offset, shape)[...] = frame
+    buffer.flush()
+    return layout
+
+
+def _view(buffer: np.ndarray, offset: int, shape: Tuple[int, ...]) -> np.ndarray:
+    return buffer[offset:offset + int(np.prod(shape))].reshape(shape)
+
+
+def _thumbnail_shape(shape: Tuple[int, ...], width: int) -> Tuple[int, int, int]:
+    height, frame_width = shape[:2]
+    width = min(width, frame_width)
+    return max(1, int(round(height * width / frame_width))), width, 3
+
+
+def _split(indices: List[int], max_workers: int) -> Tuple[List[List[int]], int]:
+    """Contiguous jobs and the workers planned for them
+
+    One job on one worker if parallelism would not pay off, else about
+    JOBS_PER_WORKER jobs per worker. Rounding the job size up can leave
+    fewer jobs than that, so the worker count is returned rather than
+    derived from the jobs.
+    """
+    workers = min(max_workers, len(indices) // MIN_FRAMES_PER_WORKER)
+    if workers <= 1:
+        return [indices], 1
+    size = math.ceil(len(indices) / (workers * JOBS_PER_WORKER))
+    return [indices[start:start + size] for start in range(0, len(indices), size)], workers
+
+
+def _encode_frames(frames_path: str, frame_layout: List, thumbs_path: str, thumb_layout: List,
+                   indices: List[int], paths: List[Tuple[str, str]], options: Dict):
+    """Worker: encode full-size images and thumbnails for some frames"""
+    import cv2
+
+    frames = np.memmap(frames_path, dtype=np.uint8, mode='r')
+    thumbnails = np.memmap(thumbs_path, dtype=np.uint8, mode='r+')
+    for index, (full_path, thumb_path) in zip(indices, paths):
+        bgr = cv2.cvtColor(_view(frames, *frame_layout[index]), cv2.COLOR_RGB2BGR)
+        _write_image(full_path, bgr, options, rgb=False)
+
+        # The only resize of this frame; the contact sheet reuses it
+        thumb_offset, thumb_shape = thumb_layout[index]
+        thumbnail = cv2.resize(bgr, (thumb_shape[1], thumb_shape[0]), interpolation=cv2.INTER_AREA)
+        _write_image(thumb_path, thumbnail, options, rgb=False)
+        _view(thumbnails, thumb_offset, thumb_shape)[...] = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2RGB)
+    thumbnails.flush()
+
+
+def _contact_sheet(thumbnails: List[np.ndarray], timestamps: List[float], columns: int) -> np.ndarray:
+    """Tile thumbnails into one RGB image, labelled with their timestamps"""
+    import cv2
+
+    columns = max(1, min(columns, len(thumbnails)))
+    rows = math.ceil(len(thumbnails) / columns)
+    cell_height = max(thumbnail.shape[0] for thumbnail in thumbnails)
+    cell_width = max(thumbnail.shape[1] for thumbnail in thumbnails)
+    gap = 4
+    sheet = np.zeros((rows * (cell_height + gap) + gap, columns * (cell_width + gap) + gap, 3), dtype=np.uint8)
+
+    for number, (thumbnail, timestamp) in enumerate(zip(thumbnails, timestamps)):
+        top = gap + (number // columns) * (cell_height + gap)
+        left = gap + (number % columns) * (cell_width + gap)
+        height, width = thumbnail.shape[:2]
+        sheet[top:top + height, left:left + width] = thumbnail
+        if timestamp is not None:
+            cv2.putText(sheet, format_clock(timestamp), (left + 6, top + height - 8),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+    return sheet
+
+
+def _write_image(path: str, image: np.ndarray, options: Dict, rgb: bool = True):
+    import cv2
+
+    if rgb:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    if options['format'] == 'jpg':
+        params = [cv2.IMWRITE_JPEG_QUALITY, options['quality']]
+    else:
+        params = [cv2.IMWRITE_PNG_COMPRESSION, options['png_compression']]
+    ok, encoded = cv2.imencode(f".{options['format']}", image, params)
+    if not ok:
+        raise RuntimeError(f"Could not encode {path}")
+    _write_atomic(path, encoded.tobytes())
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,57 @@
+# src/export/summary_exporter.py
+import json
+import os
+from typing import Dict
+
+
+class SummaryExporter:
+    def __init__(self):
+        self.supported_formats = ['json', 'txt']
+
+    def export(self, summary_data: Dict, output_dir: str, format_options: Dict = None) -> str:
+        """Export the fused summary as JSON or a plain-text outline
+
+        format_options:
+            format (str): json or txt (default: json)
+            filename (str): Output name without extension (default: summary)
+        """
+        format_options = format_options or {}
+        format_type = format_options.get('format', 'json')
+        if format_type not in self.supported_formats:
+            raise ValueError(f"Unsupported summary format {format_type}; supported: {self.supported_formats}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{format_options.get('filename', 'summary')}.{format_type}")
+        tmp_path = f"{path}.part"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if format_type == 'json':
+                json.dump(summary_data, f, indent=2, ensure_ascii=False, default=_jsonable)
+            else:
+                self._write_outline(summary_data, f)
+        os.replace(tmp_path, path)
+        return path
+
+    def _write_outline(self, value, f, indent: int = 0):
+        """Nested dicts and lists as an indented outline"""
+        pad = '  ' * indent
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, (dict, list)):
+                    f.write(f"{pad}{key}:\n")
+                    self._write_outline(item, f, indent + 1)
+                else:
+                    f.write(f"{pad}{key}: {item}\n")
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, (dict, list)):
+                    f.write(f"{pad}-\n")
+                    self._write_outline(item, f, indent + 1)
+                else:
+                    f.write(f"{pad}- {item}\n")
+        else:
+            f.write(f"{pad}{value}\n")
+
+
+def _jsonable(value):
+    """NumPy arrays and scalars as JSON lists and numbers, anything else as its str()"""
+    return value.tolist() if hasattr(value, 'tolist') else str(value)
@@ -1,23 +1,175 @@
 # src/export/transcript_exporter.py
 import json
-from typing import Dict, List
+import os
+from typing import Dict, Iterable, List, Union
+from .formatters import format_clock, format_srt_timestamp, format_vtt_timestamp
+
+# Bytes buffered per output file before a write reaches the OS
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+class TranscriptWriter:
+    """Incremental writer for one transcript format
+
+    Segments are written as they arrive, so only the current segment is in
+    memory. Output goes to a temporary file that replaces path on close(),
+    so readers never see a half-written transcript.
+    """
+
+    extension = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._tmp_path = f"{path}.part"
+        self._file = open(self._tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+        self.write_header()
+
+    def write_header(self):
+        pass
+
+    def write_footer(self):
+        pass
+
+    def write(self, segment: Dict):
+        self.count += 1
+        self._file.write(self.format_segment(segment))
+
+    def format_segment(self, segment: Dict) -> str:
+        raise NotImplementedError
+
+    def close(self) -> str:
+        self.write_footer()
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        self._file.close()
+        os.remove(self._tmp_path)
+
+
+class TxtWriter(TranscriptWriter):
+    extension = 'txt'
+
+    def __init__(self, path: str, timestamps: bool = True):
+        self.timestamps = timestamps
+        super().__init__(path)
+
+    def format_segment(self, segment: Dict) -> str:
+        if self.timestamps:
+            return f"[{format_clock(segment['start'])}] {segment['text']}\n"
+        return f"{segment['text']}\n"
+
+
+class SrtWriter(TranscriptWriter):
+    extension = 'srt'
+
+    def format_segment(self, segment: Dict) -> str:
+        return (f"{self.count}\n{format_srt_timestamp(segment['start'])} --> "
+                f"{format_srt_timestamp(segment['end'])}\n{segment['text']}\n\n")
+
+
+class VttWriter(TranscriptWriter):
+    extension = 'vtt'
+
+    def write_header(self):
+        self._file.write('WEBVTT\n\n')
+
+    def format_segment(self, segment: Dict) -> str:
+        return (f"{format_vtt_timestamp(segment['start'])} --> "
+                f"{format_vtt_timestamp(segment['end'])}\n{segment['text']}\n\n")
+
+
+class JsonWriter(TranscriptWriter):
+    """JSON document whose segments array is streamed
+
+    Fields known up front (such as language) go before the array; the
+    segment count and the end of the last segment are written after it.
+    """
+
+    extension = 'json'
+
+    def __init__(self, path: str, metadata: Dict = None):
+        self.metadata = metadata or {}
+        self._end = 0.0
+        # json.dumps builds a new encoder per call when given options
+        self._encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+        super().__init__(path)
+
+    def write_header(self):
+        self._file.write('{')
+        for key, value in self.metadata.items():
+            self._file.write(f"{self._encode(key)}: {self._encode(value)}, ")
+        self._file.write('"segments": [')
+
+    def format_segment(self, segment: Dict) -> str:
+        self._end = max(self._end, segment['end'])
+        separator = ',\n  ' if self.count > 1 else '\n  '
+        return separator + self._encode(segment)
+
+    def write_footer(self):
+        self._file.write(f"\n], \"segment_count\": {self.count}, \"duration\": {self._end}}}\n")
+
+
+WRITERS = {writer.extension: writer for writer in (TxtWriter, SrtWriter, VttWriter, JsonWriter)}
+
 
 class TranscriptExporter:
     def __init__(self):
-        self.supported_formats = ['txt', 'srt', 'vtt', 'json']
-    
-    def export(self, transcript_data: Dict, output_dir: str, format_options: Dict = None) -> str:
-        """Export transcript in various formats"""
-        format_type = format_options.get('format', 'txt')
-        
-        if format_type == 'srt':
-            return self._export_srt(transcript_data, output_dir)
-        elif format_type == 'json':
-            return self._export_json(transcript_data, output_dir)
+        self.supported_formats = list(WRITERS)
+
+    def export(self, transcript_data: Union[Dict, Iterable[Dict]], output_dir: str,
+               format_options: Dict = None) -> Union[str, List[str]]:
+        """Export transcript in various formats
+
+        transcript_data is a transcript dict, whose 'segments' may be a list
+        or an iterator, or an iterator of segments on its own, e.g.
+        TranscriptionService.iter_segments(). Segments are written as they
+        are produced; with several formats every segment goes to all of
+        them in the same pass.
+
+        format_options:
+            format (str | List[str]): One or more of txt, srt, vtt, json (default: txt)
+            filename (str): Output name without extension (default: transcript)
+            timestamps (bool): Prefix txt lines with the segment start (default: True)
+
+        Returns:
+            The written path, or a list of paths when several formats were asked for
+        """
+        format_options = format_options or {}
+        formats = format_options.get('format', 'txt')
+        formats = [formats] if isinstance(formats, str) else list(formats)
+        unsupported = [name for name in formats if name not in WRITERS]
+        if unsupported:
+            raise ValueError(f"Unsupported transcript format(s) {unsupported}; supported: {self.supported_formats}")
+
+        if isinstance(transcript_data, dict):
+            segments = transcript_data.get('segments', [])
+            metadata = {key: value for key, value in transcript_data.items()
+                        if key in ('language', 'source')}
         else:
-            return self._export_txt(transcript_data, output_dir)
-    
-    def _export_srt(self, transcript_data: Dict, output_dir: str) -> str:
-        """Export as SRT subtitle format"""
-        # Implementation here
-        pass
+            segments, metadata = transcript_data, {}
+
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, format_options.get('filename', 'transcript'))
+        writers = []
+        try:
+            for name in formats:
+                path = f"{base}.{name}"
+                if name == 'txt':
+                    writers.append(TxtWriter(path, format_options.get('timestamps', True)))
+                elif name == 'json':
+                    writers.append(JsonWriter(path, metadata))
+                else:
+                    writers.append(WRITERS[name](path))
+            for segment in segments:
+                for writer in writers:
+                    writer.write(segment)
+        except BaseException:
+            for writer in writers:
+                writer.abort()
+            raise
+
+        paths = [writer.close() for writer in writers]
+        return paths[0] if len(paths) == 1 else paths
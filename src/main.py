@@ -0,0 +1,126 @@
+# src/main.py
+import argparse
+import json
+import sys
+from typing import List
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='videosummarizer',
+        description='Summarize videos into keyframes, transcripts and audio highlights')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    summarize = subparsers.add_parser('summarize', help='Summarize a single video')
+    summarize.add_argument('video', help='Path to the video file')
+    summarize.add_argument('--output-dir', default='output', help='Directory for exported files')
+    summarize.add_argument('--interval', type=float, default=None,
+                           help='Seconds between sampled frames (default: from performance_config.yaml)')
+    summarize.add_argument('--preview', default=None, metavar='TIER',
+                           help='Quick low-resolution triage run with a tier from preview.tiers, e.g. fast')
+    summarize.add_argument('--trace', action='store_true', default=None,
+                           help='Write a Chrome trace (trace.json) and per-stage totals (default: tracing.enabled)')
+
+    batch = subparsers.add_parser('batch', help='Summarize every video in a directory or manifest')
+    batch.add_argument('source', help='Directory to scan, or a .txt/.json/.jsonl manifest of paths')
+    batch.add_argument('--output-dir', default='output', help='Directory for exported files and the batch report')
+    batch.add_argument('--checkpoint-dir', default=None,
+                       help='Where per-stage checkpoints are kept (default: <cache_directory>/checkpoints)')
+    batch.add_argument('--workers', type=int, default=None,
+                       help='Videos processed in parallel (default: processing.max_parallel_workers)')
+    batch.add_argument('--interval', type=float, default=None,
+                       help='Seconds between sampled frames (default: from performance_config.yaml)')
+    batch.add_argument('--preview', default=None, metavar='TIER',
+                       help='Quick low-resolution triage run with a tier from preview.tiers, e.g. fast')
+    batch.add_argument('--trace', action='store_true', default=None,
+                       help='Write a Chrome trace (trace.json) and per-stage totals per video (default: tracing.enabled)')
+
+    live = subparsers.add_parser('live', help='Summarize a recording that is still being written')
+    live.add_argument('source', help="Growing file, FIFO, or '-' to read from stdin")
+    live.add_argument('--output-dir', default='output', help='Directory for live_summary.json and final exports')
+    live.add_argument('--update-interval', type=float, default=None,
+                      help='Seconds between partial summaries (default: live.update_interval)')
+    live.add_argument('--max-lag', type=float, default=None,
+                      help='Seconds a stage may fall behind the live edge (default: live.max_lag)')
+    live.add_argument('--interval', type=float, default=None,
+                      help='Seconds between sampled frames (default: keyframes.extraction_interval)')
+    live.add_argument('--no-transcript', action='store_true', help='Skip speech transcription')
+
+    catalog = subparsers.add_parser('catalog', help='Probe a directory or manifest into the media catalog and report on it')
+    catalog.add_argument('source', help='Directory to scan, or a .txt/.json/.jsonl manifest of paths')
+    catalog.add_argument('--workers', type=int, default=None,
+                         help='Concurrent ffprobe processes (default: processing.max_parallel_workers)')
+    catalog.add_argument('--max-size', default=None,
+                         help='List catalogued files larger than this, e.g. 500MB (default: video.max_file_size)')
+    catalog.add_argument('--prune', action='store_true', help='Drop entries of files that no longer exist')
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from .utils.logger import configure_logging
+    configure_logging()
+
+    if args.command == 'summarize':
+        import os
+        from .utils.batch_runner import summarize_video
+        from .utils.config import get_config
+
+        checkpoint_dir = os.path.join(get_config().cache.cache_directory, 'checkpoints')
+        result = summarize_video(args.video, args.output_dir, checkpoint_dir, args.interval,
+                                 preview=args.preview, trace=args.trace)
+        print(json.dumps(result, indent=2, default=str))
+        return 0 if result['status'] != 'failed' else 1
+
+    if args.command == 'batch':
+        from .utils.batch_runner import BatchRunner
+
+        runner = BatchRunner(args.output_dir, args.checkpoint_dir, args.workers, args.interval,
+                             preview=args.preview, trace=args.trace)
+        report = runner.run(args.source)
+        print(f"{report['completed']} completed, {report['skipped']} skipped, {report['failed']} failed; "
+              f"{report['media_hours']:.2f} media-hours in {report['wall_hours']:.2f} h "
+              f"({report['throughput']:.1f}x real time)")
+        return 0 if not report['failed'] else 1
+
+    if args.command == 'live':
+        from .core.live_summarizer import LiveSummarizer
+
+        def report(summary):
+            live = summary['live']
+            lag = ', '.join(f"{name} {seconds:.1f} s" for name, seconds in live['lag'].items() if seconds is not None)
+            print(f"[{live['live_edge']:8.1f} s] {len(summary['highlights'])} highlights, "
+                  f"{summary['summary_duration']:.0f} s selected; lag: {lag}", flush=True)
+
+        summarizer = LiveSummarizer(args.source, args.output_dir, args.update_interval, args.max_lag,
+                                    args.interval, transcription_service=False if args.no_transcript else None,
+                                    on_update=report)
+        summary = summarizer.run()
+        for error in summary['live']['errors']:
+            print(f"Error: {error}", file=sys.stderr)
+        return 0 if not summary['live']['errors'] else 1
+
+    if args.command == 'catalog':
+        from .utils.file_handler import MediaCatalog, discover_media
+
+        catalog = MediaCatalog.default()
+        if args.prune:
+            print(f"Pruned {catalog.prune()} missing files")
+        results = catalog.scan(discover_media(args.source), max_workers=args.workers)
+        errors = {path: info['error'] for path, info in results.items() if 'error' in info}
+        print(f"{len(results)} files, {len(errors)} unreadable; {len(catalog)} in the catalog")
+        for codec, totals in catalog.total_duration_by_codec().items():
+            print(f"  {codec or 'unknown'}: {totals['files']} files, {totals['duration'] / 3600:.2f} h")
+        for entry in catalog.files_over(args.max_size):
+            print(f"  over size: {entry['path']} ({entry['size'] / (1024 ** 3):.2f} GB)")
+        for path, error in errors.items():
+            print(f"Error: {path}: {error}", file=sys.stderr)
+        return 0 if not errors else 1
+
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
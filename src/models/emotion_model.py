@@ -0,0 +1,54 @@
+# src/models/emotion_model.py
+import numpy as np
+from typing import Dict
+
+
+class EmotionModel:
+    """Arousal/valence estimate from AudioFeatureEngine features
+
+    A feature-based baseline with no trained weights: arousal follows
+    loudness, pitch variation and spectral brightness, valence follows
+    pitch level and how much of the speech is voiced. The four quadrants of
+    the arousal/valence plane map to emotion labels, with 'neutral' near
+    the centre. Anything exposing predict(features) with the same output
+    can be registered in its place.
+    """
+
+    LABELS = ('excited', 'tense', 'calm', 'sad', 'neutral')
+    # (arousal, valence) of each label in the [-1, 1] plane
+    CENTERS = np.array([[0.6, 0.6], [0.6, -0.6], [-0.6, 0.6], [-0.6, -0.6], [0.0, 0.0]], dtype=np.float32)
+
+    def predict(self, features: Dict) -> Dict:
+        rms = np.asarray(features['rms'], dtype=np.float32)
+        pitch = np.asarray(features['pitch'], dtype=np.float32)
+        loudness = 20 * np.log10(np.maximum(rms, 1e-10))
+        active = loudness > -50.0
+        if not active.any():
+            return {'label': 'neutral', 'arousal': 0.0, 'valence': 0.0,
+                    'scores': {label: float(label == 'neutral') for label in self.LABELS}}
+
+        voiced = pitch[(pitch > 0) & active]
+        pitch_mean = float(np.median(voiced)) if voiced.size else 0.0
+        pitch_variation = float(np.std(12 * np.log2(voiced / pitch_mean))) if voiced.size else 0.0
+        brightness = np.mean(np.asarray(features['spectral_centroid'])[active]) / (features['sample_rate'] / 2)
+
+        # Each cue mapped to [-1, 1] around typical conversational speech
+        energy = np.clip((np.mean(loudness[active]) + 30.0) / 15.0, -1, 1)
+        variation = np.clip((pitch_variation - 2.5) / 2.5, -1, 1)
+        bright = np.clip((brightness - 0.15) / 0.1, -1, 1)
+        level = np.clip((pitch_mean - 160.0) / 80.0, -1, 1) if voiced.size else -1.0
+        voicing = np.clip((voiced.size / active.sum() - 0.5) / 0.3, -1, 1)
+
+        arousal = float(np.mean([energy, variation, bright]))
+        valence = float(np.mean([level, voicing]))
+
+        distances = np.linalg.norm(self.CENTERS - np.array([arousal, valence], dtype=np.float32), axis=1)
+        weights = np.exp(-4.0 * distances)
+        scores = weights / weights.sum()
+
+        return {
+            'label': self.LABELS[int(np.argmax(scores))],
+            'arousal': arousal,
+            'valence': valence,
+            'scores': {label: float(score) for label, score in zip(self.LABELS, scores)}
+        }
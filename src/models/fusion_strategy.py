@@ -0,0 +1,96 @@
+# src/models/fusion_strategy.py
+import numpy as np
+from typing import Dict, List, Sequence, Union
+from ..core.timeline import SegmentTimeline
+
+
+class FusionStrategy:
+    """Weighted combination of per-segment modality scores
+
+    All methods work on whole columns at once: the modality scores are
+    stacked into one (modalities, segments) matrix and combined with a
+    single matrix product, so fusing one video or a library of
+    concatenated timelines costs the same per segment.
+    """
+
+    def __init__(self, config_path: str = None, weights: Dict[str, float] = None):
+        from ..utils.config import get_config
+
+        self.weights = dict(get_config().fusion.weights)
+        if config_path:
+            self._load_config(config_path)
+        if weights:
+            self.weights.update(weights)
+
+    def _load_config(self, config_path: str):
+        """Take the weights from the fusion section of a model_config.yaml-style file"""
+        import yaml
+
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+        self.weights.update((config.get('fusion') or {}).get('weights') or {})
+
+    def weighted_fusion(self, modality_scores: Union[Dict, SegmentTimeline]) -> np.ndarray:
+        """Combine scores from different modalities
+
+        Weights are renormalized over the modalities present, so a video
+        without a transcript is scored on audio and visuals alone.
+        """
+        if isinstance(modality_scores, SegmentTimeline):
+            modality_scores = modality_scores.scores
+        modalities, scores = self._stack(modality_scores)
+        if not modalities:
+            return np.zeros(0, dtype=np.float32)
+        weights = np.array([self.weights[modality] for modality in modalities], dtype=np.float32)
+        return weights @ scores / max(weights.sum(), 1e-9)
+
+    def adaptive_fusion(self, modality_scores: Union[Dict, SegmentTimeline],
+                        confidence_scores: Dict = None) -> np.ndarray:
+        """Fusion with adaptive weights based on confidence
+
+        Every segment gets its own weights, weight * confidence per modality
+        normalized to sum to one, so a modality only counts where it has
+        something to say (speech for text, a keyframe for visuals).
+        Segments where no modality is confident score 0.
+        """
+        if isinstance(modality_scores, SegmentTimeline):
+            modality_scores, confidence_scores = modality_scores.scores, modality_scores.confidence
+        modalities, scores = self._stack(modality_scores)
+        if not modalities:
+            return np.zeros(0, dtype=np.float32)
+        confidence = np.stack([np.asarray(confidence_scores[modality], dtype=np.float32)
+                               for modality in modalities])
+        weights = np.array([self.weights[modality] for modality in modalities], dtype=np.float32)[:, None] * confidence
+        total = weights.sum(axis=0)
+        fused = (weights * scores).sum(axis=0)
+        return np.divide(fused, total, out=np.zeros_like(fused), where=total > 0)
+
+    def fuse_batch(self, timelines: Sequence[SegmentTimeline], adaptive: bool = True) -> List[np.ndarray]:
+        """Fused scores of many timelines from one pass over their concatenated columns"""
+        scores, confidence, offsets = SegmentTimeline.concatenate(timelines, list(self.weights))
+        fused = self.adaptive_fusion(scores, confidence) if adaptive else self.weighted_fusion(scores)
+        if not len(fused):
+            return [np.zeros(len(timeline), dtype=np.float32) for timeline in timelines]
+        return np.split(fused, offsets[1:-1])
+
+    @staticmethod
+    def select_segments(scores: np.ndarray, durations: np.ndarray, budget: float) -> np.ndarray:
+        """Highest-scoring segments whose total duration fits the budget
+
+        One sort by score and a prefix sum over the sorted durations:
+        O(n log n). Ties keep time order.
+
+        Returns:
+            np.ndarray: Indices of the chosen segments, in time order
+        """
+        order = np.argsort(-np.asarray(scores), kind='stable')
+        used = np.cumsum(np.asarray(durations, dtype=np.float64)[order])
+        count = int(np.searchsorted(used, budget + 1e-9, side='right'))
+        return np.sort(order[:count])
+
+    def _stack(self, modality_scores: Dict):
+        modalities = [modality for modality in self.weights if modality in modality_scores]
+        if not modalities:
+            return [], None
+        return modalities, np.stack([np.asarray(modality_scores[modality], dtype=np.float32)
+                                     for modality in modalities])
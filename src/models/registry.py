@@ -0,0 +1,294 @@
+# src/models/registry.py
+import os
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Process-wide store of loaded models, shared by every service instance
+
+    Models are registered as loader callables and loaded on first get(), so
+    a job only pays for the models it actually uses. Loaded models are kept
+    in least-recently-used order and the oldest are dropped once their total
+    size exceeds max_size_mb; an evicted model is simply loaded again on its
+    next use. warm_up() loads models ahead of their first use, e.g. before
+    the pipeline scheduler forks its pool so that workers share them
+    copy-on-write; workers started with forkserver or spawn keep a registry
+    of their own.
+
+    Models that are not safe to call from several threads at once (Whisper,
+    transformers pipelines) are used through lease(), which hands every
+    caller an instance of its own. The shared instance is leased first;
+    further callers get extra instances, loaded while they fit the budget
+    and kept for reuse, and otherwise wait for one to be returned. A
+    leased model is never evicted.
+    """
+
+    def __init__(self, max_size_mb: float = 1000):
+        self.max_size_mb = max_size_mb
+        self._loaders = {}
+        self._models = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        # lease() bookkeeping: shared instances in use, and extra instances
+        # per model (idle ones in _spares) with their total size
+        self._leased = set()
+        self._spares = {}
+        self._extra_sizes = Counter()
+        self._returned = threading.Condition(self._lock)
+        self._stats = {'hits': 0, 'loads': 0, 'evictions': 0}
+
+    def register(self, name: str, loader: Callable[[], Any], size_mb: float = None):
+        """Register how to load a model, replacing any earlier registration
+
+        Args:
+            name (str): Registry name, e.g. 'whisper'
+            loader (Callable): Builds the model; called without arguments
+            size_mb (float): Memory the model takes, if known; otherwise it
+                is estimated from the loaded object (see estimate_size_mb)
+        """
+        with self._lock:
+            self._loaders[name] = (loader, size_mb)
+            self._load_locks.setdefault(name, threading.Lock())
+            self._drop(name)
+
+    def get(self, name: str) -> Any:
+        """Return a loaded model, loading it on first use"""
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                self._stats['hits'] += 1
+                return self._models[name]
+            if name not in self._loaders:
+                raise KeyError(f"No model registered as '{name}'")
+            load_lock = self._load_locks[name]
+
+        # Loading can take seconds; only callers of the same model wait for it
+        with load_lock:
+            with self._lock:
+                if name in self._models:
+                    self._models.move_to_end(name)
+                    self._stats['hits'] += 1
+                    return self._models[name]
+                loader, size_mb = self._loaders[name]
+
+            model = loader()
+
+            with self._lock:
+                self._models[name] = model
+                self._sizes[name] = size_mb if size_mb is not None else estimate_size_mb(model)
+                self._stats['loads'] += 1
+                self._evict(keep=name)
+            return model
+
+    @contextmanager
+    def lease(self, name: str):
+        """Use a model exclusively for the duration of a with block
+
+        Concurrent leases of the same model get separate instances, so
+        callers can run a model that keeps per-call state in parallel, as
+        far as the memory budget allows.
+        """
+        model, size = self._acquire(name)
+        try:
+            yield model
+        finally:
+            with self._returned:
+                if size is None:
+                    self._leased.discard(name)
+                elif name not in self._models:
+                    # The shared instance was evicted meanwhile; this one takes its place
+                    self._extra_sizes[name] -= size
+                    self._models[name] = model
+                    self._sizes[name] = size
+                else:
+                    self._spares.setdefault(name, []).append((model, size))
+                self._returned.notify_all()
+
+    def warm_up(self, names: Iterable[str] = None) -> List[str]:
+        """Load models ahead of time, e.g. while a worker process starts
+
+        Args:
+            names (Iterable[str]): Models to load (default: every registered one)
+
+        Returns:
+            List[str]: The names that are loaded afterwards
+        """
+        names = list(self._loaders) if names is None else list(names)
+        for name in names:
+            self.get(name)
+        return [name for name in names if self.is_loaded(name)]
+
+    def is_loaded(self, name: str) -> bool:
+        with self._lock:
+            return name in self._models
+
+    def evict(self, name: str):
+        """Drop a loaded model and its idle extra instances; it is loaded again on its next use"""
+        with self._lock:
+            self._drop(name)
+            self._drop_spares(name)
+
+    def clear(self):
+        with self._lock:
+            for name in list(self._models):
+                self._drop(name)
+            for name in list(self._spares):
+                self._drop_spares(name)
+
+    def stats(self) -> Dict:
+        """Hit, load and eviction counts plus the loaded models and their sizes"""
+        with self._lock:
+            return dict(self._stats,
+                        loaded={name: self._sizes[name] for name in self._models},
+                        leased=sorted(self._leased),
+                        extra_instances={name: len(spares) for name, spares in self._spares.items() if spares},
+                        size_mb=self._total_size(),
+                        max_size_mb=self.max_size_mb)
+
+    def _acquire(self, name: str) -> Tuple[Any, float]:
+        """An instance for lease() and its size, or None as size for the shared instance"""
+        while True:
+            with self._returned:
+                if name not in self._loaders:
+                    raise KeyError(f"No model registered as '{name}'")
+                if name in self._models and name not in self._leased:
+                    self._models.move_to_end(name)
+                    self._leased.add(name)
+                    self._stats['hits'] += 1
+                    return self._models[name], None
+                if self._spares.get(name):
+                    self._stats['hits'] += 1
+                    return self._spares[name].pop()
+                loader = None
+                if name in self._models:
+                    size = self._sizes[name]
+                    if not self._evict(keep=name, incoming_mb=size):
+                        self._returned.wait()
+                        continue
+                    # Reserved before loading, so concurrent leases see the budget taken
+                    self._extra_sizes[name] += size
+                    loader = self._loaders[name][0]
+            if loader is None:
+                # Nothing loaded yet: load the shared instance, then lease it
+                self.get(name)
+                continue
+            try:
+                model = loader()
+            except BaseException:
+                with self._returned:
+                    self._extra_sizes[name] -= size
+                    self._returned.notify_all()
+                raise
+            with self._lock:
+                self._stats['loads'] += 1
+            return model, size
+
+    def _evict(self, keep: str, incoming_mb: float = 0.0) -> bool:
+        """Free memory until the budget is met; caller holds the lock
+
+        Idle extra instances go first, then the least recently used models
+        that are not leased. Returns whether incoming_mb more would fit.
+        """
+        while self._total_size() + incoming_mb > self.max_size_mb:
+            spare = next((name for name, spares in self._spares.items() if spares), None)
+            if spare is not None:
+                self._extra_sizes[spare] -= self._spares[spare].pop()[1]
+                continue
+            idle = next((name for name in self._models if name != keep and name not in self._leased), None)
+            if idle is None:
+                return False
+            self._drop(idle)
+            self._stats['evictions'] += 1
+        return True
+
+    def _total_size(self) -> float:
+        return sum(self._sizes.values()) + sum(self._extra_sizes.values())
+
+    def _drop(self, name: str):
+        self._models.pop(name, None)
+        self._sizes.pop(name, None)
+
+    def _drop_spares(self, name: str):
+        for _, size in self._spares.pop(name, []):
+            self._extra_sizes[name] -= size
+
+
+def _before_fork():
+    _registry_lock.acquire()
+    if _registry is not None:
+        _registry._lock.acquire()
+
+
+def _after_fork_in_parent():
+    if _registry is not None:
+        _registry._lock.release()
+    _registry_lock.release()
+
+
+def _after_fork_in_child():
+    """Fresh locks for the child, whose copies may belong to threads that no longer exist"""
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    if _registry is not None:
+        _registry._lock = threading.Lock()
+        _registry._returned = threading.Condition(_registry._lock)
+        # A load in progress in another thread never completes here; the child loads anew
+        _registry._load_locks = {name: threading.Lock() for name in _registry._load_locks}
+        # Leases belong to the parent's threads
+        _registry._leased.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
+
+
+def estimate_size_mb(model: Any) -> float:
+    """Approximate memory held by a model, in MB
+
+    Counts parameters and buffers of torch modules (also when wrapped, as in
+    transformers pipelines) and nbytes of NumPy arrays. Anything else counts
+    as zero, so register such models with an explicit size_mb.
+    """
+    module = getattr(model, 'model', model)
+    if hasattr(module, 'parameters') and hasattr(module, 'buffers'):
+        tensors = list(module.parameters()) + list(module.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors) / (1024 * 1024)
+    if hasattr(model, 'nbytes'):
+        return model.nbytes / (1024 * 1024)
+    return 0.0
+
+
+def get_registry() -> ModelRegistry:
+    """The registry shared by everything in this process
+
+    Created on first use with the cache.model_cache_size budget and the
+    default loaders for speech recognition, emotion and tone models.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            from ..utils.config import get_config
+
+            registry = ModelRegistry(get_config().cache.model_cache_size)
+            _register_defaults(registry)
+            _registry = registry
+        return _registry
+
+
+def _register_defaults(registry: ModelRegistry):
+    from .emotion_model import EmotionModel
+    from .stt_models import load_thai_stt_model, load_whisper_model
+    from .tone_analyzer import ToneAnalyzer
+
+    registry.register('whisper', load_whisper_model)
+    registry.register('thai_stt', load_thai_stt_model)
+    registry.register('emotion', EmotionModel, size_mb=0)
+    registry.register('tone', ToneAnalyzer, size_mb=0)
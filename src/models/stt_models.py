@@ -0,0 +1,82 @@
+# src/models/stt_models.py
+# Loaders for the speech-to-text models. They are registered with the model
+# registry (src/models/registry.py) rather than called directly, so each
+# process loads a model at most once and only when it is first needed.
+
+def _device(setting: str) -> str:
+    if setting != 'auto':
+        return setting
+    import torch
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+def load_whisper_model(model_name: str = None):
+    """Load the Whisper model used for English transcription"""
+    import whisper
+    from ..utils.config import get_config
+
+    config = get_config().stt
+    return whisper.load_model(model_name or config.whisper_model, device=_device(config.device))
+
+
+def load_thai_stt_model(model_name: str = None):
+    """Load the Thai speech recognizer as a transformers ASR pipeline"""
+    from transformers import pipeline
+    from ..utils.config import get_config
+
+    config = get_config().stt
+    return pipeline('automatic-speech-recognition', model=model_name or config.thai_model,
+                    device=_device(config.device))
+
+
+# Recognizers take float32 mono samples and return segments with times in
+# seconds relative to the start of the samples. TranscriptionService accepts
+# any callable with the same signature, e.g. a deterministic stand-in, and
+# runs chunks concurrently only for callables with a true thread_safe
+# attribute. Neither model may be called from two threads at once (Whisper
+# installs kv-cache hooks on its decoder for each call, transformers
+# pipelines keep per-call state), so the ones below lease an instance of
+# their own from the registry for each call and are thread-safe that way.
+
+def whisper_recognizer(samples, sample_rate: int, language: str = 'en'):
+    """Transcribe samples with the registry's Whisper model"""
+    from .registry import get_registry
+
+    if sample_rate != 16000:
+        raise ValueError(f"Whisper expects 16 kHz audio, got {sample_rate} Hz")
+    with get_registry().lease('whisper') as model:
+        result = model.transcribe(samples, language=language)
+    return [{'start': float(segment['start']), 'end': float(segment['end']), 'text': segment['text']}
+            for segment in result['segments']]
+
+
+def thai_recognizer(samples, sample_rate: int, language: str = 'th'):
+    """Transcribe samples with the registry's Thai ASR pipeline"""
+    from .registry import get_registry
+
+    with get_registry().lease('thai_stt') as model:
+        result = model({'raw': samples, 'sampling_rate': sample_rate}, return_timestamps='word')
+    return [{'start': float(chunk['timestamp'][0]), 'end': float(chunk['timestamp'][1]), 'text': chunk['text']}
+            for chunk in result.get('chunks', [])]
+
+
+def whisper_language_id(samples, sample_rate: int, candidates=('en', 'th')) -> str:
+    """Most likely of the candidate languages, from one Whisper encoder pass
+
+    Only the first 30 seconds are looked at, which costs a fraction of
+    decoding them.
+    """
+    import whisper
+    from .registry import get_registry
+
+    if sample_rate != 16000:
+        raise ValueError(f"Whisper expects 16 kHz audio, got {sample_rate} Hz")
+    with get_registry().lease('whisper') as model:
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(samples), n_mels=model.dims.n_mels)
+        _, probabilities = model.detect_language(mel.to(model.device))
+    return max(candidates, key=lambda language: probabilities.get(language, 0.0))
+
+
+whisper_recognizer.thread_safe = True
+thai_recognizer.thread_safe = True
+whisper_language_id.thread_safe = True
@@ -0,0 +1,59 @@
+# src/models/tone_analyzer.py
+import numpy as np
+from typing import Dict
+
+
+class ToneAnalyzer:
+    """Prosody summary of a recording from AudioFeatureEngine features
+
+    Describes how something is said rather than what: pitch level and
+    range over voiced frames, loudness and its dynamic range, brightness
+    and how much of the recording is voiced. The overall tone label comes
+    from pitch and loudness variation, which is what listeners hear as
+    monotone versus expressive delivery.
+    """
+
+    # Frames quieter than this (dBFS) count as silence
+    SILENCE_DB = -50.0
+
+    def analyze(self, features: Dict) -> Dict:
+        rms = np.asarray(features['rms'], dtype=np.float32)
+        pitch = np.asarray(features['pitch'], dtype=np.float32)
+        loudness = 20 * np.log10(np.maximum(rms, 1e-10))
+        active = loudness > self.SILENCE_DB
+        voiced = pitch[(pitch > 0) & active]
+
+        if not active.any():
+            return {'tone': 'silent', 'voiced_ratio': 0.0, 'pitch_mean': 0.0, 'pitch_range': 0.0,
+                    'pitch_variation': 0.0, 'loudness_db': float(self.SILENCE_DB),
+                    'dynamic_range_db': 0.0, 'brightness': 0.0}
+
+        if voiced.size:
+            low, high = np.percentile(voiced, [5, 95])
+            pitch_mean = float(np.median(voiced))
+            # Semitone spread is comparable between low and high voices
+            pitch_variation = float(np.std(12 * np.log2(voiced / pitch_mean)))
+        else:
+            low = high = pitch_mean = pitch_variation = 0.0
+
+        quiet, loud = np.percentile(loudness[active], [10, 95])
+        nyquist = features['sample_rate'] / 2
+        brightness = float(np.mean(np.asarray(features['spectral_centroid'])[active]) / nyquist)
+
+        if pitch_variation < 1.5 and loud - quiet < 10:
+            tone = 'monotone'
+        elif pitch_variation > 4.0 or loud - quiet > 25:
+            tone = 'animated'
+        else:
+            tone = 'expressive'
+
+        return {
+            'tone': tone,
+            'voiced_ratio': float(voiced.size / active.sum()),
+            'pitch_mean': pitch_mean,
+            'pitch_range': float(high - low),
+            'pitch_variation': pitch_variation,
+            'loudness_db': float(np.mean(loudness[active])),
+            'dynamic_range_db': float(loud - quiet),
+            'brightness': brightness
+        }
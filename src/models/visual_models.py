@@ -0,0 +1,53 @@
+# src/models/visual_models.py
+import numpy as np
+from typing import Dict
+
+
+class ContentAnalyzer:
+    """Cheap per-frame visual importance cues
+    
+    Scores a frame on sharpness (variance of the Laplacian), contrast and
+    colorfulness, and penalizes near-black or washed-out frames such as
+    fades. Frames are analyzed on a strided thumbnail about analysis_width
+    pixels wide, so the cost does not grow with the source resolution.
+    """
+    
+    def __init__(self, analysis_width: int = 256, weights: Dict[str, float] = None):
+        self.analysis_width = analysis_width
+        self.weights = weights or {
+            'sharpness': 0.4,
+            'contrast': 0.3,
+            'colorfulness': 0.3
+        }
+    
+    def analyze(self, frame: np.ndarray) -> Dict:
+        """Return visual cues in [0, 1] and their combined importance"""
+        stride = max(1, frame.shape[1] // self.analysis_width)
+        rgb = frame[::stride, ::stride].astype(np.float32)
+        gray = rgb @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        
+        laplacian = (4 * gray[1:-1, 1:-1] - gray[:-2, 1:-1] - gray[2:, 1:-1]
+                     - gray[1:-1, :-2] - gray[1:-1, 2:])
+        sharpness = 1.0 - np.exp(-laplacian.var() / 500.0) if laplacian.size else 0.0
+        contrast = min(1.0, gray.std() / 80.0)
+        
+        # Hasler and Suesstrunk colorfulness metric
+        rg = rgb[..., 0] - rgb[..., 1]
+        yb = 0.5 * (rgb[..., 0] + rgb[..., 1]) - rgb[..., 2]
+        colorfulness = np.hypot(rg.std(), yb.std()) + 0.3 * np.hypot(rg.mean(), yb.mean())
+        colorfulness = min(1.0, colorfulness / 110.0)
+        
+        brightness = gray.mean() / 255.0
+        exposure = 1.0 - min(1.0, abs(brightness - 0.5) / 0.45) ** 4
+        
+        importance = exposure * (self.weights['sharpness'] * sharpness +
+                                 self.weights['contrast'] * contrast +
+                                 self.weights['colorfulness'] * colorfulness)
+        
+        return {
+            'sharpness': float(sharpness),
+            'contrast': float(contrast),
+            'colorfulness': float(colorfulness),
+            'brightness': float(brightness),
+            'importance': float(importance)
+        }
@@ -0,0 +1,65 @@
+# src/ui/progress_tracker.py
+import time
+from typing import Dict, Optional
+from ..utils.logger import get_logger, get_tracer
+
+logger = get_logger(__name__)
+
+
+class ProgressTracker:
+    """Progress of a batch of jobs, logged as each one finishes
+
+    Jobs can be weighted, e.g. by media duration, so the estimate of the
+    time left follows the work left rather than the number of jobs. While
+    the process tracer is on, progress is also recorded as a 'progress'
+    counter track in the trace.
+
+    Args:
+        total (int): Number of jobs
+        total_weight (float): Sum of the job weights (default: one per job)
+        label (str): What a job is, for the log lines
+    """
+
+    def __init__(self, total: int, total_weight: float = None, label: str = 'jobs'):
+        self.total = total
+        self.total_weight = total_weight if total_weight is not None else float(total)
+        self.label = label
+        self.done = 0
+        self.done_weight = 0.0
+        self.statuses = {}
+        self.started = time.perf_counter()
+
+    def advance(self, item: str, status: str, weight: float = 1.0) -> Dict:
+        """Count one finished job and log it; returns snapshot()"""
+        self.done += 1
+        self.done_weight += weight
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        snapshot = self.snapshot()
+        eta = snapshot['eta']
+        logger.info(f"[{self.done}/{self.total} {self.label}] {status}: {item}"
+                    + (f" (about {_format_seconds(eta)} left)" if eta is not None and self.done < self.total else ''))
+        get_tracer().gauge('progress', done=self.done, percent=snapshot['percent'])
+        return snapshot
+
+    def eta(self) -> Optional[float]:
+        """Seconds left at the weighted rate so far, or None before any progress"""
+        if not self.done_weight:
+            return None
+        elapsed = time.perf_counter() - self.started
+        return max(0.0, elapsed * (self.total_weight - self.done_weight) / self.done_weight)
+
+    def snapshot(self) -> Dict:
+        percent = 100.0 * self.done_weight / self.total_weight if self.total_weight else 100.0
+        return {'done': self.done, 'total': self.total, 'percent': min(percent, 100.0),
+                'elapsed': time.perf_counter() - self.started, 'eta': self.eta(),
+                'statuses': dict(self.statuses)}
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
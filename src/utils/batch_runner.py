@@ -0,0 +1,328 @@
+# src/utils/batch_runner.py
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List
+from .logger import get_logger, get_tracer
+
+logger = get_logger(__name__)
+
+# Written once every stage of a video has finished
+_DONE_FILE = 'done.json'
+
+# Stage outputs holding decoded frames are redone on resume instead of being
+# checkpointed, which would store every keyframe uncompressed outside the
+# cache budget
+_FRAME_STAGES = {'keyframes'}
+
+
+class CheckpointStore:
+    """Per-video stage outputs, so an interrupted batch can resume
+
+    Each video run gets a directory named after its content digest and its
+    processing parameters (see make_key), holding one .npz per finished
+    stage (written atomically with the stage cache codec) and a done.json
+    summary once the whole video is finished. Outputs that
+    cannot be stored without pickling, such as the memory-mapped audio
+    buffer, are skipped; those stages are cheap to redo from the stage cache.
+    summarize_video also leaves out outputs holding frames (the keyframes),
+    which are recomputed on resume.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def make_key(digest: str, params: Dict, preview: str = None) -> str:
+        """Checkpoint key of a video run with params; a preview tier stays readable in it"""
+        payload = json.dumps(params, sort_keys=True, default=str)
+        key = f"{digest}-{hashlib.sha1(payload.encode()).hexdigest()[:12]}"
+        return f"{key}-preview-{preview}" if preview else key
+
+    def video_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def load(self, key: str) -> Dict[str, Any]:
+        """Outputs of every checkpointed stage of a video, by artifact name"""
+        from .cache import load_structured
+
+        artifacts = {}
+        directory = self.video_dir(key)
+        if not os.path.isdir(directory):
+            return artifacts
+        for name in os.listdir(directory):
+            if name.endswith('.npz'):
+                try:
+                    artifacts[name[:-4]] = load_structured(os.path.join(directory, name))
+                except (OSError, ValueError, KeyError):
+                    # A damaged checkpoint only means the stage runs again
+                    continue
+        return artifacts
+
+    def save(self, key: str, name: str, value: Any) -> bool:
+        """Checkpoint one stage output; return False if it cannot be stored"""
+        from .cache import save_structured
+
+        os.makedirs(self.video_dir(key), exist_ok=True)
+        try:
+            save_structured(os.path.join(self.video_dir(key), f"{name}.npz"), value)
+            return True
+        except TypeError:
+            return False
+
+    def is_done(self, key: str) -> bool:
+        return os.path.isfile(os.path.join(self.video_dir(key), _DONE_FILE))
+
+    def mark_done(self, key: str, summary: Dict):
+        os.makedirs(self.video_dir(key), exist_ok=True)
+        path = os.path.join(self.video_dir(key), _DONE_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(summary, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    def load_summary(self, key: str) -> Dict:
+        with open(os.path.join(self.video_dir(key), _DONE_FILE), 'r') as f:
+            return json.load(f)
+
+
+def summarize_video(video_path: str, output_dir: str, checkpoint_dir: str,
+                    frame_interval: float = None, components: List[str] = None,
+                    pipeline_processes: int = 1, preview: str = None, trace: bool = None) -> Dict:
+    """Run the full pipeline for one video, resuming from its checkpoints
+
+    Every stage output is checkpointed as soon as the stage finishes. Stages
+    whose outputs are already checkpointed are skipped, along with anything
+    upstream that only they needed. Errors are reported in the returned
+    summary rather than raised, so one bad file does not stop a batch.
+    Checkpoints are keyed by the content and the processing parameters
+    (frame interval, export components, preview tier), so a run with other
+    parameters never resumes from or is skipped by a finished one. A
+    preview run (a tier name from preview.tiers) also keeps its outputs
+    apart from the full-quality ones.
+
+    With trace (default: tracing.enabled) the run is traced: the Chrome
+    trace is written to trace.json in the video's output directory and the
+    per-job totals are added to the summary under 'trace'.
+    """
+    from ..core.pipeline import build_video_pipeline
+    from .cache import StageCache
+    from .config import get_config
+
+    if frame_interval is None:
+        frame_interval = get_config().optimization.frame_extraction_interval
+    if trace is None:
+        trace = get_config().tracing.enabled
+    started = time.perf_counter()
+    summary = {'path': video_path}
+    job_dir = output_dir
+    tracer = None
+    try:
+        store = CheckpointStore(checkpoint_dir)
+        digest = StageCache.default().file_digest(video_path)
+        summary['digest'] = digest
+        if preview:
+            summary['preview'] = preview
+        key = store.make_key(digest, {'frame_interval': float(frame_interval),
+                                      'components': sorted(set(components or ['summary'])),
+                                      'preview': preview}, preview)
+        if store.is_done(key):
+            return dict(store.load_summary(key), path=video_path, status='skipped')
+        if trace:
+            tracer = get_tracer().start(os.path.basename(video_path))
+
+        stem = os.path.splitext(os.path.basename(video_path))[0]
+        initial = store.load(key)
+        summary['resumed_stages'] = sorted(initial)
+        job_dir = os.path.join(output_dir, f"{stem}-{digest[:8]}" + (f"-preview-{preview}" if preview else ''))
+        initial.update({'video_path': video_path, 'output_dir': job_dir})
+
+        def checkpoint(stage, result):
+            if not stage.streaming and stage.output not in _FRAME_STAGES:
+                store.save(key, stage.output, result)
+
+        scheduler = build_video_pipeline(frame_interval, include_export=True,
+                                         max_processes=pipeline_processes,
+                                         export_components=components, preview=preview)
+        results = scheduler.run(initial, targets=['export'], on_stage_complete=checkpoint)
+
+        summary.update({
+            'status': 'completed',
+            'duration': results.get('video_info', {}).get('duration', 0.0),
+            'exports': results['export'],
+            'stage_times': {name: timing['duration'] for name, timing in scheduler.timings.items()},
+            'wall_time': time.perf_counter() - started
+        })
+        if tracer is not None:
+            summary['trace'] = _finish_trace(tracer, job_dir)
+        store.mark_done(key, summary)
+        return summary
+
+    except Exception as e:
+        logger.error(f"Error summarizing {video_path}: {e}")
+        summary.update({
+            'status': 'failed',
+            'error': f"{type(e).__name__}: {e}",
+            'wall_time': time.perf_counter() - started
+        })
+        if tracer is not None and tracer.enabled:
+            summary['trace'] = _finish_trace(tracer, job_dir)
+        return summary
+
+
+def _finish_trace(tracer, job_dir: str) -> Dict:
+    """Stop the job's tracer, write its Chrome trace and return the per-job totals"""
+    totals = tracer.stop()
+    totals['path'] = tracer.write_chrome_trace(os.path.join(job_dir, 'trace.json'))
+    return totals
+
+
+class BatchRunner:
+    """Summarize many videos across worker processes, longest first
+
+    Videos come from a directory (searched recursively for
+    video.supported_formats) or a manifest file. Durations from
+    get_video_info decide the order, so the longest jobs start first and
+    short ones fill the gaps at the end of the batch. A new video only
+    starts while memory is below the pressure threshold of the
+    MemoryPressureController, so concurrent long videos cannot push the
+    machine past processing.memory_limit. Each video is checkpointed
+    stage by stage (see CheckpointStore); rerunning the same batch after a
+    crash or kill skips finished videos and resumes partial ones. When a
+    worker process dies, the jobs it took down with the pool are retried
+    in a fresh pool, up to MAX_ATTEMPTS runs per video, and then reported
+    as failed.
+    """
+
+    MAX_ATTEMPTS = 2
+
+    def __init__(self, output_dir: str, checkpoint_dir: str = None, max_workers: int = None,
+                 frame_interval: float = None, components: List[str] = None, preview: str = None,
+                 trace: bool = None):
+        from .config import get_config
+
+        config = get_config()
+        self.output_dir = output_dir
+        self.checkpoint_dir = checkpoint_dir or os.path.join(
+            config.cache.cache_directory, 'checkpoints')
+        self.max_workers = max_workers or config.processing.max_parallel_workers
+        self.frame_interval = frame_interval
+        self.components = components
+        self.preview = preview
+        self.trace = trace
+
+    def discover(self, source: str) -> List[str]:
+        """Video paths from a directory or a manifest (see discover_media)"""
+        from .file_handler import discover_media
+
+        return discover_media(source)
+
+    def plan(self, paths: List[str]) -> List[Dict]:
+        """Jobs with their durations, longest first
+
+        Durations come from the media catalog, so only files that are new or
+        changed since the last batch are probed. Files that cannot be probed
+        are kept with a zero duration so their failure shows up in the
+        report.
+        """
+        from .file_handler import MediaCatalog
+
+        jobs = []
+        for path, info in MediaCatalog.default().scan(paths, max_workers=self.max_workers).items():
+            if 'error' in info:
+                jobs.append({'path': path, 'duration': 0.0, 'probe_error': info['error']})
+            else:
+                jobs.append({'path': path, 'duration': info['duration']})
+        return sorted(jobs, key=lambda job: job['duration'], reverse=True)
+
+    def run(self, source: str) -> Dict:
+        """Summarize every video in source and return the batch report
+
+        The report is also written to <output_dir>/batch_report.json. Its
+        throughput is media-hours processed per wall-clock hour, counting only
+        videos completed in this run.
+        """
+        from ..ui.progress_tracker import ProgressTracker
+        from .memory_manager import get_memory_controller
+
+        started = time.perf_counter()
+        jobs = self.plan(self.discover(source))
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # Progress is weighted by duration, so the estimate follows media time left
+        weights = {job['path']: job['duration'] for job in jobs}
+        if not sum(weights.values()):
+            weights = dict.fromkeys(weights, 1.0)
+        progress = ProgressTracker(len(jobs), sum(weights.values()), label='videos')
+        controller = get_memory_controller()
+
+        results = []
+        pending = list(reversed(jobs))
+        running = {}
+        attempts = {}
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            while pending or running:
+                # Longest first; a new job starts only while memory allows, one per
+                # check, so each job's memory shows up before the next is admitted
+                if pending and len(running) < self.max_workers and controller.may_start_job(len(running)):
+                    job = pending.pop()
+                    future = executor.submit(summarize_video, job['path'], self.output_dir,
+                                             self.checkpoint_dir, self.frame_interval, self.components,
+                                             preview=self.preview, trace=self.trace)
+                    running[future] = job
+                # With a free worker, look again after a poll interval even if nothing finished
+                timeout = controller.poll_interval if pending and len(running) < self.max_workers else None
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                broken = any(isinstance(future.exception(), BrokenProcessPool) for future in done)
+                if broken:
+                    # A worker that died (e.g. OOM-killed) breaks the whole pool,
+                    # failing every job still running in it
+                    done = wait(running).done
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as e:
+                        # Which job killed the worker is unknown, so each gets another try;
+                        # it resumes from its checkpoints
+                        attempts[job['path']] = attempts.get(job['path'], 0) + 1
+                        if attempts[job['path']] < self.MAX_ATTEMPTS:
+                            logger.warning(f"Worker died while summarizing {job['path']}; retrying")
+                            pending.append(job)
+                            continue
+                        result = {'path': job['path'], 'status': 'failed',
+                                  'error': f"{type(e).__name__}: worker process died: {e}"}
+                    results.append(result)
+                    progress.advance(result['path'], result['status'], weights[result['path']])
+                if broken:
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        finally:
+            executor.shutdown()
+
+        wall_time = time.perf_counter() - started
+        completed = [result for result in results if result['status'] == 'completed']
+        media_seconds = sum(result.get('duration', 0.0) for result in completed)
+
+        report = {
+            'source': source,
+            'videos': len(jobs),
+            'completed': len(completed),
+            'skipped': sum(result['status'] == 'skipped' for result in results),
+            'failed': sum(result['status'] == 'failed' for result in results),
+            'media_hours': media_seconds / 3600,
+            'wall_hours': wall_time / 3600,
+            'throughput': media_seconds / wall_time if wall_time else 0.0,
+            'workers': self.max_workers,
+            'results': results
+        }
+
+        path = os.path.join(self.output_dir, 'batch_report.json')
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        return report
@@ -0,0 +1,362 @@
+# src/utils/cache.py
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+from typing import Any, Callable, Dict, Optional, Tuple
+from .logger import count
+
+# Fixed .npy header size used by streamed entries; the shape is rewritten in
+# place once the final item count is known
+_NPY_HEADER_SIZE = 128
+_NDARRAY_TAG = '__ndarray__'
+_TUPLE_TAG = '__tuple__'
+
+
+class StageCache:
+    """Content-addressed on-disk cache for per-stage pipeline results
+
+    Entries are keyed by the hash of the input file's content, the stage name
+    and the stage parameters, so renaming or copying a video still hits and
+    changing e.g. the sample rate misses. Arrays are stored as .npy files that
+    are memory-mapped on load; structured results (dicts of scalars, lists and
+    arrays) are stored as .npz with a JSON description of the structure.
+    Nothing is pickled.
+
+    The total size of all entries is kept under max_size_mb by deleting the
+    least recently used entries. Recency is tracked through file mtimes, so
+    several processes can share one cache directory without a lock. An
+    entry is never evicted by the write that publishes it.
+    """
+
+    # Largest share of the budget one entry should take; stages skip caching
+    # results bigger than max_entry_size instead of flushing everything else
+    MAX_ENTRY_SHARE = 0.25
+
+    _default = None
+
+    def __init__(self, cache_dir: str, max_size_mb: float = 10240, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.stage_dir = os.path.join(cache_dir, 'stages')
+        self.digest_dir = os.path.join(cache_dir, 'digests')
+        self.scratch_dir = os.path.join(cache_dir, 'scratch')
+        self._stats = {}
+
+    @property
+    def max_entry_size(self) -> int:
+        return int(self.max_size * self.MAX_ENTRY_SHARE)
+
+    @classmethod
+    def default(cls) -> 'StageCache':
+        """Process-wide cache configured from performance_config.yaml"""
+        if cls._default is None:
+            from .config import get_config
+
+            cache_config = get_config().cache
+            cls._default = cls(cache_config.cache_directory, cache_config.max_cache_size,
+                               cache_config.enabled)
+        return cls._default
+
+    def file_digest(self, path: str) -> str:
+        """Hash of the file's content, memoized per (path, size, mtime)"""
+        stat = os.stat(path)
+        stat_id = hashlib.sha1(
+            f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode()
+        ).hexdigest()
+        memo_path = os.path.join(self.digest_dir, stat_id)
+
+        try:
+            with open(memo_path, 'r') as f:
+                return f.read().strip()
+        except OSError:
+            pass
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 22), b''):
+                digest.update(block)
+        digest = digest.hexdigest()
+        count('bytes_read', stat.st_size)
+
+        os.makedirs(self.digest_dir, exist_ok=True)
+        self._write_atomic(memo_path, digest.encode())
+        return digest
+
+    @staticmethod
+    def make_key(digest: str, stage: str, params: Dict = None) -> str:
+        """Cache key for a stage run on the content identified by digest"""
+        payload = json.dumps({'content': digest, 'stage': stage, 'params': params or {}},
+                             sort_keys=True, default=str)
+        return f"{stage}-{hashlib.sha1(payload.encode()).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        if not self.enabled:
+            return None
+        stage = key.split('-', 1)[0]
+
+        for ext in ('.npy', '.npz'):
+            path = self._entry_path(key, ext)
+            try:
+                value = self._load(path)
+            except (OSError, ValueError, KeyError):
+                continue
+
+            # Touch the entry so eviction sees it as recently used
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._count(stage, 'hits')
+            return value
+
+        self._count(stage, 'misses')
+        return None
+
+    def put(self, key: str, value: Any) -> Any:
+        """Store value under key and return it
+
+        Arrays are stored as .npy, anything else must be a nesting of
+        dicts with string keys, lists, tuples, JSON scalars and arrays.
+        """
+        if not self.enabled:
+            return value
+
+        os.makedirs(os.path.dirname(self._entry_path(key, '.npz')), exist_ok=True)
+        if isinstance(value, np.ndarray):
+            path = self._entry_path(key, '.npy')
+            tmp_path = self._tmp_path(path)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, value, allow_pickle=False)
+            os.replace(tmp_path, path)
+        else:
+            path = self._entry_path(key, '.npz')
+            save_structured(path, value)
+
+        self._evict(keep=path)
+        return value
+
+    def array_writer(self, key: str, dtype, item_shape: Tuple = ()) -> 'NpyStreamWriter':
+        """Open a writer that streams an array entry to disk item by item
+
+        The entry becomes visible under key only when the writer is
+        committed. With the cache disabled the file is written to a scratch
+        location instead, so callers can memory-map the result either way.
+        """
+        if self.enabled:
+            path = self._entry_path(key, '.npy')
+        else:
+            path = os.path.join(self.scratch_dir, f"{key}.npy")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return NpyStreamWriter(path, dtype, item_shape, on_commit=self._evict if self.enabled else None)
+
+    def stats(self) -> Dict:
+        """Hit/miss counts per stage plus the current size of the cache"""
+        entries = self._entries()
+        hits = sum(counts['hits'] for counts in self._stats.values())
+        misses = sum(counts['misses'] for counts in self._stats.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'stages': {stage: dict(counts) for stage, counts in self._stats.items()},
+            'entries': len(entries),
+            'size_bytes': sum(size for _, size, _ in entries),
+            'max_size_bytes': self.max_size
+        }
+
+    def clear(self):
+        """Delete every cached entry"""
+        for path, _, _ in self._entries():
+            _remove(path)
+
+    def _count(self, stage: str, outcome: str):
+        counts = self._stats.setdefault(stage, {'hits': 0, 'misses': 0})
+        counts[outcome] += 1
+
+    def _entry_path(self, key: str, ext: str) -> str:
+        digest = key.split('-', 1)[1]
+        return os.path.join(self.stage_dir, digest[:2], f"{key}{ext}")
+
+    @staticmethod
+    def _tmp_path(path: str) -> str:
+        return f"{path}.{os.getpid()}.tmp"
+
+    @staticmethod
+    def _load(path: str) -> Any:
+        if path.endswith('.npy'):
+            return np.load(path, mmap_mode='r', allow_pickle=False)
+        return load_structured(path)
+
+    def _entries(self):
+        """(path, size, mtime) of every committed entry"""
+        entries = []
+        if not os.path.isdir(self.stage_dir):
+            return entries
+        for shard in os.scandir(self.stage_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(('.npy', '.npz')):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self, keep: str = None):
+        """Delete least recently used entries until the cache fits its budget
+
+        keep is the entry just written, which its caller is about to use.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_size:
+            return
+
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if path == keep:
+                continue
+            _remove(path)
+            total -= size
+            if total <= self.max_size:
+                break
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class NpyStreamWriter:
+    """Write a .npy file whose leading dimension is only known at the end
+
+    A fixed-size header is reserved up front and rewritten with the final
+    item count on commit, so items can be appended as raw bytes (e.g. piped
+    straight from ffmpeg) or as arrays without holding them in memory.
+    """
+
+    def __init__(self, path: str, dtype, item_shape: Tuple = (), on_commit: Callable[[str], None] = None):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.item_shape = tuple(item_shape)
+        self.item_size = self.dtype.itemsize * int(np.prod(self.item_shape, dtype=np.int64))
+        self.bytes_written = 0
+        self._on_commit = on_commit
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.file = open(self._tmp_path, 'wb')
+        self.file.write(_npy_header(self.dtype, (0,) + self.item_shape))
+
+    def __enter__(self) -> 'NpyStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def write(self, data):
+        """Append one item, a stack of items, or raw bytes"""
+        if isinstance(data, np.ndarray):
+            data = np.ascontiguousarray(data, dtype=self.dtype)
+        view = memoryview(data)
+        self.file.write(view)
+        self.bytes_written += view.nbytes
+
+    @property
+    def count(self) -> int:
+        return self.bytes_written // self.item_size if self.item_size else 0
+
+    def commit(self) -> str:
+        """Finalize the header, publish the file and return its path"""
+        # Drop a trailing partial item, e.g. an odd byte from a truncated pipe
+        self.file.truncate(_NPY_HEADER_SIZE + self.count * self.item_size)
+        self.file.seek(0)
+        self.file.write(_npy_header(self.dtype, (self.count,) + self.item_shape))
+        self.file.close()
+        os.replace(self._tmp_path, self.path)
+        if self._on_commit:
+            self._on_commit(self.path)
+        return self.path
+
+    def abort(self):
+        """Discard everything written so far"""
+        self.file.close()
+        _remove(self._tmp_path)
+
+
+def save_structured(path: str, value: Any):
+    """Atomically write a nesting of dicts, lists, tuples, scalars and arrays as .npz
+
+    Raises TypeError for values that cannot be stored without pickling.
+    """
+    arrays = {}
+    meta = _encode(value, arrays)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, __meta__=np.array(json.dumps(meta)), **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+
+
+def load_structured(path: str) -> Any:
+    """Read a value written by save_structured()"""
+    with np.load(path, allow_pickle=False) as data:
+        return _decode(json.loads(str(data['__meta__'])), data)
+
+
+def _npy_header(dtype: np.dtype, shape: Tuple) -> bytes:
+    header = "{'descr': %r, 'fortran_order': False, 'shape': %r, }" % (
+        np.lib.format.dtype_to_descr(dtype), tuple(int(n) for n in shape))
+    header_len = _NPY_HEADER_SIZE - 10
+    if len(header) >= header_len:
+        raise ValueError(f"Array shape {shape} does not fit a streamed .npy header")
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', header_len) + (header.ljust(header_len - 1) + '\n').encode('latin1')
+
+
+def _encode(value: Any, arrays: Dict) -> Any:
+    """JSON-compatible description of value with arrays moved into arrays"""
+    if isinstance(value, np.ndarray):
+        name = f"a{len(arrays)}"
+        arrays[name] = value
+        return {_NDARRAY_TAG: name}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _encode(v, arrays) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_encode(v, arrays) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v, arrays) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _decode(meta: Any, arrays) -> Any:
+    if isinstance(meta, dict):
+        if _NDARRAY_TAG in meta:
+            return arrays[meta[_NDARRAY_TAG]]
+        if _TUPLE_TAG in meta:
+            return tuple(_decode(v, arrays) for v in meta[_TUPLE_TAG])
+        return {k: _decode(v, arrays) for k, v in meta.items()}
+    if isinstance(meta, list):
+        return [_decode(v, arrays) for v in meta]
+    return meta
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
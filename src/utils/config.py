@@ -0,0 +1,196 @@
+# src/utils/config.py
+import yaml
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Dict, Tuple
+
+SETTINGS_PATH = 'config/settings.yaml'
+PERFORMANCE_CONFIG_PATH = 'config/performance_config.yaml'
+MODEL_CONFIG_PATH = 'config/model_config.yaml'
+
+
+@dataclass(frozen=True)
+class VideoSettings:
+    supported_formats: Tuple[str, ...] = ('.mp4', '.avi', '.mov', '.mkv')
+    max_file_size: str = '2GB'
+
+
+@dataclass(frozen=True)
+class AudioSettings:
+    sample_rate: int = 16000
+    extraction_format: str = 'wav'
+
+
+@dataclass(frozen=True)
+class TranscriptionSettings:
+    languages: Tuple[str, ...] = ('en', 'th')
+    confidence_threshold: float = 0.8
+    max_chunk_length: float = 30.0
+    chunk_overlap: float = 1.0
+    min_silence: float = 0.3
+
+
+@dataclass(frozen=True)
+class KeyframeSettings:
+    extraction_interval: float = 1.0
+    scene_threshold: float = 0.3
+    max_frames: int = 100
+    duplicate_distance: int = 6
+
+
+@dataclass(frozen=True)
+class PreviewTier:
+    frame_width: int = 320
+    sample_rate: int = 8000
+    intra_only: bool = True
+    min_interval: float = 2.0
+    transcribe: bool = False
+
+
+@dataclass(frozen=True)
+class PreviewSettings:
+    # Tier name -> PreviewTier fields; see get_preview_tier()
+    tiers: Dict[str, Dict] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class LiveSettings:
+    update_interval: float = 30.0
+    max_lag: float = 60.0
+    analysis_window: float = 5.0
+    frame_size: Tuple[int, int] = (640, 360)
+    idle_timeout: float = 10.0
+
+
+@dataclass(frozen=True)
+class ExportSettings:
+    # Allowed formats per component, e.g. formats['transcript']
+    formats: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class BatchSizeConfig:
+    gpu: int = 32
+    cpu: int = 8
+
+
+@dataclass(frozen=True)
+class ProcessingConfig:
+    max_parallel_workers: int = 4
+    gpu_enabled: bool = True
+    batch_size: BatchSizeConfig = BatchSizeConfig()
+    memory_limit: float = 0.8
+
+
+@dataclass(frozen=True)
+class OptimizationConfig:
+    chunk_size: float = 60
+    chunk_overlap: float = 1.0
+    frame_extraction_interval: float = 1.0
+    audio_sample_rate: int = 16000
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    model_cache_size: float = 4096
+    temp_file_cleanup: bool = True
+    cache_directory: str = './cache'
+    enabled: bool = True
+    max_cache_size: float = 10240
+
+
+@dataclass(frozen=True)
+class TracingConfig:
+    enabled: bool = False
+    sample_interval: float = 0.5
+
+
+@dataclass(frozen=True)
+class SttConfig:
+    whisper_model: str = 'base'
+    thai_model: str = 'airesearch/wav2vec2-large-xlsr-53-th'
+    device: str = 'auto'
+
+
+@dataclass(frozen=True)
+class FusionConfig:
+    weights: Dict[str, float] = field(default_factory=lambda: {'audio': 0.3, 'text': 0.4, 'visual': 0.3})
+    segment_length: float = 1.0
+    smoothing: float = 3.0
+    summary_ratio: float = 0.15
+    max_summary_duration: float = 180.0
+
+
+@dataclass(frozen=True)
+class Config:
+    """All settings, grouped by section
+
+    video, audio, transcription, keyframes, preview, live and export come
+    from settings.yaml; processing, optimization, cache and tracing from
+    performance_config.yaml; stt and fusion from model_config.yaml. Keys
+    missing from a file keep the defaults above, unknown keys are ignored.
+    """
+    video: VideoSettings = VideoSettings()
+    audio: AudioSettings = AudioSettings()
+    transcription: TranscriptionSettings = TranscriptionSettings()
+    keyframes: KeyframeSettings = KeyframeSettings()
+    preview: PreviewSettings = PreviewSettings()
+    live: LiveSettings = LiveSettings()
+    export: ExportSettings = ExportSettings()
+    processing: ProcessingConfig = ProcessingConfig()
+    optimization: OptimizationConfig = OptimizationConfig()
+    cache: CacheConfig = CacheConfig()
+    tracing: TracingConfig = TracingConfig()
+    stt: SttConfig = SttConfig()
+    fusion: FusionConfig = FusionConfig()
+
+
+def _read_yaml(path: str) -> Dict:
+    with open(path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def _build(cls, data: Dict):
+    """Instantiate a config dataclass from a YAML mapping"""
+    data = data or {}
+    values = {}
+    for f in fields(cls):
+        if f.name not in data:
+            continue
+        value = data[f.name]
+        if hasattr(f.type, '__dataclass_fields__'):
+            value = _build(f.type, value)
+        elif isinstance(value, list):
+            value = tuple(value)
+        elif isinstance(value, dict):
+            value = {key: tuple(item) if isinstance(item, list) else item for key, item in value.items()}
+        values[f.name] = value
+    return cls(**values)
+
+
+@lru_cache(maxsize=None)
+def load_config(settings_path: str = SETTINGS_PATH,
+                performance_path: str = PERFORMANCE_CONFIG_PATH,
+                model_path: str = MODEL_CONFIG_PATH) -> Config:
+    """Parse the three config files into a Config, once per process and paths"""
+    raw = {}
+    for path in (settings_path, performance_path, model_path):
+        raw.update(_read_yaml(path))
+    return _build(Config, raw)
+
+
+def get_config() -> Config:
+    """The Config for the default config files
+
+    Parsed on first call and shared afterwards; worker processes forked
+    later inherit it without reading the files again.
+    """
+    return load_config()
+
+
+def get_preview_tier(name: str) -> PreviewTier:
+    """The named preview quality tier from settings.yaml"""
+    tiers = get_config().preview.tiers
+    if name not in tiers:
+        raise ValueError(f"Unknown preview tier {name!r}; available: {sorted(tiers)}")
+    return _build(PreviewTier, tiers[name])
@@ -0,0 +1,290 @@
+# src/utils/file_handler.py
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+CATALOG_FILE = 'media_catalog.sqlite'
+
+# Catalog columns holding get_video_info fields; resolution is split into width and height
+_INFO_COLUMNS = ('duration', 'fps', 'width', 'height', 'frame_count', 'codec', 'bit_rate', 'size',
+                 'audio_codec', 'audio_channels', 'audio_sample_rate')
+_AUDIO_FIELDS = ('audio_codec', 'audio_channels', 'audio_sample_rate')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS media (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    probed_at REAL NOT NULL,
+    error TEXT,
+    duration REAL,
+    fps REAL,
+    width INTEGER,
+    height INTEGER,
+    frame_count INTEGER,
+    codec TEXT,
+    bit_rate INTEGER,
+    audio_codec TEXT,
+    audio_channels INTEGER,
+    audio_sample_rate INTEGER
+);
+CREATE INDEX IF NOT EXISTS media_codec ON media (codec);
+CREATE INDEX IF NOT EXISTS media_size ON media (size);
+'''
+
+_SIZE_UNITS = {'': 1, 'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30, 'TB': 1 << 40}
+
+
+def parse_size(text) -> int:
+    """Bytes in a size such as video.max_file_size ('2GB', '500 MB', 1024)"""
+    if isinstance(text, (int, float)):
+        return int(text)
+    match = re.fullmatch(r'\s*([\d.]+)\s*([KMGT]?B?)\s*', str(text).upper())
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def discover_media(source: str, supported_formats: Iterable[str] = None) -> List[str]:
+    """Video paths from a directory or a manifest
+
+    A manifest is a .json list (of paths or objects with a 'path' key), a
+    .jsonl file of such objects, or a text file with one path per line.
+    Relative paths are resolved against the manifest's directory.
+    """
+    if supported_formats is None:
+        from .config import get_config
+        supported_formats = get_config().video.supported_formats
+
+    supported_formats = tuple(extension.lower() for extension in supported_formats)
+    if os.path.isdir(source):
+        paths = []
+        for directory, _, files in os.walk(source):
+            paths.extend(os.path.join(directory, name) for name in sorted(files)
+                         if name.lower().endswith(supported_formats))
+        return sorted(paths)
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r') as f:
+        if source.endswith('.json'):
+            entries = json.load(f)
+        elif source.endswith('.jsonl'):
+            entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            entries = [line.strip() for line in f
+                       if line.strip() and not line.lstrip().startswith('#')]
+
+    paths = [entry['path'] if isinstance(entry, dict) else entry for entry in entries]
+    return [path if os.path.isabs(path) else os.path.join(base, path) for path in paths]
+
+
+class MediaCatalog:
+    """Persistent SQLite index of probed media files
+
+    One row per absolute path holds the get_video_info fields together with
+    the size and mtime the file had when it was probed. A row is fresh while
+    both are unchanged, so scanning a library again only probes new and
+    modified files. Files that failed to probe are remembered with their
+    error and retried once they change.
+
+    Every thread and process opens its own connection; the database runs in
+    WAL mode so batch workers can read and write it at the same time. With
+    enabled=False nothing is stored and every lookup misses.
+    """
+
+    _default = None
+
+    def __init__(self, path: str, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self._local = threading.local()
+        self._schema_ready = False
+
+    @classmethod
+    def default(cls) -> 'MediaCatalog':
+        """Process-wide catalog in the cache directory, following cache.enabled"""
+        if cls._default is None:
+            from .config import get_config
+
+            cache_config = get_config().cache
+            cls._default = cls(os.path.join(cache_config.cache_directory, CATALOG_FILE),
+                               cache_config.enabled)
+        return cls._default
+
+    def get(self, path: str) -> Optional[Dict]:
+        """Video info of path if its entry is fresh and probing succeeded, else None"""
+        if not self.enabled:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        row = self._connect().execute('SELECT * FROM media WHERE path = ?', (os.path.abspath(path),)).fetchone()
+        if row is None or not _is_fresh(row, stat) or row['error'] is not None:
+            return None
+        return _row_to_info(row, path)
+
+    def put(self, path: str, video_info: Dict = None, error: str = None, stat: os.stat_result = None):
+        """Record a probe result (or its error) for path as it is on disk now"""
+        if not self.enabled:
+            return
+        stat = stat or os.stat(path)
+        with self._connect() as connection:
+            connection.execute(_UPSERT, _info_to_row(path, stat, video_info, error))
+
+    def scan(self, paths: Iterable[str], max_workers: int = None) -> Dict[str, Dict]:
+        """Video info for many files, probing only those without a fresh entry
+
+        Fresh entries are read in one query per few hundred paths. The rest
+        are probed by up to max_workers concurrent ffprobe processes
+        (default: processing.max_parallel_workers) and written back in one
+        transaction.
+
+        Returns:
+            Dict[str, Dict]: Video info per path in input order; files that
+                are missing or fail to probe map to {'path', 'error'}
+        """
+        from ..core.video_processor import probe_media
+
+        paths = list(dict.fromkeys(paths))
+        results, stats, stale = {}, {}, []
+        for path in paths:
+            try:
+                stats[path] = os.stat(path)
+            except OSError as e:
+                results[path] = {'path': path, 'error': str(e)}
+
+        rows = self._lookup([path for path in paths if path in stats])
+        for path, stat in stats.items():
+            row = rows.get(os.path.abspath(path))
+            if row is not None and _is_fresh(row, stat):
+                results[path] = ({'path': path, 'error': row['error']} if row['error'] is not None
+                                 else _row_to_info(row, path))
+            else:
+                stale.append(path)
+
+        def probe(path: str) -> Dict:
+            try:
+                return probe_media(path)
+            except Exception as e:
+                return {'path': path, 'error': str(e)}
+
+        if stale:
+            if max_workers is None:
+                from .config import get_config
+                max_workers = get_config().processing.max_parallel_workers
+            # Each thread just waits on its ffprobe child, so threads bound the subprocesses
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                probed = dict(zip(stale, executor.map(probe, stale)))
+            results.update(probed)
+            if self.enabled:
+                with self._connect() as connection:
+                    connection.executemany(_UPSERT, [
+                        _info_to_row(path, stats[path], None if 'error' in info else info, info.get('error'))
+                        for path, info in probed.items()])
+
+        return {path: results[path] for path in paths}
+
+    def total_duration_by_codec(self) -> Dict[str, Dict]:
+        """{codec: {'files', 'duration'}} over every successfully probed file"""
+        if not self.enabled:
+            return {}
+        rows = self._connect().execute(
+            'SELECT codec, COUNT(*) AS files, SUM(duration) AS duration FROM media '
+            'WHERE error IS NULL GROUP BY codec ORDER BY duration DESC').fetchall()
+        return {row['codec']: {'files': row['files'], 'duration': row['duration'] or 0.0} for row in rows}
+
+    def files_over(self, max_size=None) -> List[Dict]:
+        """Catalogued files larger than max_size (default: video.max_file_size), largest first"""
+        if not self.enabled:
+            return []
+        if max_size is None:
+            from .config import get_config
+            max_size = get_config().video.max_file_size
+        rows = self._connect().execute('SELECT path, size, duration FROM media WHERE size > ? ORDER BY size DESC',
+                                       (parse_size(max_size),)).fetchall()
+        return [dict(row) for row in rows]
+
+    def prune(self) -> int:
+        """Drop entries of files that no longer exist; returns how many"""
+        if not self.enabled:
+            return 0
+        connection = self._connect()
+        missing = [(row['path'],) for row in connection.execute('SELECT path FROM media')
+                   if not os.path.exists(row['path'])]
+        with connection:
+            connection.executemany('DELETE FROM media WHERE path = ?', missing)
+        return len(missing)
+
+    def __len__(self) -> int:
+        if not self.enabled:
+            return 0
+        return self._connect().execute('SELECT COUNT(*) FROM media').fetchone()[0]
+
+    def _lookup(self, paths: List[str]) -> Dict[str, sqlite3.Row]:
+        if not self.enabled or not paths:
+            return {}
+        connection = self._connect()
+        rows = {}
+        keys = [os.path.abspath(path) for path in paths]
+        # Stay below SQLite's limit on bound parameters per statement
+        for first in range(0, len(keys), 500):
+            part = keys[first:first + 500]
+            query = f"SELECT * FROM media WHERE path IN ({','.join('?' * len(part))})"
+            rows.update((row['path'], row) for row in connection.execute(query, part))
+        return rows
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection, reopened after a fork"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        if not self._schema_ready:
+            connection.executescript(_SCHEMA)
+            self._schema_ready = True
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+
+_UPSERT = (f"INSERT OR REPLACE INTO media (path, mtime_ns, probed_at, error, {', '.join(_INFO_COLUMNS)}) "
+           f"VALUES ({', '.join('?' * (len(_INFO_COLUMNS) + 4))})")
+
+
+def _is_fresh(row: sqlite3.Row, stat: os.stat_result) -> bool:
+    return row['size'] == stat.st_size and row['mtime_ns'] == stat.st_mtime_ns
+
+
+def _info_to_row(path: str, stat: os.stat_result, video_info: Optional[Dict], error: Optional[str]) -> tuple:
+    info = dict(video_info or {})
+    width, height = info.get('resolution') or (None, None)
+    info.update(width=width, height=height, size=stat.st_size)
+    return (os.path.abspath(path), stat.st_mtime_ns, time.time(), error) + tuple(
+        info.get(column) for column in _INFO_COLUMNS)
+
+
+def _row_to_info(row: sqlite3.Row, path: str) -> Dict:
+    """The get_video_info dict stored in a catalog row"""
+    info = {
+        'duration': row['duration'],
+        'fps': row['fps'],
+        'resolution': (row['width'], row['height']),
+        'frame_count': row['frame_count'],
+        'codec': row['codec'],
+        'bit_rate': row['bit_rate'],
+        'size': row['size'],
+        'path': path
+    }
+    if row['audio_codec'] is not None:
+        info.update({field: row[field] for field in _AUDIO_FIELDS})
+    return info
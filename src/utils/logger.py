@@ -0,0 +1,323 @@
+# src/utils/logger.py
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict
+
+# Returned by span() while tracing is off, so a disabled span costs one check
+_NO_SPAN = nullcontext()
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module; configure_logging() decides where records go"""
+    return logging.getLogger(name)
+
+
+def configure_logging(level: int = logging.INFO):
+    """Send log records to stderr, once per process (used by the CLI)"""
+    root = logging.getLogger()
+    if not root.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT, '%H:%M:%S'))
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+class Tracer:
+    """Spans, counters and resource samples of one job, as Chrome trace events
+
+    Spans are complete ('X') events with perf_counter timestamps, which
+    share one monotonic clock across processes on the same machine, so
+    spans recorded in pool workers (see call_traced) merge straight into
+    the parent's timeline. While started, a background thread samples RSS
+    and CPU of this process and its children every sample_interval seconds.
+
+    Tracing is off until start(); span() then returns a shared no-op
+    context manager and count() returns immediately, so instrumented code
+    pays one attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.name = None
+        self._events = []
+        self._counters = Counter()
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+        self._started = None
+        self._resources = {}
+        self._process = None
+        self._memory = None
+
+    def start(self, name: str = None, sample_interval: float = None) -> 'Tracer':
+        """Clear earlier events and start recording
+
+        Args:
+            name (str): Job name shown as the process name in the trace
+            sample_interval (float): Seconds between resource samples
+                (default: tracing.sample_interval; 0 disables sampling)
+        """
+        if sample_interval is None:
+            from .config import get_config
+            sample_interval = get_config().tracing.sample_interval
+
+        self.stop()
+        self.reset()
+        self.name = name
+        self.enabled = True
+        self._started = time.perf_counter()
+        self._resources = {'peak_rss_mb': 0.0, 'peak_children_rss_mb': 0.0,
+                           'cpu_start': _cpu_times()}
+        if sample_interval:
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, args=(sample_interval,),
+                                             name='trace-sampler', daemon=True)
+            self._sampler.start()
+        return self
+
+    def stop(self) -> Dict:
+        """Stop recording and return summary()"""
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._sampler = None
+        if self.enabled:
+            self.sample()
+            self._resources['cpu_time'] = _cpu_times() - self._resources.pop('cpu_start')
+            self._resources['wall_time'] = time.perf_counter() - self._started
+        self.enabled = False
+        return self.summary()
+
+    def reset(self):
+        with self._lock:
+            self._events = []
+            self._counters = Counter()
+            self._threads = {}
+
+    def span(self, name: str, cat: str = 'stage', **args):
+        """Context manager timing the enclosed block as one span"""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, cat, args)
+
+    @contextmanager
+    def _span(self, name: str, cat: str, args: Dict):
+        started = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            args['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.record(name, started, time.perf_counter(), cat, args)
+
+    def record(self, name: str, start: float, end: float, cat: str = 'stage', args: Dict = None):
+        """Add a span measured elsewhere, with perf_counter() start and end times"""
+        if not self.enabled:
+            return
+        event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': start * 1e6, 'dur': (end - start) * 1e6,
+                 'pid': os.getpid(), 'tid': self._thread_id()}
+        if args:
+            event['args'] = args
+        with self._lock:
+            self._events.append(event)
+
+    def count(self, name: str, amount: float = 1):
+        """Add to a job counter, e.g. 'frames', 'segments' or 'bytes_read'"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] += amount
+
+    def gauge(self, name: str, **values: float):
+        """Record the current values of a time series, drawn as a counter track"""
+        if not self.enabled:
+            return
+        event = {'name': name, 'ph': 'C', 'ts': time.perf_counter() * 1e6, 'pid': os.getpid(), 'args': values}
+        with self._lock:
+            self._events.append(event)
+
+    def sample(self):
+        """Record one RSS/CPU sample of this process and its children"""
+        if not self.enabled:
+            return
+        import psutil
+
+        if self._process is None or self._process.pid != os.getpid():
+            from .memory_manager import MemoryManager
+            # cpu_percent() measures since the previous call on the same object
+            self._process = psutil.Process()
+            self._memory = MemoryManager()
+        process = self._process
+        rss = process.memory_info().rss / (1024 * 1024)
+        children_rss = 0.0
+        for child in process.children(recursive=True):
+            try:
+                children_rss += child.memory_info().rss / (1024 * 1024)
+            except psutil.Error:
+                continue
+        system = self._memory.monitor_memory_usage()
+        self.gauge('memory', rss_mb=rss, children_rss_mb=children_rss,
+                   system_used_percent=system['used_percent'])
+        self.gauge('cpu', percent=process.cpu_percent())
+        self._resources['peak_rss_mb'] = max(self._resources.get('peak_rss_mb', 0.0), rss)
+        self._resources['peak_children_rss_mb'] = max(self._resources.get('peak_children_rss_mb', 0.0),
+                                                      children_rss)
+
+    def drain(self) -> Dict:
+        """Events and counters recorded so far, removed from this tracer (for merge())"""
+        with self._lock:
+            payload = {'events': self._events, 'counters': dict(self._counters),
+                       'threads': self._threads}
+            self._events, self._counters, self._threads = [], Counter(), {}
+        return payload
+
+    def merge(self, payload: Dict):
+        """Add what another process's tracer drained, e.g. a pool worker's"""
+        if not self.enabled or not payload:
+            return
+        with self._lock:
+            self._events.extend(payload['events'])
+            self._counters.update(payload['counters'])
+            self._threads.update(payload['threads'])
+
+    def summary(self) -> Dict:
+        """Per-job totals: span durations by name, counters and resource peaks
+
+        Returns:
+            Dict: 'spans' ({name: {'count', 'total', 'max'}} in seconds),
+                'counters', 'wall_time', 'cpu_time' (this process and its
+                reaped children), 'peak_rss_mb' and 'peak_children_rss_mb'
+        """
+        spans = {}
+        with self._lock:
+            events, counters = list(self._events), dict(self._counters)
+        for event in events:
+            if event['ph'] != 'X':
+                continue
+            entry = spans.setdefault(event['name'], {'count': 0, 'total': 0.0, 'max': 0.0})
+            seconds = event['dur'] / 1e6
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+        resources = {key: value for key, value in self._resources.items() if key != 'cpu_start'}
+        return dict(resources, name=self.name, spans=spans, counters=counters)
+
+    def chrome_trace(self) -> Dict:
+        """The recorded events in Chrome's trace-event format (chrome://tracing, Perfetto)"""
+        with self._lock:
+            events, threads = list(self._events), dict(self._threads)
+        pids = {event['pid'] for event in events}
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid,
+                     'args': {'name': f"{self.name or 'job'}" if pid == os.getpid() else f"worker {pid}"}}
+                    for pid in sorted(pids)]
+        metadata += [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                     for (pid, tid), name in threads.items()]
+        return {'traceEvents': metadata + events, 'displayTimeUnit': 'ms',
+                'otherData': {'summary': self.summary()}}
+
+    def write_chrome_trace(self, path: str) -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        os.replace(tmp_path, path)
+        return path
+
+    def _thread_id(self) -> int:
+        tid = threading.get_native_id()
+        key = (os.getpid(), tid)
+        if key not in self._threads:
+            with self._lock:
+                self._threads[key] = threading.current_thread().name
+        return tid
+
+    def _sample_loop(self, interval: float):
+        while not self._stop_sampling.wait(interval):
+            try:
+                self.sample()
+            except Exception:
+                # A failed sample only leaves a gap in the counters
+                continue
+
+
+def _cpu_times() -> float:
+    import resource
+
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+_tracer = Tracer()
+
+
+def _after_fork_in_child():
+    # The sampler thread, which may have held the lock, does not exist in the child
+    _tracer._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=lambda: _tracer._lock.acquire(), after_in_parent=lambda: _tracer._lock.release(),
+                        after_in_child=_after_fork_in_child)
+
+
+def get_tracer() -> Tracer:
+    """The tracer shared by everything in this process"""
+    return _tracer
+
+
+def span(name: str, cat: str = 'stage', **args):
+    """Time a block as a span of the process tracer; a no-op while tracing is off"""
+    if not _tracer.enabled:
+        return _NO_SPAN
+    return _tracer._span(name, cat, args)
+
+
+def count(name: str, amount: float = 1):
+    """Add to a counter of the process tracer; a no-op while tracing is off"""
+    if _tracer.enabled:
+        _tracer.count(name, amount)
+
+
+def traced(name: str = None, cat: str = 'stage') -> Callable:
+    """Decorator recording every call of a function as a span"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _tracer._span(span_name, cat, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def call_traced(func: Callable, name: str, kwargs: Dict[str, Any]):
+    """Run func(**kwargs) in a pool worker under a '<name>.worker' span and return (result, trace)
+
+    Submitted in place of func by the pipeline scheduler while tracing is on;
+    the parent passes the trace to Tracer.merge(). Events a forked worker
+    inherited from its parent are dropped first, so nothing is merged twice.
+    """
+    tracer = get_tracer()
+    tracer.reset()
+    tracer.enabled = True
+    try:
+        with tracer._span(f"{name}.worker", 'worker', {}):
+            result = func(**kwargs)
+        tracer.sample()
+        return result, tracer.drain()
+    finally:
+        tracer.enabled = False
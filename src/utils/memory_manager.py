@@ -1,28 +1,310 @@
 # src/utils/memory_manager.py
 import gc
+import os
+import sys
+import threading
+import time
 import psutil
 import numpy as np
-from typing import Generator, Any
+from typing import Any, Callable, Dict, Generator
+from .logger import count, get_logger, get_tracer
+
+logger = get_logger(__name__)
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+class MemoryPressureController:
+    """Backpressure and adaptive batch sizes driven by live memory usage
+
+    Pressure is memory in use relative to the limit: system memory used
+    over limit (processing.memory_limit), or the RSS of this process and
+    its children over process_limit_mb when that is set, whichever is
+    higher. 1.0 means the limit is reached. Producers call
+    wait_for_headroom() before each batch or chunk, which holds them back
+    while pressure is at or over 1, and adjust() between batches, which
+    halves a batch or chunk size once pressure passes SHRINK_AT and grows
+    it by a quarter again below GROW_AT. may_start_job() keeps new jobs
+    from starting while memory is tight.
+
+    System memory can be held by other programs, which no amount of waiting
+    frees. Once a wait times out, wait_for_headroom() therefore stops
+    holding producers back until pressure has fallen below SHRINK_AT;
+    smaller batches and fewer concurrent jobs still apply meanwhile.
+
+    Args:
+        limit (float): Fraction of system memory jobs may use
+            (default: processing.memory_limit)
+        process_limit_mb (float): RSS budget of this process and its
+            children in MB, if any
+        memory_source (Callable): Returns {'system_used': fraction of system
+            memory in use, 'process_mb': RSS of this process tree in MB,
+            only read when process_limit_mb is set}; reads psutil by
+            default, pass a simulated source to test the controller
+        poll_interval (float): Seconds between checks while holding back
+        max_wait (float): Longest one producer is held back before it
+            continues anyway; after that, waits are off until pressure
+            falls below SHRINK_AT
+    """
+
+    SHRINK_AT = 0.9
+    GROW_AT = 0.7
+
+    def __init__(self, limit: float = None, process_limit_mb: float = None,
+                 memory_source: Callable[[], Dict[str, float]] = None,
+                 poll_interval: float = 0.2, max_wait: float = 30.0):
+        if limit is None:
+            from .config import get_config
+            limit = get_config().processing.memory_limit
+        self.limit = limit
+        self.process_limit_mb = process_limit_mb
+        # Walking the child processes is only worth it when their RSS is budgeted
+        self.memory_source = memory_source or (_process_tree_memory if process_limit_mb else _system_memory)
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        # Set by a timed-out wait, cleared once pressure falls below SHRINK_AT
+        self._waits_off = False
+        self._stats = {'waits': 0, 'wait_time': 0.0, 'timeouts': 0, 'skipped_waits': 0, 'shrinks': 0,
+                       'grows': 0, 'peak_pressure': 0.0}
+
+    def pressure(self) -> float:
+        """Current memory use relative to the limit (1.0 = at the limit)"""
+        usage = self.memory_source()
+        pressure = usage['system_used'] / self.limit
+        if self.process_limit_mb:
+            pressure = max(pressure, usage['process_mb'] / self.process_limit_mb)
+        with self._lock:
+            self._stats['peak_pressure'] = max(self._stats['peak_pressure'], pressure)
+        return pressure
+
+    def wait_for_headroom(self) -> float:
+        """Block while memory is at the limit; returns the seconds spent waiting"""
+        pressure = self.pressure()
+        with self._lock:
+            if self._waits_off and pressure < self.SHRINK_AT:
+                self._waits_off = False
+            if pressure >= 1.0 and self._waits_off:
+                self._stats['skipped_waits'] += 1
+                return 0.0
+        if pressure < 1.0:
+            return 0.0
+
+        started = time.perf_counter()
+        # Unreferenced buffers may be all that is holding the memory
+        gc.collect()
+        timed_out = False
+        while pressure >= 1.0:
+            if time.perf_counter() - started >= self.max_wait:
+                timed_out = True
+                logger.warning(f"Memory still at {pressure:.0%} of the limit after {self.max_wait:g} s; "
+                               f"not waiting again until it falls below {self.SHRINK_AT:.0%}")
+                break
+            time.sleep(self.poll_interval)
+            pressure = self.pressure()
+
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._stats['waits'] += 1
+            self._stats['wait_time'] += waited
+            self._stats['timeouts'] += timed_out
+            self._waits_off = self._waits_off or timed_out
+        count('backpressure_waits')
+        count('backpressure_seconds', waited)
+        get_tracer().gauge('memory_pressure', pressure=pressure)
+        return waited
+
+    def adjust(self, size, minimum=1, maximum=None):
+        """Next batch or chunk size: halved under pressure, grown by a quarter with headroom
+
+        Works for item counts (ints stay ints) and durations alike; the
+        result stays within [minimum, maximum].
+        """
+        pressure = self.pressure()
+        if pressure >= self.SHRINK_AT:
+            new_size = size / 2
+            stat = 'shrinks'
+        elif pressure < self.GROW_AT and (maximum is None or size < maximum):
+            new_size = size * 1.25
+            stat = 'grows'
+        else:
+            return size
+
+        if isinstance(size, int):
+            new_size = int(new_size) if stat == 'shrinks' else max(size + 1, int(new_size))
+        new_size = max(minimum, new_size)
+        if maximum is not None:
+            new_size = min(maximum, new_size)
+        if new_size != size:
+            with self._lock:
+                self._stats[stat] += 1
+        return new_size
+
+    def may_start_job(self, running: int) -> bool:
+        """Whether another job may start next to the running ones
+
+        One job always may, so a batch never stalls; more only while
+        pressure is below SHRINK_AT.
+        """
+        return running == 0 or self.pressure() < self.SHRINK_AT
+
+    def stats(self) -> Dict:
+        """Waits, time held back, size changes and the highest pressure seen"""
+        with self._lock:
+            return dict(self._stats)
+
+
+def _system_memory() -> Dict[str, float]:
+    return {'system_used': psutil.virtual_memory().percent / 100}
+
+
+def _process_tree_memory() -> Dict[str, float]:
+    process = psutil.Process()
+    rss = process.memory_info().rss
+    # Children include ffmpeg decoders and pool workers started by this job
+    for child in process.children(recursive=True):
+        try:
+            rss += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return {'system_used': psutil.virtual_memory().percent / 100, 'process_mb': rss / (1024 * 1024)}
+
+
+def _before_fork():
+    _controller_lock.acquire()
+    if _controller is not None:
+        _controller._lock.acquire()
+
+
+def _after_fork_in_parent():
+    if _controller is not None:
+        _controller._lock.release()
+    _controller_lock.release()
+
+
+def _after_fork_in_child():
+    global _controller_lock
+    _controller_lock = threading.Lock()
+    if _controller is not None:
+        _controller._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
+
+
+def get_memory_controller() -> MemoryPressureController:
+    """The controller shared by every producer in this process
+
+    Created on first use with the processing.memory_limit budget.
+    """
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = MemoryPressureController()
+        return _controller
+
 
 class MemoryManager:
-    def __init__(self, max_memory_usage: float = 0.8):
+    # Chunks never shrink below this many seconds under memory pressure
+    MIN_CHUNK_SECONDS = 5.0
+
+    def __init__(self, max_memory_usage: float = 0.8, controller: MemoryPressureController = None):
         self.max_memory_usage = max_memory_usage
         self.total_memory = psutil.virtual_memory().total
+        self._controller = controller
+
+    @property
+    def controller(self) -> MemoryPressureController:
+        """Controller enforcing max_memory_usage, created on first use"""
+        if self._controller is None:
+            self._controller = MemoryPressureController(limit=self.max_memory_usage)
+        return self._controller
+
+    def chunk_video_processing(self, video_path: str, chunk_duration: int = 60,
+                               interval: float = None) -> Generator[Dict[str, Any], None, None]:
+        """Process video in memory-efficient chunks
+
+        Walks the video in consecutive time chunks, each with its audio and
+        sampled frames, so only one chunk is held in memory at a time. The
+        audio is extracted once into the memory-mapped AudioBuffer and
+        sliced per chunk; frames come from one sequential decoder and are
+        split at chunk boundaries. Before each chunk the controller holds
+        back while memory is at the limit, and the next chunk is shortened
+        under pressure (down to MIN_CHUNK_SECONDS) and lengthened again, up
+        to chunk_duration, once there is headroom.
+
+        Args:
+            video_path (str): Video to walk
+            chunk_duration (int): Longest chunk in seconds
+            interval (float): Seconds between sampled frames
+                (default: optimization.frame_extraction_interval)
+
+        Yields:
+            Dict: 'index', 'start', 'end', 'audio' (float32 samples of the
+                chunk), 'sample_rate', 'timestamps' and 'frames' (an
+                (n, h, w, 3) array, or None when no frame falls in the chunk)
+        """
+        from ..core.video_processor import VideoProcessor
+        from .config import get_config
+
+        if interval is None:
+            interval = get_config().optimization.frame_extraction_interval
+        processor = VideoProcessor(video_path)
+        duration = processor.get_video_info()['duration']
+        processor.extract_audio()
+        audio = processor.audio_buffer
+        frames = processor.iter_frames(interval)
+
+        pending = next(frames, None)
+        start = 0.0
+        length = float(chunk_duration)
+        index = 0
+        while start < duration:
+            self.controller.wait_for_headroom()
+            length = self.controller.adjust(length, min(self.MIN_CHUNK_SECONDS, chunk_duration), chunk_duration)
+            end = min(start + length, duration)
+            last_chunk = end >= duration
+
+            timestamps, chunk_frames = [], []
+            while pending is not None and (last_chunk or pending[0] < end):
+                timestamps.append(pending[0])
+                chunk_frames.append(pending[1])
+                pending = next(frames, None)
+
+            yield {
+                'index': index,
+                'start': start,
+                'end': end,
+                'audio': audio.to_float(int(start * audio.sample_rate), int(end * audio.sample_rate)),
+                'sample_rate': audio.sample_rate,
+                'timestamps': np.asarray(timestamps),
+                'frames': np.stack(chunk_frames) if chunk_frames else None
+            }
+            start = end
+            index += 1
+
+    def memory_efficient_frame_extraction(self, video_path: str, interval: float = 1.0,
+                                          batch_size: int = None) -> Generator[np.ndarray, None, None]:
+        """Extract frames without loading entire video into memory
         
-    def chunk_video_processing(self, video_path: str, chunk_duration: int = 60) -> Generator:
-        """Process video in memory-efficient chunks"""
-        # Implementation for chunked processing
-        pass
-    
-    def memory_efficient_frame_extraction(self, video_path: str) -> Generator[np.ndarray, None, None]:
-        """Extract frames without loading entire video into memory"""
-        # Implementation here
-        pass
+        Yields single RGB frames, or stacked (n, h, w, 3) batches when
+        batch_size is set. Frames are decoded sequentially, so only the
+        frame or batch currently being yielded is held in memory.
+        """
+        from ..core.video_processor import VideoProcessor
+        
+        for _, frames in VideoProcessor(video_path).iter_frames(interval, batch_size=batch_size):
+            yield frames
     
     def cleanup_memory(self):
         """Force garbage collection and memory cleanup"""
         gc.collect()
-        if hasattr(torch, 'cuda') and torch.cuda.is_available():
+        # Only a process that already uses torch can have CUDA memory to free
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
             torch.cuda.empty_cache()
     
     def monitor_memory_usage(self) -> Dict[str, float]:
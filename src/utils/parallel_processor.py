@@ -1,13 +1,17 @@
 # src/utils/parallel_processor.py
 import multiprocessing as mp
-import torch
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
-from typing import List, Callable, Any
+from typing import Any, Callable, Dict, List
 
 class ParallelProcessor:
     def __init__(self, max_workers: int = None):
         self.max_workers = max_workers or mp.cpu_count()
-        self.use_gpu = torch.cuda.is_available()
+    
+    @property
+    def use_gpu(self) -> bool:
+        # Checked on demand so constructing the processor does not import torch
+        from .performance_optimizer import gpu_available
+        return gpu_available()
     
     def process_video_chunks(self, video_chunks: List, process_func: Callable) -> List[Any]:
         """Process video chunks in parallel"""
@@ -16,16 +20,26 @@ class ParallelProcessor:
         return results
     
     def async_multimodal_processing(self, audio_path: str, video_path: str) -> Dict:
-        """Process audio, video, and text extraction simultaneously"""
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit all tasks
-            audio_future = executor.submit(self._process_audio, audio_path)
-            video_future = executor.submit(self._process_video, video_path)
-            transcript_future = executor.submit(self._process_transcript, audio_path)
-            
-            # Collect results
-            return {
-                'audio': audio_future.result(),
-                'video': video_future.result(),
-                'transcript': transcript_future.result()
-            }
+        """Process audio, video, and text extraction simultaneously
+
+        Runs the stage DAG from src/core/pipeline.py: frames stream into
+        keyframe selection while they are decoded, audio analysis and
+        transcription run in worker processes, and fusion starts as soon as
+        its three inputs exist. When audio_path is given it is analyzed and
+        transcribed directly instead of extracting audio from the video.
+        """
+        from ..core.pipeline import build_video_pipeline
+
+        scheduler = build_video_pipeline(max_processes=self.max_workers)
+        initial = {'video_path': video_path}
+        if audio_path:
+            initial['audio'] = audio_path
+
+        results = scheduler.run(initial, targets=['fusion'])
+        return {
+            'audio': results['audio_analysis'],
+            'video': results['keyframes'],
+            'transcript': results['transcript'],
+            'fusion': results['fusion'],
+            'timings': scheduler.timings
+        }
@@ -1,17 +1,48 @@
 # src/utils/performance_optimizer.py
-import torch
 import psutil
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator
+
+
+@lru_cache(maxsize=None)
+def gpu_available() -> bool:
+    """Whether CUDA can be used, importing torch only on the first call
+    
+    False when GPU use is disabled in processing.gpu_enabled or torch is
+    not installed.
+    """
+    from .config import get_config
+    
+    if not get_config().processing.gpu_enabled:
+        return False
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
 
 class ProcessingOptimizer:
-    def __init__(self):
-        self.use_gpu = torch.cuda.is_available()
-        self.gpu_memory = torch.cuda.get_device_properties(0).total_memory if self.use_gpu else 0
+    """Hardware-dependent batch sizing and execution of batched work
+
+    The batch size picked at startup from free RAM or GPU memory is only the
+    ceiling: next_batch_size() shrinks and regrows it between batches with
+    the process-wide MemoryPressureController, and both execution paths
+    hold back new work while memory is at processing.memory_limit.
+    """
+
+    def __init__(self, controller=None):
+        from .memory_manager import get_memory_controller
+
+        self.use_gpu = gpu_available()
+        self.gpu_memory = _gpu_memory() if self.use_gpu else 0
         self.cpu_count = psutil.cpu_count()
         self.available_memory = psutil.virtual_memory().available
+        self.controller = controller or get_memory_controller()
         
         # Dynamic batch size based on hardware
-        self.batch_size = self._calculate_optimal_batch_size()
+        self.max_batch_size = self._calculate_optimal_batch_size()
+        self.batch_size = self.max_batch_size
     
     def _calculate_optimal_batch_size(self) -> int:
         """Calculate optimal batch size based on available hardware"""
@@ -24,19 +55,60 @@ class ProcessingOptimizer:
             memory_gb = self.available_memory / (1024**3)
             return min(32, max(4, int(memory_gb * 2)))
     
-    def optimize_processing(self, data_loader):
-        """Optimize processing based on hardware capabilities"""
+    def next_batch_size(self) -> int:
+        """Batch size for the next batch, adapted to the current memory pressure"""
+        self.batch_size = self.controller.adjust(self.batch_size, 1, self.max_batch_size)
+        return self.batch_size
+    
+    def optimize_processing(self, data_loader: Iterable, process_func: Callable) -> Iterator:
+        """Optimize processing based on hardware capabilities
+        
+        Applies process_func to every item of data_loader (e.g. the chunks
+        of MemoryManager.chunk_video_processing) and yields the results in
+        input order.
+        """
         if self.use_gpu:
-            return self.gpu_accelerated_processing(data_loader)
+            return self.gpu_accelerated_processing(data_loader, process_func)
         else:
-            return self.cpu_optimized_processing(data_loader)
+            return self.cpu_optimized_processing(data_loader, process_func)
     
-    def gpu_accelerated_processing(self, data_loader):
-        """GPU-optimized processing"""
-        # Implementation with CUDA optimizations
-        pass
+    def gpu_accelerated_processing(self, data_loader: Iterable, process_func: Callable) -> Iterator:
+        """GPU-optimized processing
+        
+        Items run one after another in this process, which owns the CUDA
+        context; the next item is only loaded once memory allows.
+        """
+        for item in data_loader:
+            self.controller.wait_for_headroom()
+            yield process_func(item)
     
-    def cpu_optimized_processing(self, data_loader):
-        """CPU-optimized processing with multiprocessing"""
-        # Implementation with CPU optimizations
-        pass
+    def cpu_optimized_processing(self, data_loader: Iterable, process_func: Callable) -> Iterator:
+        """CPU-optimized processing with multiprocessing
+        
+        Items are sent to a process pool (one worker per CPU) as they come
+        out of data_loader, with at most twice as many in flight as there
+        are workers. Before taking the next item the loader waits for memory
+        headroom, and the in-flight window shrinks under pressure, so a fast
+        loader cannot queue the whole input in memory. process_func must be
+        picklable.
+        """
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        
+        max_in_flight = 2 * self.cpu_count
+        window = max_in_flight
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=self.cpu_count) as executor:
+            for item in data_loader:
+                in_flight.append(executor.submit(process_func, item))
+                window = self.controller.adjust(window, 1, max_in_flight)
+                while len(in_flight) >= window:
+                    yield in_flight.popleft().result()
+                self.controller.wait_for_headroom()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+
+def _gpu_memory() -> int:
+    import torch
+    return torch.cuda.get_device_properties(0).total_memory
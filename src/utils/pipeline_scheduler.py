@@ -0,0 +1,358 @@
+# src/utils/pipeline_scheduler.py
+import multiprocessing as mp
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+from .logger import call_traced, get_tracer
+
+# Marks the end of a stream in a consumer queue
+_END_OF_STREAM = object()
+
+# Start method for pools that cannot fork (see PipelineScheduler._start_pool)
+_POOL_START_METHOD = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+
+
+class Stage:
+    """One step of a pipeline DAG
+
+    Args:
+        name (str): Unique stage name
+        func (Callable): Called with one keyword argument per input
+        inputs (Sequence[str]): Names of the artifacts the stage needs
+        output (str): Name of the artifact it produces (default: the stage name)
+        executor (str): 'thread' for I/O-bound or GIL-releasing work, 'process'
+            for CPU-bound work; process stages need a picklable func and inputs
+        streaming (bool): func returns an iterator whose items are passed to
+            stream consumers while it is still running
+        stream_inputs (Sequence[str]): Inputs produced by streaming stages that
+            this stage consumes as an iterator instead of a finished list
+        models (Sequence[str]): Model registry names the stage uses; for
+            process stages they are loaded before the pool starts, so
+            forked workers share them (see PipelineScheduler._start_pool)
+    """
+
+    def __init__(self, name: str, func: Callable, inputs: Sequence[str] = (),
+                 output: str = None, executor: str = 'thread', streaming: bool = False,
+                 stream_inputs: Sequence[str] = (), models: Sequence[str] = ()):
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor for stage {name}: {executor}")
+        if executor == 'process' and (streaming or stream_inputs):
+            raise ValueError(f"Stage {name} streams data and must run in a thread")
+        if not set(stream_inputs) <= set(inputs):
+            raise ValueError(f"Stage {name} streams inputs it does not declare")
+
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.output = output or name
+        self.executor = executor
+        self.streaming = streaming
+        self.stream_inputs = tuple(stream_inputs)
+        self.models = tuple(models)
+
+
+class PipelineScheduler:
+    """Run a DAG of stages with overlapping execution
+
+    Every stage gets a driver thread that starts it as soon as its inputs are
+    ready. CPU-bound stages are submitted to a shared process pool, the rest
+    run directly in their thread. Streaming stages hand their items to each
+    stream consumer through a bounded queue, so a consumer works on early
+    items while the producer is still decoding later ones, and a slow
+    consumer throttles the producer instead of letting items pile up. With
+    enough overlap the wall-clock time of a run approaches the time of its
+    slowest stage rather than the sum of all stages.
+
+    While the process tracer is on (src/utils/logger.py) every stage is
+    recorded as a span, and process stages bring back the spans and counters
+    of the worker that ran them.
+    """
+
+    def __init__(self, stages: Iterable[Stage], max_processes: int = None, queue_size: int = 4):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+
+        if max_processes is None:
+            from .config import get_config
+            max_processes = get_config().processing.max_parallel_workers
+        self.max_processes = max_processes
+        self.queue_size = queue_size
+        self.producers = {stage.output: stage for stage in self.stages.values()}
+        self.timings = {}
+        self._validate()
+
+    def run(self, initial: Dict[str, Any] = None, targets: Sequence[str] = None,
+            on_stage_complete: Callable[[Stage, Any], None] = None) -> Dict[str, Any]:
+        """Execute the stages needed for targets and return all artifacts
+
+        Args:
+            initial (Dict[str, Any]): Artifacts that are already available;
+                stages producing them are skipped
+            targets (Sequence[str]): Artifacts wanted (default: every stage output)
+            on_stage_complete (Callable): Called from the stage's driver thread
+                with the stage and its output as soon as the stage finishes,
+                e.g. to checkpoint it
+
+        Returns:
+            Dict[str, Any]: Initial and produced artifacts by name. Artifacts of
+                streaming stages are only included if a non-streaming stage
+                needed them as a list.
+        """
+        artifacts = dict(initial or {})
+        stages = self._needed_stages(targets, artifacts)
+        self.timings = {}
+
+        ready = {name: threading.Event()
+                 for stage in self.stages.values() for name in (stage.output,) + stage.inputs}
+        for name in artifacts:
+            if name in ready:
+                ready[name].set()
+
+        # One bounded queue per (stream, consumer) pair
+        streams = {}
+        for stage in stages:
+            for name in stage.stream_inputs:
+                streams.setdefault(name, {})[stage.name] = queue.Queue(self.queue_size)
+
+        state = {'error': None}
+        lock = threading.Lock()
+        tracer = get_tracer()
+        uses_processes = any(stage.executor == 'process' for stage in stages)
+        pool = self._start_pool(stages) if uses_processes else None
+
+        def fail(error: BaseException):
+            with lock:
+                if state['error'] is None:
+                    state['error'] = error
+            # Wake everything that may be waiting on an artifact
+            for event in ready.values():
+                event.set()
+
+        def wait_for(name: str) -> bool:
+            ready[name].wait()
+            return state['error'] is None
+
+        def put(q: queue.Queue, item) -> bool:
+            while state['error'] is None:
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def drive(stage: Stage):
+            try:
+                kwargs = {}
+                for name in stage.inputs:
+                    if name in stage.stream_inputs:
+                        kwargs[name] = _iterate_queue(streams[name][stage.name], lambda: state['error'])
+                    elif not wait_for(name):
+                        return
+                    else:
+                        kwargs[name] = artifacts[name]
+
+                started = time.perf_counter()
+                if stage.executor == 'process' and tracer.enabled:
+                    result, trace = pool.submit(call_traced, stage.func, stage.name, kwargs).result()
+                    tracer.merge(trace)
+                elif stage.executor == 'process':
+                    result = pool.submit(stage.func, **kwargs).result()
+                else:
+                    result = stage.func(**kwargs)
+
+                if stage.streaming:
+                    result = self._pump(stage, result, streams.get(stage.output, {}), put,
+                                        collect=self._collect_stream(stage, stages, targets))
+                # After a failure elsewhere, streams end early and results may be partial
+                if state['error'] is not None:
+                    return
+
+                ended = time.perf_counter()
+                self.timings[stage.name] = {'start': started, 'end': ended, 'duration': ended - started}
+                tracer.record(stage.name, started, ended, 'stage', {'executor': stage.executor})
+                artifacts[stage.output] = result
+                if on_stage_complete is not None:
+                    on_stage_complete(stage, result)
+                ready[stage.output].set()
+            except BaseException as e:
+                fail(e)
+                # Let stream consumers of this stage see the failure
+                for q in streams.get(stage.output, {}).values():
+                    try:
+                        q.put_nowait(_END_OF_STREAM)
+                    except queue.Full:
+                        pass
+
+        threads = [threading.Thread(target=drive, args=(stage,), name=f"stage-{stage.name}", daemon=True)
+                   for stage in stages]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        if state['error'] is not None:
+            raise state['error']
+        return artifacts
+
+    def _start_pool(self, stages: List[Stage]) -> ProcessPoolExecutor:
+        """Process pool for one run
+
+        The models declared by the process stages are loaded here first,
+        and the workers are forked from this thread before any driver
+        thread exists, so they inherit the models copy-on-write instead of
+        each holding a copy. Locks of the registry, tracer and memory
+        controller are taken around the fork, so no other thread can leave
+        one held in a worker.
+
+        CUDA state does not survive a fork: once a model has initialized
+        CUDA in this process (or where fork is missing), workers are started
+        with forkserver or spawn instead and load the models into their own
+        registry as they start. The first one is started right away, so it
+        loads them while the inputs of the process stages are still being
+        produced.
+        """
+        models = list(dict.fromkeys(name for stage in stages if stage.executor == 'process'
+                                    for name in stage.models))
+        if models:
+            from ..models.registry import get_registry
+            get_registry().warm_up(models)
+
+        if 'fork' in mp.get_all_start_methods() and not _cuda_initialized():
+            pool = ProcessPoolExecutor(max_workers=self.max_processes, mp_context=mp.get_context('fork'))
+            # With fork, the first submit starts every worker of the pool
+            pool.submit(int).result()
+            return pool
+
+        pool = ProcessPoolExecutor(max_workers=self.max_processes, mp_context=mp.get_context(_POOL_START_METHOD),
+                                   initializer=_load_models, initargs=(models,))
+        pool.submit(int)
+        return pool
+
+    @staticmethod
+    def _pump(stage: Stage, items, consumers: Dict[str, queue.Queue], put, collect: bool):
+        """Drain a streaming stage's iterator into its consumer queues"""
+        collected = [] if collect else None
+        for item in items:
+            for q in consumers.values():
+                if not put(q, item):
+                    return collected
+            if collect:
+                collected.append(item)
+        for q in consumers.values():
+            put(q, _END_OF_STREAM)
+        return collected
+
+    def _collect_stream(self, producer: Stage, stages: List[Stage], targets) -> bool:
+        """Whether anyone needs a streaming stage's items as a finished list"""
+        if targets is not None and producer.output in targets:
+            return True
+        return any(producer.output in stage.inputs and producer.output not in stage.stream_inputs
+                   for stage in stages)
+
+    def _needed_stages(self, targets, available: Dict) -> List[Stage]:
+        """Stages required for targets, skipping those whose output is available"""
+        if targets is None:
+            targets = [stage.output for stage in self.stages.values()]
+
+        needed = {}
+        pending = [name for name in targets if name not in available]
+        while pending:
+            name = pending.pop()
+            if name in available:
+                continue
+            if name not in self.producers:
+                raise ValueError(f"No stage produces '{name}' and it was not provided")
+            stage = self.producers[name]
+            if stage.name in needed:
+                continue
+            needed[stage.name] = stage
+            pending.extend(stage.inputs)
+        return [stage for stage in self.stages.values() if stage.name in needed]
+
+    def _validate(self):
+        """Reject duplicate outputs, cycles and stream edges that could deadlock"""
+        if len(self.producers) != len(self.stages):
+            raise ValueError("Two stages produce the same artifact")
+
+        for stage in self.stages.values():
+            for name in stage.stream_inputs:
+                producer = self.producers.get(name)
+                if producer is None or not producer.streaming:
+                    raise ValueError(f"Stage {stage.name} streams '{name}', which is not a streaming output")
+
+        ancestors = {}
+
+        def ancestors_of(stage: Stage, path=()) -> set:
+            if stage.name in path:
+                raise ValueError(f"Pipeline has a cycle through stage {stage.name}")
+            if stage.name not in ancestors:
+                found = set()
+                for name in stage.inputs:
+                    producer = self.producers.get(name)
+                    if producer is not None:
+                        found.add(producer.name)
+                        found |= ancestors_of(producer, path + (stage.name,))
+                ancestors[stage.name] = found
+            return ancestors[stage.name]
+
+        for stage in self.stages.values():
+            ancestors_of(stage)
+
+        # A stream consumer must not wait on something downstream of its own
+        # stream: the producer would block on the full queue and never finish
+        for stage in self.stages.values():
+            for name in stage.stream_inputs:
+                producer = self.producers[name]
+                for other in stage.inputs:
+                    upstream = self.producers.get(other)
+                    if other in stage.stream_inputs or upstream is None:
+                        continue
+                    if producer.name in ancestors[upstream.name]:
+                        raise ValueError(
+                            f"Stage {stage.name} streams '{name}' but also waits on '{other}', "
+                            f"which depends on the same stream")
+
+
+def _cuda_initialized() -> bool:
+    """Whether this process holds CUDA state, which a forked child could not use"""
+    torch = sys.modules.get('torch')
+    return torch is not None and torch.cuda.is_initialized()
+
+
+def _load_models(names: List[str]):
+    """Pool worker initializer: load the models its stages will use"""
+    if not names:
+        return
+    from ..models.registry import get_registry
+
+    for name in names:
+        try:
+            get_registry().get(name)
+        except Exception:
+            # Raised again, with its own traceback, by the stage that needs the model
+            continue
+
+
+def _iterate_queue(q: queue.Queue, error: Callable):
+    """Yield items from a stream queue until the end marker or a pipeline failure"""
+    while True:
+        try:
+            item = q.get(timeout=0.1)
+        except queue.Empty:
+            if error() is not None:
+                return
+            continue
+        if item is _END_OF_STREAM:
+            return
+        yield item
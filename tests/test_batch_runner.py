@@ -0,0 +1,65 @@
+# tests/test_batch_runner.py
+import pytest
+
+from src.core import pipeline
+from src.utils import cache
+from src.utils.batch_runner import CheckpointStore, summarize_video
+from src.utils.pipeline_scheduler import PipelineScheduler, Stage
+
+
+class StandInCache:
+    def file_digest(self, path):
+        return 'c0ffee' * 4
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Arguments of every pipeline built by summarize_video, with a stand-in pipeline"""
+    built = []
+
+    def build(frame_interval=None, include_export=False, max_processes=None, export_components=None,
+              export_options=None, preview=None):
+        built.append({'frame_interval': frame_interval, 'components': export_components, 'preview': preview})
+        return PipelineScheduler([
+            Stage('video_info', lambda video_path: {'duration': 3.0}, inputs=['video_path']),
+            Stage('export', lambda video_info, output_dir: {'summary': f"{output_dir}/summary.json"},
+                  inputs=['video_info', 'output_dir']),
+        ])
+
+    monkeypatch.setattr(pipeline, 'build_video_pipeline', build)
+    monkeypatch.setattr(cache.StageCache, 'default', classmethod(lambda cls: StandInCache()))
+    return built
+
+
+def test_runs_with_other_parameters_are_not_skipped(tmp_path, runs):
+    def summarize(**kwargs):
+        return summarize_video('clip.mp4', str(tmp_path / 'out'), str(tmp_path / 'checkpoints'), trace=False,
+                               **kwargs)
+
+    assert summarize(frame_interval=1.0)['status'] == 'completed'
+    assert summarize(frame_interval=1.0)['status'] == 'skipped'
+    assert summarize(frame_interval=2.0)['status'] == 'completed'
+    assert summarize(frame_interval=1.0, components=['summary', 'transcript'])['status'] == 'completed'
+    # Order and repeats of components do not change what is exported
+    assert summarize(frame_interval=1.0, components=['transcript', 'summary', 'summary'])['status'] == 'skipped'
+    assert summarize(frame_interval=1.0, preview='fast')['status'] == 'completed'
+    assert len(runs) == 4
+
+
+def test_default_interval_shares_checkpoints_with_the_configured_one(tmp_path, runs):
+    from src.utils.config import get_config
+
+    checkpoints = str(tmp_path / 'checkpoints')
+    interval = get_config().optimization.frame_extraction_interval
+    assert summarize_video('clip.mp4', str(tmp_path), checkpoints, trace=False)['status'] == 'completed'
+    assert summarize_video('clip.mp4', str(tmp_path), checkpoints, interval, ['summary'],
+                           trace=False)['status'] == 'skipped'
+
+
+def test_checkpoint_key():
+    params = {'frame_interval': 1.0, 'components': ['summary'], 'preview': None}
+    key = CheckpointStore.make_key('abc', params)
+    assert key.startswith('abc-')
+    assert key == CheckpointStore.make_key('abc', dict(reversed(list(params.items()))))
+    assert key != CheckpointStore.make_key('abc', dict(params, frame_interval=0.5))
+    assert CheckpointStore.make_key('abc', dict(params, preview='fast'), 'fast').endswith('-preview-fast')
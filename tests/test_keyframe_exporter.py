@@ -0,0 +1,56 @@
+# tests/test_keyframe_exporter.py
+import json
+import os
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from src.export import keyframe_exporter
+from src.export.keyframe_exporter import KeyframeExporter, _split
+
+
+class InlineExecutor:
+    """ProcessPoolExecutor stand-in that records its size and runs jobs in this process"""
+
+    sizes = []
+
+    def __init__(self, max_workers=None, mp_context=None):
+        self.sizes.append(max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+
+@pytest.mark.parametrize('frames, max_workers, workers', [(7, 4, 1), (15, 4, 1), (16, 2, 2), (40, 4, 4), (100, 8, 8)])
+def test_split_plans_contiguous_jobs_and_workers(frames, max_workers, workers):
+    jobs, planned = _split(list(range(frames)), max_workers)
+    assert planned == workers
+    assert [index for job in jobs for index in job] == list(range(frames))
+    if workers > 1:
+        # Rounding the job size up leaves fewer than JOBS_PER_WORKER jobs per worker
+        assert len(jobs) <= workers * keyframe_exporter.JOBS_PER_WORKER
+
+
+def test_pool_is_sized_by_the_planned_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(keyframe_exporter, 'ProcessPoolExecutor', InlineExecutor)
+    InlineExecutor.sizes.clear()
+    frames = [np.full((24, 32, 3), index * 6, dtype=np.uint8) for index in range(40)]
+    directory = KeyframeExporter().export(
+        [{'frame': frame, 'timestamp': float(index)} for index, frame in enumerate(frames)], str(tmp_path),
+        {'max_workers': 4, 'thumbnail_width': 16})
+
+    # 40 frames make 14 jobs; 14 // JOBS_PER_WORKER would have started only 3 workers
+    assert InlineExecutor.sizes == [4]
+    assert len(os.listdir(os.path.join(directory, 'full'))) == 40
+    assert len(os.listdir(os.path.join(directory, 'thumbs'))) == 40
+    with open(os.path.join(directory, 'keyframes.json')) as f:
+        assert [entry['timestamp'] for entry in json.load(f)] == [float(index) for index in range(40)]
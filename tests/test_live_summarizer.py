@@ -0,0 +1,104 @@
+# tests/test_live_summarizer.py
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from src.core.live_summarizer import LiveSource, LiveSummarizer
+from src.core.transcription_service import TranscriptionService
+
+SAMPLE_RATE = 16000
+
+
+class StandInTranscription:
+    """Transcription stand-in; _skip_if_behind only needs it to exist"""
+
+    def transcribe(self, samples):
+        return {'segments': []}
+
+
+@pytest.fixture
+def summarizer(tmp_path):
+    return LiveSummarizer(str(tmp_path / 'missing.mkv'), str(tmp_path / 'out'), update_interval=1.0,
+                          max_lag=10.0, frame_interval=1.0, transcription_service=StandInTranscription())
+
+
+def test_skipping_drops_only_pending_audio(summarizer):
+    # Frames are 60 s ahead, but only 20 s of audio has been taken from the source
+    summarizer.source.frames_read = 60
+    summarizer._pending = np.zeros(20 * SAMPLE_RATE, dtype=np.int16)
+    summarizer._skip_if_behind()
+
+    assert len(summarizer._pending) == 0
+    assert summarizer._pending_start == pytest.approx(20.0)
+    assert summarizer.transcript_gaps == [(0.0, pytest.approx(20.0))]
+
+
+def test_skipping_keeps_the_last_half_max_lag(summarizer):
+    summarizer.source.samples_read = 60 * SAMPLE_RATE
+    summarizer._pending = np.zeros(60 * SAMPLE_RATE, dtype=np.int16)
+    summarizer._skip_if_behind()
+
+    assert summarizer._pending_start == pytest.approx(55.0)
+    assert len(summarizer._pending) == 5 * SAMPLE_RATE
+    # Further skips extend the same gap
+    summarizer.source.samples_read = 80 * SAMPLE_RATE
+    summarizer._pending = np.zeros(25 * SAMPLE_RATE, dtype=np.int16)
+    summarizer._skip_if_behind()
+    assert summarizer.transcript_gaps == [(0.0, pytest.approx(75.0))]
+
+
+def standin_recognizer(samples, sample_rate, language='en'):
+    return [{'start': 0.0, 'end': len(samples) / sample_rate, 'text': 'tone'}]
+
+
+def write_stream(path: str, duration: float, audio: bool) -> subprocess.Popen:
+    """Start ffmpeg writing a synthetic Matroska stream, with a pausing tone if audio, into path"""
+    command = ['ffmpeg', '-v', 'error', '-y', '-f', 'lavfi', '-i', f"testsrc2=size=160x120:rate=10:duration={duration}"]
+    if audio:
+        tone = '0.4*sin(2*PI*330*t)*gte(mod(t,2),0.5)'
+        command += ['-f', 'lavfi', '-i', f"aevalsrc='{tone}':sample_rate=16000:duration={duration}",
+                    '-c:a', 'pcm_s16le', '-shortest']
+    else:
+        command += ['-an']
+    command += ['-c:v', 'mjpeg', '-f', 'matroska', path]
+    return subprocess.Popen(command, stdin=subprocess.DEVNULL)
+
+
+@pytest.mark.skipif(not shutil.which('ffmpeg'), reason='needs ffmpeg')
+@pytest.mark.parametrize('audio', [True, False], ids=['audio+video', 'video only'])
+def test_stream_through_a_pipe(tmp_path, monkeypatch, audio):
+    launches = []
+    launch = LiveSource._launch
+    monkeypatch.setattr(LiveSource, '_launch', lambda source: (launches.append(source.has_audio), launch(source)))
+    fifo = str(tmp_path / 'stream.mkv')
+    os.mkfifo(fifo)
+    summarizer = LiveSummarizer(fifo, str(tmp_path / 'out'), update_interval=0.5, max_lag=10.0,
+                                frame_interval=1.0,
+                                transcription_service=TranscriptionService({'en': standin_recognizer},
+                                                                           lambda samples, rate, languages: 'en'))
+
+    writer = write_stream(fifo, 6.0, audio)
+    try:
+        final = summarizer.run()
+    finally:
+        writer.wait(timeout=30)
+
+    live = final['live']
+    assert writer.returncode == 0
+    assert summarizer.source.piped
+    assert live['errors'] == []
+    assert live['has_audio'] is audio
+    assert summarizer.source.frames_read >= 5
+    if audio:
+        # The first ffmpeg read both outputs to the end
+        assert launches == [True]
+        assert summarizer.source.samples_read == pytest.approx(6.0 * SAMPLE_RATE, rel=0.05)
+        assert summarizer.segments
+    else:
+        # ffmpeg refused the missing audio output and was restarted on the replayed input
+        assert launches == [True, False]
+        assert summarizer.source.samples_read == 0
+        assert live['lag']['audio'] is None and live['lag']['transcript'] is None
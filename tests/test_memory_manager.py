@@ -0,0 +1,146 @@
+# tests/test_memory_manager.py
+import time
+from typing import Dict, List
+
+import pytest
+
+from src.utils import memory_manager
+from src.utils.memory_manager import MemoryPressureController
+
+# A power of two, so pressures scale to and from memory fractions exactly
+LIMIT = 0.5
+POLL_INTERVAL = 0.01
+MAX_WAIT = 0.3
+
+
+class SimulatedMemory:
+    """Memory source that plays back pressures (memory use over LIMIT), one per reading
+
+    The last value repeats once the trace runs out; set() replaces the trace.
+    """
+
+    def __init__(self, trace: List[float], process_mb: float = 0.0):
+        self.set(trace)
+        self.process_mb = process_mb
+        self.readings = 0
+
+    def set(self, trace: List[float]):
+        self.trace = [pressure * LIMIT for pressure in trace]
+
+    def __call__(self) -> Dict[str, float]:
+        self.readings += 1
+        value = self.trace.pop(0) if len(self.trace) > 1 else self.trace[0]
+        return {'system_used': value, 'process_mb': self.process_mb}
+
+
+def controller(memory: SimulatedMemory, **kwargs) -> MemoryPressureController:
+    return MemoryPressureController(LIMIT, memory_source=memory, poll_interval=POLL_INTERVAL,
+                                    max_wait=MAX_WAIT, **kwargs)
+
+
+def test_no_wait_below_the_limit():
+    memory = SimulatedMemory([0.99])
+    assert controller(memory).wait_for_headroom() == 0.0
+    assert memory.readings == 1
+
+
+def test_wait_lasts_until_memory_is_freed():
+    # Over the limit for five readings, then comfortably below it
+    memory = SimulatedMemory([2.0] * 5 + [0.5])
+    control = controller(memory)
+    waited = control.wait_for_headroom()
+
+    assert 4 * POLL_INTERVAL <= waited < MAX_WAIT
+    assert control.stats()['waits'] == 1 and control.stats()['timeouts'] == 0
+
+
+def test_wait_gives_up_after_max_wait():
+    control = controller(SimulatedMemory([1.2]))
+    waited = control.wait_for_headroom()
+
+    assert MAX_WAIT <= waited < MAX_WAIT + 0.2
+    assert control.stats()['timeouts'] == 1
+
+
+def test_memory_held_elsewhere_holds_back_only_the_first_producer():
+    control = controller(SimulatedMemory([1.2]))
+    started = time.perf_counter()
+    for _ in range(20):
+        control.wait_for_headroom()
+
+    assert time.perf_counter() - started < 2 * MAX_WAIT
+    stats = control.stats()
+    assert stats['timeouts'] == 1 and stats['skipped_waits'] == 19
+
+
+def test_waits_resume_once_pressure_falls_below_shrink_at():
+    memory = SimulatedMemory([1.2])
+    control = controller(memory)
+    control.wait_for_headroom()
+
+    # Still over SHRINK_AT: waits stay off even below the limit
+    memory.set([0.95])
+    control.wait_for_headroom()
+    memory.set([1.1])
+    assert control.wait_for_headroom() == 0.0
+
+    memory.set([MemoryPressureController.SHRINK_AT - 0.05])
+    control.wait_for_headroom()
+    memory.set([1.1] * 4 + [0.5])
+    assert control.wait_for_headroom() >= 2 * POLL_INTERVAL
+    assert control.stats()['timeouts'] == 1
+
+
+@pytest.mark.parametrize('pressure, size, minimum, maximum, expected', [
+    # Halved from SHRINK_AT up
+    (MemoryPressureController.SHRINK_AT, 32, 1, None, 16),
+    (0.95, 32, 1, None, 16),
+    (0.95, 1, 1, None, 1),
+    (0.95, 10.0, 2.0, None, 5.0),
+    (0.95, 3.0, 2.0, None, 2.0),
+    # Unchanged between GROW_AT and SHRINK_AT
+    (MemoryPressureController.GROW_AT, 32, 1, None, 32),
+    (0.85, 32, 1, None, 32),
+    # Grown by a quarter below GROW_AT, by at least one item, up to maximum
+    (0.69, 32, 1, None, 40),
+    (0.5, 3, 1, None, 4),
+    (0.5, 60, 1, 64, 64),
+    (0.5, 64, 1, 64, 64),
+    (0.5, 20.0, 1.0, None, 25.0),
+])
+def test_adjust_shrinks_and_grows_batch_sizes(pressure, size, minimum, maximum, expected):
+    result = controller(SimulatedMemory([pressure])).adjust(size, minimum, maximum)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+def test_adjust_counts_size_changes():
+    memory = SimulatedMemory([0.95])
+    control = controller(memory)
+    size = control.adjust(control.adjust(32))
+    memory.set([0.5])
+    control.adjust(size)
+
+    stats = control.stats()
+    assert (size, stats['shrinks'], stats['grows']) == (8, 2, 1)
+
+
+@pytest.mark.parametrize('pressure, running, expected', [
+    (0.5, 0, True), (0.5, 3, True), (0.95, 0, True), (0.95, 1, False), (1.5, 2, False),
+])
+def test_a_job_starts_only_with_headroom_but_one_always_may(pressure, running, expected):
+    assert controller(SimulatedMemory([pressure])).may_start_job(running) is expected
+
+
+def test_process_budget_counts_the_process_tree():
+    memory = SimulatedMemory([0.1], process_mb=900.0)
+    assert controller(memory, process_limit_mb=1000.0).pressure() == pytest.approx(0.9)
+    assert controller(memory).pressure() == pytest.approx(0.1)
+
+
+def test_child_processes_are_only_walked_with_a_process_budget():
+    assert MemoryPressureController(LIMIT).memory_source is memory_manager._system_memory
+    assert 'process_mb' not in memory_manager._system_memory()
+    with_budget = MemoryPressureController(LIMIT, process_limit_mb=1000.0)
+    assert with_budget.memory_source is memory_manager._process_tree_memory
+    assert with_budget.memory_source()['process_mb'] > 0
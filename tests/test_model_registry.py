@@ -0,0 +1,176 @@
+# tests/test_model_registry.py
+import multiprocessing as mp
+import os
+import threading
+
+import pytest
+
+from src.models import registry as registry_module
+from src.models.registry import ModelRegistry, get_registry
+from src.utils.pipeline_scheduler import PipelineScheduler, Stage
+
+
+class StandInModel:
+    """Lightweight model whose loader records every load"""
+
+    def __init__(self, name: str, loads: list):
+        self.name = name
+        loads.append(name)
+
+
+def registry_with(sizes, max_size_mb):
+    """A registry of stand-in models, plus the list their loads are recorded in"""
+    loads = []
+    registry = ModelRegistry(max_size_mb)
+    for name, size_mb in sizes.items():
+        registry.register(name, lambda name=name: StandInModel(name, loads), size_mb=size_mb)
+    return registry, loads
+
+
+def test_models_load_on_first_use_only():
+    registry, loads = registry_with({'whisper': 100, 'thai_stt': 100}, max_size_mb=1000)
+    assert loads == []
+    assert not registry.is_loaded('whisper')
+
+    first = registry.get('whisper')
+    assert registry.get('whisper') is first
+    assert loads == ['whisper']
+    assert registry.stats()['hits'] == 1
+    with pytest.raises(KeyError):
+        registry.get('missing')
+
+
+def test_least_recently_used_model_is_evicted_over_budget():
+    registry, loads = registry_with({'whisper': 100, 'thai_stt': 100, 'emotion': 100}, max_size_mb=250)
+    registry.get('whisper')
+    registry.get('thai_stt')
+    registry.get('whisper')
+    registry.get('emotion')
+
+    assert registry.is_loaded('whisper') and registry.is_loaded('emotion')
+    assert not registry.is_loaded('thai_stt')
+    assert registry.stats()['evictions'] == 1
+    # An evicted model is simply loaded again
+    registry.get('thai_stt')
+    assert loads == ['whisper', 'thai_stt', 'emotion', 'thai_stt']
+
+
+def test_warm_up_loads_ahead_of_use():
+    registry, loads = registry_with({'whisper': 100, 'thai_stt': 100}, max_size_mb=1000)
+    assert registry.warm_up(['thai_stt']) == ['thai_stt']
+    registry.get('thai_stt')
+    assert loads == ['thai_stt']
+
+
+class PidModel:
+    """Stand-in model that remembers the process it was loaded in"""
+
+    def __init__(self):
+        self.pid = os.getpid()
+
+
+def loaded_in(**inputs):
+    return get_registry().get('stand_in').pid
+
+
+def worker_pid(**inputs):
+    return os.getpid()
+
+
+@pytest.mark.skipif('fork' not in mp.get_all_start_methods(), reason='needs fork')
+def test_stages_share_one_model_loaded_before_the_pool_forks(monkeypatch):
+    registry, loads = registry_with({}, max_size_mb=1000)
+    registry.register('stand_in', lambda: loads.append('stand_in') or PidModel(), size_mb=10)
+    monkeypatch.setattr(registry_module, '_registry', registry)
+
+    stages = [Stage('thread', loaded_in, models=['stand_in']),
+              Stage('process_a', loaded_in, inputs=['thread'], executor='process', models=['stand_in']),
+              Stage('process_b', loaded_in, inputs=['thread'], executor='process', models=['stand_in']),
+              Stage('worker', worker_pid, inputs=['thread'], executor='process')]
+    artifacts = PipelineScheduler(stages, max_processes=2).run()
+
+    # Loaded once here; the workers inherited it instead of loading their own
+    assert loads == ['stand_in']
+    assert artifacts['thread'] == artifacts['process_a'] == artifacts['process_b'] == os.getpid()
+    assert artifacts['worker'] != os.getpid()
+
+
+def test_concurrent_leases_get_instances_of_their_own():
+    registry, loads = registry_with({'whisper': 100}, max_size_mb=1000)
+    # Every thread holds its lease until all three have one
+    all_leased = threading.Barrier(3, timeout=5)
+    leased = []
+
+    def use():
+        with registry.lease('whisper') as model:
+            leased.append(model)
+            all_leased.wait()
+
+    threads = [threading.Thread(target=use) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(model) for model in leased}) == 3
+    assert loads == ['whisper'] * 3
+    # Returned instances are reused rather than loaded again
+    with registry.lease('whisper'):
+        with registry.lease('whisper'):
+            pass
+    assert len(loads) == 3
+    assert registry.stats()['size_mb'] == 300
+
+
+def test_leases_wait_for_an_instance_when_the_budget_is_full():
+    registry, loads = registry_with({'whisper': 100}, max_size_mb=150)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def use():
+        with registry.lease('whisper'):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.02)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=use) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ['whisper']
+    assert peak[0] == 1
+
+
+def test_extra_instances_are_evicted_before_other_models():
+    registry, loads = registry_with({'whisper': 100, 'thai_stt': 100}, max_size_mb=250)
+    with registry.lease('whisper'):
+        with registry.lease('whisper'):
+            pass
+    assert registry.stats()['extra_instances'] == {'whisper': 1}
+
+    registry.get('thai_stt')
+    stats = registry.stats()
+    assert stats['extra_instances'] == {}
+    assert set(stats['loaded']) == {'whisper', 'thai_stt'}
+    assert stats['evictions'] == 0
+
+
+def test_a_leased_model_is_not_evicted():
+    registry, loads = registry_with({'whisper': 100, 'thai_stt': 100}, max_size_mb=150)
+    with registry.lease('whisper'):
+        # Over budget, but the only model that could go is in use
+        registry.get('thai_stt')
+        assert registry.is_loaded('whisper')
+    assert registry.stats()['evictions'] == 0
+
+    # Once returned it is the least recently used model and goes first
+    registry.evict('thai_stt')
+    registry.get('thai_stt')
+    registry.get('whisper')
+    assert loads == ['whisper', 'thai_stt', 'thai_stt', 'whisper']
+    assert not registry.is_loaded('thai_stt')
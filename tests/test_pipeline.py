@@ -0,0 +1,102 @@
+# tests/test_pipeline.py
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from src.core import pipeline
+from src.utils.pipeline_scheduler import PipelineScheduler, Stage
+
+COMPONENTS = ['summary', 'transcript', 'keyframes']
+SEGMENTS = [{'start': 0.0, 'end': 1.5, 'text': 'first'}, {'start': 2.0, 'end': 3.0, 'text': 'second'}]
+
+
+def keyframe(timestamp: float):
+    return {'frame': np.full((48, 64, 3), int(timestamp * 40), dtype=np.uint8), 'timestamp': timestamp}
+
+
+def standin_pipeline(fuse, components=COMPONENTS) -> PipelineScheduler:
+    """The export stages of the standard DAG behind stand-in analysis stages, all in threads"""
+    standins = {
+        'video_info': lambda video_path: {'duration': 4.0},
+        'audio': lambda video_path: None,
+        'frames': lambda video_path, video_info: [],
+        'audio_analysis': lambda audio: {},
+        'transcript': lambda audio: {'language': 'en', 'segments': SEGMENTS},
+        'keyframes': lambda frames: [keyframe(0.0), keyframe(2.0)],
+        'fusion': fuse,
+    }
+    scheduler = pipeline.build_video_pipeline(include_export=True, export_components=components)
+    return PipelineScheduler([Stage(stage.name, standins[stage.name], inputs=stage.inputs)
+                              if stage.name in standins else stage for stage in scheduler.stages.values()])
+
+
+def test_transcript_and_keyframes_are_exported_before_fusion(tmp_path):
+    written = {name: threading.Event() for name in ('export_transcript', 'export_keyframes')}
+
+    def fuse(audio_analysis, transcript, keyframes, video_info):
+        # Holds fusion back until both writers are done; they must not wait for it
+        for event in written.values():
+            assert event.wait(timeout=30)
+        return {'highlights': [{'start': 0.0, 'end': 1.5}], 'segments': []}
+
+    def completed(stage, result):
+        if stage.name in written:
+            written[stage.name].set()
+
+    output_dir = str(tmp_path / 'out')
+    results = standin_pipeline(fuse).run({'video_path': 'clip.mp4', 'output_dir': output_dir},
+                                         targets=['export'], on_stage_complete=completed)['export']
+
+    assert list(results) == COMPONENTS + ['report']
+    assert results['transcript'] == os.path.join(output_dir, 'transcript.txt')
+    with open(results['transcript']) as f:
+        assert f.read().splitlines() == ['[00:00] first', '[00:02] second']
+    assert sorted(os.listdir(os.path.join(results['keyframes'], 'full'))) == ['keyframe_0001.jpg',
+                                                                             'keyframe_0002.jpg']
+    with open(results['summary']) as f:
+        assert json.load(f)['highlights'] == [{'start': 0.0, 'end': 1.5}]
+    with open(results['report']) as f:
+        report = json.load(f)
+    assert {name: entry['status'] for name, entry in report['components'].items()} == {
+        component: 'completed' for component in COMPONENTS}
+
+
+def test_only_the_export_stages_of_selected_components_run():
+    scheduler = standin_pipeline(lambda **kwargs: {'highlights': []}, components=['transcript'])
+    assert 'export_transcript' in scheduler.stages
+    assert 'export_keyframes' not in scheduler.stages
+    assert 'export_summary' not in scheduler.stages
+    assert scheduler.stages['export'].inputs == ('export_transcript', 'output_dir')
+
+
+@pytest.mark.parametrize('as_iterator', [False, True], ids=['list', 'iterator'])
+def test_transcript_writers_stream_segments(tmp_path, as_iterator):
+    from src.export.transcript_exporter import TranscriptExporter
+
+    consumed = []
+
+    def produce():
+        for segment in SEGMENTS:
+            consumed.append(segment)
+            yield segment
+
+    transcript = {'language': 'en', 'segments': produce() if as_iterator else SEGMENTS}
+    paths = TranscriptExporter().export(transcript, str(tmp_path), {'format': ['srt', 'vtt', 'json']})
+
+    assert [os.path.basename(path) for path in paths] == ['transcript.srt', 'transcript.vtt', 'transcript.json']
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.part')]
+    with open(paths[0]) as f:
+        assert f.read() == ('1\n00:00:00,000 --> 00:00:01,500\nfirst\n\n'
+                            '2\n00:00:02,000 --> 00:00:03,000\nsecond\n\n')
+    with open(paths[1]) as f:
+        assert f.read().startswith('WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nfirst\n')
+    with open(paths[2]) as f:
+        document = json.load(f)
+    assert document['language'] == 'en'
+    assert document['segments'] == SEGMENTS
+    assert document['segment_count'] == 2 and document['duration'] == 3.0
+    if as_iterator:
+        assert consumed == SEGMENTS
@@ -0,0 +1,79 @@
+# tests/test_scene_detector.py
+import numpy as np
+import pytest
+
+from src.core.scene_detector import SceneDetector, iter_frame_batches, iter_scene_changes
+
+HEIGHT, WIDTH = 72, 128
+
+
+def scene_frames(cuts, length, seed=0):
+    """length RGB frames of slowly drifting noise, with a different base color after every cut"""
+    rng = np.random.default_rng(seed)
+    colors = rng.integers(0, 256, size=(len(cuts) + 1, 3))
+    # Every other scene takes the inverse color of the one before, so neighbours always differ
+    colors[1::2] = 255 - colors[::2][:len(colors[1::2])]
+    texture = rng.integers(-20, 21, size=(HEIGHT, WIDTH, 3))
+    frames = []
+    scene = 0
+    for index in range(length):
+        if scene < len(cuts) and index == cuts[scene]:
+            scene += 1
+        drift = index % 5
+        frames.append(np.clip(colors[scene] + texture + drift, 0, 255).astype(np.uint8))
+    return frames
+
+
+def detect(frames, batch_size, **kwargs):
+    detector = SceneDetector(threshold=0.3, **kwargs)
+    return detector.detect(iter_frame_batches(frames, batch_size))
+
+
+def test_scripted_cuts_are_found_and_nothing_else():
+    cuts = [10, 25, 47, 60]
+    assert detect(scene_frames(cuts, 80), batch_size=16) == cuts
+
+
+def test_a_cut_on_a_batch_boundary_is_found():
+    # Frame 32 opens the third batch of 16; its score depends on the carried-over frame 31
+    cuts = [16, 32, 40]
+    frames = scene_frames(cuts, 64)
+    assert detect(frames, batch_size=16) == cuts
+    # Same result whatever the batching, including one frame per batch
+    for batch_size in (1, 7, 32, 64):
+        assert detect(frames, batch_size=batch_size) == cuts
+
+
+def test_first_frame_is_not_a_cut():
+    detector = SceneDetector(threshold=0.3)
+    scores = detector.scores(np.stack(scene_frames([], 4)))
+    assert scores[0] == 0.0
+    assert detector.update(np.stack(scene_frames([], 4))) == []
+
+
+def test_min_scene_length_suppresses_cuts_too_close_together():
+    frames = scene_frames([10, 12, 30], 40)
+    assert detect(frames, batch_size=8) == [10, 12, 30]
+    assert detect(frames, batch_size=8, min_scene_length=5) == [10, 30]
+
+
+def test_reset_starts_a_new_video():
+    detector = SceneDetector(threshold=0.3)
+    frames = np.stack(scene_frames([5], 10))
+    assert detector.update(frames) == [5]
+    detector.reset()
+    # Without the reset, frame 0 would be compared with the old video's last frame
+    assert detector.update(frames[::-1]) == [5]
+    assert detector.frame_index == 10
+
+
+def test_iter_scene_changes_reports_timestamps():
+    frames = scene_frames([12, 20], 30)
+    timestamps = np.arange(30) * 0.5
+    batches = [(timestamps[start:start + 8], np.stack(frames[start:start + 8])) for start in range(0, 30, 8)]
+    assert list(iter_scene_changes(SceneDetector(threshold=0.3), batches)) == [(12, 6.0), (20, 10.0)]
+
+
+def test_invalid_histogram_bins_are_rejected():
+    with pytest.raises(ValueError):
+        SceneDetector(threshold=0.3, histogram_bins=7)
@@ -0,0 +1,131 @@
+# tests/test_transcription_service.py
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.core.speech_segmenter import SpeechSegmenter
+from src.core.transcription_service import TranscriptionService
+
+SAMPLE_RATE = 16000
+
+
+def tone(duration: float, spans) -> np.ndarray:
+    """int16 audio of the given length, with a 440 Hz tone in each (start, end) span"""
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    audio = np.zeros_like(t)
+    for start, end in spans:
+        inside = (t >= start) & (t < end)
+        audio[inside] = 0.5 * np.sin(2 * np.pi * 440 * t[inside])
+    return (audio * 32767).astype(np.int16)
+
+
+class StandInRecognizer:
+    """Deterministic recognizer: one segment per second of each chunk, or one for the whole chunk"""
+
+    def __init__(self, per_second: bool = True, text: str = 'word', delay: float = 0.0, thread_safe: bool = True):
+        self.per_second = per_second
+        self.text = text
+        self.delay = delay
+        self.thread_safe = thread_safe
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, samples, sample_rate, language='en'):
+        with self._lock:
+            self.calls.append(len(samples) / sample_rate)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        duration = len(samples) / sample_rate
+        if not self.per_second:
+            return [{'start': 0.0, 'end': duration, 'text': self.text}]
+        return [{'start': float(second), 'end': float(min(second + 1, duration)), 'text': f" {self.text} "}
+                for second in range(int(np.ceil(duration)))]
+
+
+def service(recognizer, max_chunk_length=10.0, chunk_overlap=2.0, max_workers=4) -> TranscriptionService:
+    segmenter = SpeechSegmenter(padding=0.0, max_chunk_length=max_chunk_length, chunk_overlap=chunk_overlap)
+    return TranscriptionService({'en': recognizer}, segmenter=segmenter, max_workers=max_workers)
+
+
+def test_segments_are_stitched_onto_the_global_timeline():
+    recognizer = StandInRecognizer(per_second=False)
+    transcript = service(recognizer).transcribe(tone(20.0, [(2.0, 5.0), (14.0, 17.0)]), language='en')
+
+    assert [(chunk['start'], chunk['end']) for chunk in transcript['chunks']] == pytest.approx(
+        [(2.0, 5.0), (14.0, 17.0)], abs=0.05)
+    assert [(segment['start'], segment['end']) for segment in transcript['segments']] == pytest.approx(
+        [(2.0, 5.0), (14.0, 17.0)], abs=0.05)
+    assert all(segment['language'] == 'en' for segment in transcript['segments'])
+    assert transcript['text'] == 'word word'
+
+
+def test_silence_is_never_sent_to_the_recognizer():
+    recognizer = StandInRecognizer()
+    transcript = service(recognizer).transcribe(tone(30.0, []), language='en')
+    assert recognizer.calls == []
+    assert transcript['segments'] == [] and transcript['language'] is None
+
+    service(recognizer).transcribe(tone(30.0, [(10.0, 12.0)]), language='en')
+    assert sum(recognizer.calls) == pytest.approx(2.0, abs=0.05)
+
+
+def test_overlapping_chunks_split_their_overlap_at_the_middle():
+    recognizer = StandInRecognizer()
+    transcript = service(recognizer).transcribe(tone(26.0, [(0.0, 26.0)]), language='en')
+
+    # Chunks of 10 s overlapping by 2 s: 0-10, 8-18, 16-26
+    assert len(transcript['chunks']) == 3
+    segments = transcript['segments']
+    starts = [segment['start'] for segment in segments]
+    assert starts == sorted(starts)
+    assert all(later['start'] >= earlier['end'] - 1e-6 for earlier, later in zip(segments, segments[1:]))
+    assert starts == pytest.approx(list(range(26)), abs=0.05)
+    assert all(segment['text'] == 'word' for segment in segments)
+
+
+def test_words_recognized_on_both_sides_of_a_cut_are_kept_once():
+    # Each chunk reports one segment spanning all of it, so the two overlap by 2 s
+    recognizer = StandInRecognizer(per_second=False, text='same words')
+    transcript = service(recognizer).transcribe(tone(18.0, [(0.0, 18.0)]), language='en')
+
+    assert len(transcript['chunks']) == 2
+    assert len(transcript['segments']) == 1
+    assert transcript['segments'][0]['start'] == pytest.approx(0.0, abs=0.05)
+
+
+def test_chunks_run_in_parallel_only_for_thread_safe_recognizers():
+    audio = tone(40.0, [(start, start + 2.0) for start in range(0, 40, 4)])
+
+    safe = StandInRecognizer(delay=0.05)
+    service(safe, max_chunk_length=3.0, chunk_overlap=0.5).transcribe(audio, language='en')
+    assert safe.peak > 1
+
+    unsafe = StandInRecognizer(delay=0.05, thread_safe=False)
+    service(unsafe, max_chunk_length=3.0, chunk_overlap=0.5).transcribe(audio, language='en')
+    assert unsafe.peak == 1
+    assert len(unsafe.calls) == len(safe.calls) == 10
+
+
+def test_language_is_identified_per_chunk():
+    english, thai = StandInRecognizer(text='hello'), StandInRecognizer(text='sawasdee')
+
+    def identify(samples, sample_rate, candidates):
+        # Louder chunks are 'Thai'
+        return 'th' if np.abs(samples).max() > 0.4 else 'en'
+
+    identify.thread_safe = True
+    audio = tone(20.0, [(2.0, 4.0)])
+    audio[int(12 * SAMPLE_RATE):int(14 * SAMPLE_RATE)] = tone(2.0, [(0.0, 2.0)])
+    audio[:int(8 * SAMPLE_RATE)] //= 2
+    transcript = TranscriptionService({'en': english, 'th': thai}, identify,
+                                      SpeechSegmenter(padding=0.0, max_chunk_length=5.0)).transcribe(audio, language='auto')
+
+    assert [chunk['language'] for chunk in transcript['chunks']] == ['en', 'th']
+    assert len(english.calls) == 1 and len(thai.calls) == 1